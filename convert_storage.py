@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Rewrite stored learning path files in another storage format
+"""
+
+import argparse
+import os
+import sys
+from services.storage import JSONFileStore
+from services.storage_codec import parse_format, stored_format
+
+def convert(directory: str, storage_format: str) -> int:
+    """Rewrite every learning path in directory as storage_format; returns the number converted"""
+    
+    store = JSONFileStore(directory, storage_format=storage_format)
+    
+    converted = 0
+    failed = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith('.json'):
+            continue
+        
+        path = os.path.join(directory, filename)
+        old_format = stored_format(path)
+        old_size = os.path.getsize(path)
+        # load() also folds in any pending progress log, which save() then clears
+        learning_path = store.load(filename[:-len('.json')])
+        if learning_path is None or not store.save(learning_path):
+            failed.append(filename)
+            continue
+        
+        converted += 1
+        print(f"✅ {filename}: {old_format} {old_size} bytes -> {storage_format} {os.path.getsize(path)} bytes")
+    
+    for filename in failed:
+        print(f"❌ Could not convert {filename}")
+    
+    return converted
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert stored learning paths to another storage format")
+    parser.add_argument("--dir", default=os.getenv("LEARNING_PATHS_DIR", "data/learning_paths"), help="Directory of learning path files")
+    parser.add_argument("--format", default=os.getenv("STORAGE_FORMAT", "json"), help="json, msgpack or json-indent, optionally +gzip or +zstd")
+    args = parser.parse_args()
+    
+    if not os.path.isdir(args.dir):
+        print(f"❌ {args.dir} not found")
+        sys.exit(1)
+    
+    try:
+        parse_format(args.format)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    count = convert(args.dir, args.format)
+    print(f"\n🎉 Converted {count} learning path(s) to {args.format}")
+    print("Set STORAGE_FORMAT to the same value so new plans are written that way too.")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from fastapi import FastAPI, HTTPException, Depends, Request, Form, status
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -16,7 +16,9 @@ from services.youtube_service import YouTubeService
 from services.notion_service import NotionService
 from services.learning_path_service import LearningPathService
 from services.auth_service import AuthService
-from models.learning_path import LearningPath, StudyPlan, ProgressUpdate, User, UserCreate, UserLogin, Token
+from services.http_client import start_http_client, close_http_client
+from services.job_queue import LearningPathJobQueue
+from models.learning_path import LearningPath, StudyPlan, ProgressUpdate, User, UserCreate, UserLogin, Token, LearningPathJob, JobStatus
 
 # Load environment variables
 load_dotenv()
@@ -33,10 +35,29 @@ youtube_service = None
 notion_service = None
 learning_path_service = None
 auth_service = None
+job_queue = None
 
 # Security
 security = HTTPBearer()
 
+@app.on_event("startup")
+async def startup():
+    """Open the pooled HTTP client shared by all services and resume queued jobs"""
+    await start_http_client()
+    try:
+        await get_job_queue().start()
+    except Exception as e:
+        print(f"Warning: Could not start job queue: {e}")
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop job workers, flush pending local writes and close pooled upstream connections"""
+    if job_queue is not None:
+        await job_queue.stop()
+    if notion_service is not None:
+        await notion_service.close()
+    await close_http_client()
+
 def get_services():
     """Get or initialize services"""
     global ai_service, youtube_service, notion_service, learning_path_service, auth_service
@@ -59,6 +80,16 @@ def get_services():
     
     return ai_service, youtube_service, notion_service, learning_path_service, auth_service
 
+def get_job_queue() -> LearningPathJobQueue:
+    """Get or initialize the background learning path job queue"""
+    global job_queue
+    
+    if job_queue is None:
+        _, _, _, learning_path_service, _ = get_services()
+        job_queue = LearningPathJobQueue(learning_path_service)
+    
+    return job_queue
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Get current authenticated user from JWT token"""
     _, _, _, _, auth_service = get_services()
@@ -143,8 +174,12 @@ async def login(user_data: UserLogin):
         raise HTTPException(status_code=500, detail=f"Login failed: {str(e)}")
 
 @app.post("/create-learning-path")
-async def create_learning_path(request: TopicRequest, current_user: User = Depends(get_current_user)):
-    """Create a personalized learning path for a given topic"""
+async def create_learning_path(request: TopicRequest, background: bool = False, current_user: User = Depends(get_current_user)):
+    """Create a personalized learning path for a given topic.
+    
+    With ?background=true the request is queued and answered at once with 202 and
+    a job ID; poll /jobs/{job_id} or listen on /jobs/{job_id}/events for the result.
+    """
     print(f"Received request to create learning path for topic: {request.topic}")
     print(f"Experience level: {request.experience_level}")
     print(f"Time commitment: {request.time_commitment}")
@@ -152,6 +187,20 @@ async def create_learning_path(request: TopicRequest, current_user: User = Depen
     print(f"User: {current_user.username}")
     
     try:
+        if background:
+            job = await get_job_queue().submit(
+                topic=request.topic,
+                experience_level=request.experience_level,
+                time_commitment=request.time_commitment,
+                learning_goals=request.learning_goals,
+                user_id=current_user.id
+            )
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={"success": True, **job_links(job)},
+                headers={"Location": f"/jobs/{job.id}"}
+            )
+        
         print("Getting services...")
         _, _, _, learning_path_service, _ = get_services()
         print("Services obtained successfully")
@@ -175,6 +224,92 @@ async def create_learning_path(request: TopicRequest, current_user: User = Depen
         print(f"Full traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/create-learning-path/stream")
+async def create_learning_path_stream(request: TopicRequest, current_user: User = Depends(get_current_user)):
+    """Create a learning path, streaming each week as a Server-Sent Event as soon as it is ready"""
+    _, _, _, learning_path_service, _ = get_services()
+    
+    async def event_stream():
+        try:
+            async for event, data in learning_path_service.stream_learning_path(
+                topic=request.topic,
+                experience_level=request.experience_level,
+                time_commitment=request.time_commitment,
+                learning_goals=request.learning_goals,
+                user_id=current_user.id
+            ):
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        except Exception as e:
+            print(f"Error in /create-learning-path/stream: {e}")
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def job_links(job: LearningPathJob) -> Dict[str, Any]:
+    """Job ID, status and the URLs a client uses to follow it"""
+    return {
+        "job_id": job.id,
+        "status": job.status.value,
+        "status_url": f"/jobs/{job.id}",
+        "result_url": f"/jobs/{job.id}/result",
+        "events_url": f"/jobs/{job.id}/events"
+    }
+
+def get_user_job(job_id: str, current_user: User) -> LearningPathJob:
+    """Look up a job owned by the current user, or raise 404"""
+    job = get_job_queue().get(job_id)
+    if job is None or job.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str, current_user: User = Depends(get_current_user)):
+    """Status of a background learning path job"""
+    job = get_user_job(job_id, current_user)
+    return {"success": True, **job_links(job), "job": job.model_dump(mode="json", exclude={"result"})}
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str, current_user: User = Depends(get_current_user)):
+    """Learning path created by a job; 202 while it is still running"""
+    job = get_user_job(job_id, current_user)
+    if job.status == JobStatus.FAILED:
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status != JobStatus.COMPLETED:
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content={"success": True, **job_links(job)})
+    return {"success": True, "learning_path": job.result}
+
+@app.get("/jobs/{job_id}/events")
+async def get_job_events(job_id: str, current_user: User = Depends(get_current_user)):
+    """Server-Sent Events for a job: its current status, then complete or error when it finishes"""
+    job = get_user_job(job_id, current_user)
+    queue = get_job_queue()
+    
+    async def event_stream():
+        yield f"event: status\ndata: {json.dumps(job_links(job))}\n\n"
+        while True:
+            finished_job = await queue.wait(job_id, timeout=15)
+            if finished_job is None:
+                yield f"event: error\ndata: {json.dumps({'detail': 'Job expired'})}\n\n"
+                return
+            if finished_job.status == JobStatus.COMPLETED:
+                yield f"event: complete\ndata: {json.dumps(finished_job.result)}\n\n"
+                return
+            if finished_job.status == JobStatus.FAILED:
+                yield f"event: error\ndata: {json.dumps({'detail': finished_job.error})}\n\n"
+                return
+            # Keep proxies from closing an idle connection
+            yield ": keep-alive\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/update-progress")
 async def update_progress(request: ProgressUpdateRequest, current_user: User = Depends(get_current_user)):
     """Update progress and get adaptive recommendations"""
@@ -184,7 +319,8 @@ async def update_progress(request: ProgressUpdateRequest, current_user: User = D
             topic=request.topic,
             completed_items=request.completed_items,
             current_progress=request.current_progress,
-            challenges_faced=request.challenges_faced
+            challenges_faced=request.challenges_faced,
+            user_id=current_user.id
         )
         return {"success": True, "updated_plan": updated_plan.model_dump()}
     except Exception as e:
@@ -195,7 +331,7 @@ async def get_learning_path(topic: str, current_user: User = Depends(get_current
     """Get existing learning path for a topic"""
     try:
         _, _, _, learning_path_service, _ = get_services()
-        learning_path = await learning_path_service.get_learning_path(topic)
+        learning_path = await learning_path_service.get_learning_path(topic, current_user.id)
         if learning_path:
             return {"success": True, "learning_path": learning_path.model_dump()}
         else:
@@ -228,6 +364,21 @@ async def health_check():
     """Health check endpoint for deployment"""
     return {"status": "healthy", "message": "Learning Path Mentor Bot is running!"}
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime counters for caches and request coalescing"""
+    ai_service, youtube_service, notion_service, learning_path_service, _ = get_services()
+    return {
+        "learning_path_coalescing": learning_path_service.coalescing_stats(),
+        "llm_cache": ai_service.cache.stats() if ai_service.cache else None,
+        "youtube_cache": youtube_service.cache_stats(),
+        "youtube_quota": youtube_service.quota_stats(),
+        "resource_index": learning_path_service.resource_index.stats(),
+        "github": learning_path_service.github.stats(),
+        "jobs": job_queue.stats() if job_queue is not None else None,
+        "storage": notion_service.store.stats()
+    }
+
 @app.get("/progress-dashboard")
 async def progress_dashboard(request: Request):
     """Progress dashboard page"""
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+One-shot migration of local learning paths from JSON files to SQLite
+"""
+
+import argparse
+import os
+import sys
+from services.storage import JSONFileStore, SQLiteStore
+
+def migrate(source_dir: str, db_path: str) -> int:
+    """Copy every learning path in source_dir into the SQLite database; returns the number migrated"""
+    
+    json_store = JSONFileStore(source_dir)
+    sqlite_store = SQLiteStore(db_path)
+    
+    migrated = 0
+    failed = []
+    for filename in sorted(os.listdir(source_dir)):
+        if not filename.endswith('.json'):
+            continue
+        
+        learning_path = json_store.load(filename[:-len('.json')])
+        if learning_path is None or not sqlite_store.save(learning_path):
+            failed.append(filename)
+            continue
+        
+        migrated += 1
+        print(f"✅ {filename} -> {learning_path.topic} ({learning_path.user_id})")
+    
+    for filename in failed:
+        print(f"❌ Could not migrate {filename}")
+    
+    return migrated
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate learning paths from JSON files to SQLite")
+    parser.add_argument("--source", default=os.getenv("LEARNING_PATHS_DIR", "data/learning_paths"), help="Directory of learning path JSON files")
+    parser.add_argument("--db", default=os.getenv("STORAGE_DB_PATH", "data/learning_paths.db"), help="SQLite database to write")
+    args = parser.parse_args()
+    
+    if not os.path.isdir(args.source):
+        print(f"❌ {args.source} not found")
+        sys.exit(1)
+    
+    count = migrate(args.source, args.db)
+    print(f"\n🎉 Migrated {count} learning path(s) to {args.db}")
+    print("Set STORAGE_BACKEND=sqlite to use the database. The JSON files were left in place.")
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,12 @@ class ResourceType(str, Enum):
     BOOK = "book"
     PRACTICE_EXERCISE = "practice_exercise"
 
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
 class User(BaseModel):
     id: Optional[str] = None
     username: str = Field(..., min_length=3, max_length=50)
@@ -78,6 +84,12 @@ class ProgressUpdate(BaseModel):
     mood_rating: Optional[int] = Field(None, ge=1, le=10)
     time_spent: Optional[float] = None  # hours
 
+class ProgressEvent(BaseModel):
+    """One progress update and what it changed, as stored in a learning path's progress log"""
+    progress_update: ProgressUpdate
+    recommendations: List[str] = []
+    completed_weeks: List[int] = []
+
 class StudyPlan(BaseModel):
     topic: str
     experience_level: ExperienceLevel
@@ -102,6 +114,16 @@ class LearningPath(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     last_updated: datetime = Field(default_factory=datetime.now)
     
+    def apply_progress_event(self, event: ProgressEvent) -> None:
+        """Apply a progress event: record the update and recommendations, complete the weeks it finished"""
+        self.progress_updates.append(event.progress_update)
+        self.adaptive_recommendations.extend(event.recommendations)
+        for goal in self.study_plan.weekly_goals:
+            if goal.week_number in event.completed_weeks:
+                goal.completed = True
+                goal.progress_percentage = 100.0
+        self.last_updated = max(self.last_updated, event.progress_update.timestamp)
+    
     def calculate_overall_progress(self) -> float:
         """Calculate overall progress based on completed weekly goals"""
         if not self.study_plan.weekly_goals:
@@ -121,4 +143,23 @@ class LearningPath(BaseModel):
     def get_next_deadline(self) -> Optional[datetime]:
         """Get the next deadline from incomplete goals"""
         current_goal = self.get_current_week_goal()
-        return current_goal.deadline if current_goal else None 
\ No newline at end of file
+        return current_goal.deadline if current_goal else None 
+
+class LearningPathJob(BaseModel):
+    id: str
+    user_id: Optional[str] = None
+    status: JobStatus = JobStatus.QUEUED
+    topic: str
+    experience_level: str
+    time_commitment: str
+    learning_goals: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    attempts: int = 0
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.COMPLETED, JobStatus.FAILED)
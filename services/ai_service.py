@@ -1,18 +1,28 @@
 import os
 import json
-from typing import List, Dict, Any, Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, AsyncIterator
 from datetime import datetime, timedelta
 import httpx
+from services.http_client import get_http_client
 import google.generativeai as genai
+from services.llm_cache import LLMResponseCache
+from services.llm_json import LLMJSONError, extract_json, parse_learning_path, merge_weekly_goals, validate_weekly_goal
 from models.learning_path import LearningPath, StudyPlan, WeeklyGoal, LearningResource, ExperienceLevel, TimeCommitment, ResourceType
 
 class AIService:
-    def __init__(self, provider: str = "gemini"):
+    def __init__(self, provider: str = "gemini", max_in_flight: Optional[int] = None, cache: Optional[LLMResponseCache] = None):
         """
         Initialize AI service with specified provider
         provider: "gemini" or "perplexity"
+        max_in_flight: maximum concurrent Gemini generations (GEMINI_MAX_IN_FLIGHT, default 4)
+        cache: learning path response cache (defaults to one namespaced by provider; LLM_CACHE_ENABLED=false disables it)
         """
         self.provider = provider
+        if cache is None and os.getenv("LLM_CACHE_ENABLED", "true").lower() != "false":
+            cache = LLMResponseCache(namespace=provider)
+        self.cache = cache
         
         if provider == "gemini":
             # Initialize Google Gemini
@@ -22,20 +32,79 @@ class AIService:
             genai.configure(api_key=api_key)
             self.model = genai.GenerativeModel('gemini-1.5-flash')
             
+            # Bound concurrent generations; the executor is only used when the SDK lacks an async API
+            self.max_in_flight = max_in_flight or int(os.getenv("GEMINI_MAX_IN_FLIGHT", "4"))
+            self._gemini_semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._gemini_executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="gemini")
+            
         elif provider == "perplexity":
             # Initialize Perplexity
             self.api_key = os.getenv("PERPLEXITY_API_KEY")
             if not self.api_key:
                 raise Exception("PERPLEXITY_API_KEY environment variable is required for Perplexity")
             self.base_url = "https://api.perplexity.ai/chat/completions"
+            # Generations can take far longer than ordinary API calls
+            self.timeout = httpx.Timeout(float(os.getenv("LLM_HTTP_TIMEOUT_SECONDS", "120")), connect=5.0)
         
         else:
             raise ValueError("Provider must be 'gemini' or 'perplexity'")
     
-    async def generate_learning_path(self, topic: str, experience_level: str, time_commitment: str, learning_goals: Optional[str] = None) -> Dict[str, Any]:
-        """Generate a personalized learning path using the selected AI provider"""
+    async def _generate_gemini(self, prompt: str) -> str:
+        """Run a Gemini generation without blocking the event loop"""
+        async with self._gemini_semaphore:
+            if hasattr(self.model, "generate_content_async"):
+                response = await self.model.generate_content_async(prompt)
+            else:
+                loop = asyncio.get_running_loop()
+                response = await loop.run_in_executor(self._gemini_executor, self.model.generate_content, prompt)
+        return response.text
+    
+    async def _generate(self, prompt: str, system_prompt: str, max_tokens: int, temperature: float) -> str:
+        """Run a single completion against the configured provider and return its text"""
+        if self.provider == "gemini":
+            return await self._generate_gemini(prompt)
         
-        prompt = f"""
+        client = get_http_client()
+        response = await client.post(
+            self.base_url,
+            timeout=self.timeout,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": "llama-3.1-sonar-small-128k-online",
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                "max_tokens": max_tokens,
+                "temperature": temperature
+            }
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data['choices'][0]['message']['content']
+    
+    async def _stream_gemini(self, prompt: str) -> AsyncIterator[str]:
+        """Yield Gemini output text chunks as they are generated"""
+        async with self._gemini_semaphore:
+            if not hasattr(self.model, "generate_content_async"):
+                # No native async streaming; fall back to a single non-blocking generation
+                loop = asyncio.get_running_loop()
+                response = await loop.run_in_executor(self._gemini_executor, self.model.generate_content, prompt)
+                yield response.text
+                return
+            
+            response = await self.model.generate_content_async(prompt, stream=True)
+            async for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+    
+    def _learning_path_prompt(self, topic: str, experience_level: str, time_commitment: str, learning_goals: Optional[str] = None) -> str:
+        """Build the learning path generation prompt"""
+        
+        return f"""
         Create a comprehensive, personalized learning path for the topic: "{topic}"
         
         User Profile:
@@ -83,45 +152,152 @@ class AIService:
         
         Return only the JSON object, no additional text.
         """
+    
+    async def generate_learning_path(self, topic: str, experience_level: str, time_commitment: str, learning_goals: Optional[str] = None) -> Dict[str, Any]:
+        """Generate a personalized learning path using the selected AI provider"""
+        
+        if self.cache:
+            cached = self.cache.get_learning_path(topic, experience_level, time_commitment, learning_goals)
+            if cached is not None:
+                return cached
+        
+        prompt = self._learning_path_prompt(topic, experience_level, time_commitment, learning_goals)
         
         try:
-            if self.provider == "gemini":
-                response = self.model.generate_content(prompt)
-                content = response.text
-                
-            elif self.provider == "perplexity":
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(
-                        self.base_url,
-                        headers={
-                            "Authorization": f"Bearer {self.api_key}",
-                            "Content-Type": "application/json"
-                        },
-                        json={
-                            "model": "llama-3.1-sonar-small-128k-online",
-                            "messages": [
-                                {"role": "system", "content": "You are an expert learning path creator. Create detailed, practical learning paths with specific resources and deadlines."},
-                                {"role": "user", "content": prompt}
-                            ],
-                            "max_tokens": 4000,
-                            "temperature": 0.7
-                        }
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                    content = data['choices'][0]['message']['content']
+            content = await self._generate(
+                prompt,
+                system_prompt="You are an expert learning path creator. Create detailed, practical learning paths with specific resources and deadlines.",
+                max_tokens=4000,
+                temperature=0.7
+            )
             
-            # Extract JSON from response
-            json_start = content.find('{')
-            json_end = content.rfind('}') + 1
-            json_str = content[json_start:json_end]
+            # Salvage complete weeks and only re-ask for a missing tail
+            result = parse_learning_path(content)
+            if result.missing_week_numbers:
+                extra_weeks = await self.complete_missing_weeks(topic, experience_level, time_commitment, learning_goals, result.weekly_goals, result.expected_weeks)
+                result.data['weekly_goals'] = merge_weekly_goals(result.weekly_goals, extra_weeks)
+            
+            learning_path_data = result.data
+            if not learning_path_data['weekly_goals']:
+                raise LLMJSONError("Response did not contain any valid weekly goals")
+            
+            if self.cache:
+                self.cache.set_learning_path(topic, experience_level, time_commitment, learning_goals, learning_path_data)
             
-            learning_path_data = json.loads(json_str)
             return learning_path_data
             
         except Exception as e:
             raise Exception(f"Failed to generate learning path with {self.provider}: {str(e)}")
     
+    async def complete_missing_weeks(self, topic: str, experience_level: str, time_commitment: str, learning_goals: Optional[str], existing_weeks: List[Dict[str, Any]], total_weeks: int) -> List[Dict[str, Any]]:
+        """Ask the provider for only the weeks missing from a truncated learning path"""
+        
+        present = {goal.get('week_number') for goal in existing_weeks}
+        missing = [n for n in range(1, total_weeks + 1) if n not in present]
+        if not missing:
+            return []
+        
+        covered = "\n".join(f"- Week {goal.get('week_number')}: {goal.get('title', '')}" for goal in existing_weeks)
+        prompt = f"""
+        You are completing a {total_weeks}-week learning path for the topic: "{topic}"
+        
+        User Profile:
+        - Experience Level: {experience_level}
+        - Time Commitment: {time_commitment}
+        - Learning Goals: {learning_goals or "Not specified"}
+        
+        Weeks already planned:
+        {covered or "None"}
+        
+        Write only weeks {", ".join(str(n) for n in missing)}, continuing the progression above.
+        Structure the response as a JSON object with a single key "weekly_goals" holding an array of objects with:
+        - week_number: integer
+        - title: string
+        - description: string
+        - objectives: array of strings
+        - estimated_hours: float
+        - deadline: string (ISO format)
+        
+        Return only the JSON object, no additional text.
+        """
+        
+        content = await self._generate(
+            prompt,
+            system_prompt="You are an expert learning path creator. Create detailed, practical learning paths with specific resources and deadlines.",
+            max_tokens=2000,
+            temperature=0.7
+        )
+        
+        weeks = extract_json(content, dict).get('weekly_goals', [])
+        return [
+            goal for goal in weeks
+            if validate_weekly_goal(goal) is None and goal.get('week_number') in missing
+        ]
+    
+    async def stream_learning_path(self, topic: str, experience_level: str, time_commitment: str, learning_goals: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream the raw learning path JSON text as the provider produces it"""
+        
+        if self.cache:
+            cached = self.cache.get_learning_path(topic, experience_level, time_commitment, learning_goals)
+            if cached is not None:
+                yield json.dumps(cached)
+                return
+        
+        prompt = self._learning_path_prompt(topic, experience_level, time_commitment, learning_goals)
+        chunks = []
+        
+        try:
+            if self.provider == "gemini":
+                async for chunk in self._stream_gemini(prompt):
+                    chunks.append(chunk)
+                    yield chunk
+                    
+            elif self.provider == "perplexity":
+                client = get_http_client()
+                async with client.stream(
+                    "POST",
+                    self.base_url,
+                    timeout=self.timeout,
+                    headers={
+                        "Authorization": f"Bearer {self.api_key}",
+                        "Content-Type": "application/json"
+                    },
+                    json={
+                        "model": "llama-3.1-sonar-small-128k-online",
+                        "messages": [
+                            {"role": "system", "content": "You are an expert learning path creator. Create detailed, practical learning paths with specific resources and deadlines."},
+                            {"role": "user", "content": prompt}
+                        ],
+                        "max_tokens": 4000,
+                        "temperature": 0.7,
+                        "stream": True
+                    }
+                ) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        payload = line[len("data:"):].strip()
+                        if payload == "[DONE]":
+                            break
+                        delta = json.loads(payload)['choices'][0].get('delta', {})
+                        chunk = delta.get('content')
+                        if chunk:
+                            chunks.append(chunk)
+                            yield chunk
+        
+        except Exception as e:
+            raise Exception(f"Failed to stream learning path with {self.provider}: {str(e)}")
+        
+        # Cache the complete plan so identical requests skip the provider next time
+        if self.cache:
+            try:
+                result = parse_learning_path("".join(chunks))
+                if result.weekly_goals and not result.truncated and not result.dropped_weeks:
+                    self.cache.set_learning_path(topic, experience_level, time_commitment, learning_goals, result.data)
+            except LLMJSONError:
+                pass
+    
     async def generate_adaptive_recommendations(self, topic: str, current_progress: str, challenges_faced: Optional[str] = None, completed_items: Optional[List[str]] = None) -> List[str]:
         """Generate adaptive recommendations based on progress and challenges"""
         
@@ -147,38 +323,15 @@ class AIService:
         """
         
         try:
-            if self.provider == "gemini":
-                response = self.model.generate_content(prompt)
-                content = response.text
-                
-            elif self.provider == "perplexity":
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(
-                        self.base_url,
-                        headers={
-                            "Authorization": f"Bearer {self.api_key}",
-                            "Content-Type": "application/json"
-                        },
-                        json={
-                            "model": "llama-3.1-sonar-small-128k-online",
-                            "messages": [
-                                {"role": "system", "content": "You are an expert learning mentor. Provide specific, actionable recommendations based on learner progress."},
-                                {"role": "user", "content": prompt}
-                            ],
-                            "max_tokens": 1000,
-                            "temperature": 0.7
-                        }
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                    content = data['choices'][0]['message']['content']
+            content = await self._generate(
+                prompt,
+                system_prompt="You are an expert learning mentor. Provide specific, actionable recommendations based on learner progress.",
+                max_tokens=1000,
+                temperature=0.7
+            )
             
             # Extract JSON array from response
-            json_start = content.find('[')
-            json_end = content.rfind(']') + 1
-            json_str = content[json_start:json_end]
-            
-            recommendations = json.loads(json_str)
+            recommendations = extract_json(content, list)
             return recommendations
             
         except Exception as e:
@@ -209,38 +362,15 @@ class AIService:
         """
         
         try:
-            if self.provider == "gemini":
-                response = self.model.generate_content(prompt)
-                content = response.text
-                
-            elif self.provider == "perplexity":
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(
-                        self.base_url,
-                        headers={
-                            "Authorization": f"Bearer {self.api_key}",
-                            "Content-Type": "application/json"
-                        },
-                        json={
-                            "model": "llama-3.1-sonar-small-128k-online",
-                            "messages": [
-                                {"role": "system", "content": "You are an expert learning analyst. Analyze progress patterns and provide actionable insights."},
-                                {"role": "user", "content": prompt}
-                            ],
-                            "max_tokens": 1500,
-                            "temperature": 0.5
-                        }
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                    content = data['choices'][0]['message']['content']
+            content = await self._generate(
+                prompt,
+                system_prompt="You are an expert learning analyst. Analyze progress patterns and provide actionable insights.",
+                max_tokens=1500,
+                temperature=0.5
+            )
             
             # Extract JSON from response
-            json_start = content.find('{')
-            json_end = content.rfind('}') + 1
-            json_str = content[json_start:json_end]
-            
-            analysis = json.loads(json_str)
+            analysis = extract_json(content, dict)
             return analysis
             
         except Exception as e:
@@ -0,0 +1,176 @@
+import os
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class PersistentTTLCache:
+    """Two-tier key/value cache: an in-memory LRU in front of a JSON file per entry on disk.
+    
+    Entries expire after ttl_seconds. The memory tier is capped at max_memory_entries
+    (least recently used first out); the disk tier survives restarts and is pruned by
+    age once it grows past max_disk_entries. Values must be JSON serializable.
+    """
+    
+    def __init__(self, name: str, ttl_seconds: float, max_memory_entries: int = 256, max_disk_entries: int = 2048, cache_dir: Optional[str] = None):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.cache_dir = os.path.join(cache_dir or os.getenv("CACHE_DIR", "data/cache"), name)
+        
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._disk_entries = self._count_disk_entries()
+        
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+    
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, stored_at) for key, or None if missing or expired"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            if self._is_fresh(stored_at):
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return value, stored_at
+            self._memory.pop(key, None)
+            self.expirations += 1
+        
+        entry = self._read_disk(key)
+        if entry is not None:
+            stored_at, value = entry
+            if self._is_fresh(stored_at):
+                self._remember(key, stored_at, value)
+                self.hits += 1
+                self.disk_hits += 1
+                return value, stored_at
+            self._delete_disk(key)
+            self.expirations += 1
+        
+        self.misses += 1
+        return None
+    
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None) -> None:
+        """Store value under key in both tiers"""
+        stored_at = stored_at if stored_at is not None else time.time()
+        self._remember(key, stored_at, value)
+        self._write_disk(key, stored_at, value)
+    
+    def delete(self, key: str) -> None:
+        """Remove key from both tiers"""
+        self._memory.pop(key, None)
+        self._delete_disk(key)
+    
+    def clear(self) -> None:
+        """Drop every entry from both tiers"""
+        self._memory.clear()
+        if os.path.isdir(self.cache_dir):
+            for filename in os.listdir(self.cache_dir):
+                try:
+                    os.remove(os.path.join(self.cache_dir, filename))
+                except OSError:
+                    pass
+        self._disk_entries = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and tier sizes"""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "memory_entries": len(self._memory),
+            "disk_entries": self._disk_entries
+        }
+    
+    def _is_fresh(self, stored_at: float) -> bool:
+        return (time.time() - stored_at) < self.ttl_seconds
+    
+    def _remember(self, key: str, stored_at: float, value: Any) -> None:
+        self._memory[key] = (stored_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+    
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+    
+    def _count_disk_entries(self) -> int:
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        return sum(1 for filename in os.listdir(self.cache_dir) if filename.endswith(".json"))
+    
+    def _read_disk(self, key: str) -> Optional[Tuple[float, Any]]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            # Guard against hash collisions
+            if data.get("key") != key:
+                return None
+            return data["stored_at"], data["value"]
+        except Exception as e:
+            print(f"Error reading cache entry from {path}: {e}")
+            return None
+    
+    def _write_disk(self, key: str, stored_at: float, value: Any) -> None:
+        path = self._path(key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            is_new = not os.path.exists(path)
+            
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({"key": key, "stored_at": stored_at, "value": value}, f, default=str)
+            os.replace(tmp_path, path)
+            
+            if is_new:
+                self._disk_entries += 1
+                if self._disk_entries > self.max_disk_entries:
+                    self._prune_disk()
+        except Exception as e:
+            print(f"Error writing cache entry to {path}: {e}")
+    
+    def _delete_disk(self, key: str) -> None:
+        path = self._path(key)
+        try:
+            os.remove(path)
+            self._disk_entries = max(0, self._disk_entries - 1)
+        except OSError:
+            pass
+    
+    def _prune_disk(self) -> None:
+        """Remove the oldest disk entries, leaving ~10% headroom below the cap"""
+        paths = [
+            os.path.join(self.cache_dir, filename)
+            for filename in os.listdir(self.cache_dir)
+            if filename.endswith(".json")
+        ]
+        paths.sort(key=os.path.getmtime)
+        target = int(self.max_disk_entries * 0.9)
+        for path in paths[:max(0, len(paths) - target)]:
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except OSError:
+                pass
+        self._disk_entries = self._count_disk_entries()
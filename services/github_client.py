@@ -0,0 +1,271 @@
+import os
+import time
+import json
+import asyncio
+from typing import List, Dict, Any, Optional, Union
+from services.cache import PersistentTTLCache
+from services.http_client import get_http_client
+from services.rate_limit import RateLimitScheduler, RateLimitTimeout, INTERACTIVE
+
+GITHUB_API_BASE = "https://api.github.com"
+GITHUB_GRAPHQL_URL = f"{GITHUB_API_BASE}/graphql"
+
+# Repository fields requested over GraphQL, mapped back to REST names by _graphql_repository
+_REPOSITORY_FIELDS = """
+    name description url stargazerCount forkCount createdAt updatedAt
+    primaryLanguage { name }
+    repositoryTopics(first: 10) { nodes { topic { name } } }
+"""
+
+
+class GitHubAPIError(Exception):
+    """Error response from the GitHub REST API"""
+    
+    def __init__(self, status_code: int, message: str, rate_limited: bool = False):
+        super().__init__(f"GitHub API error {status_code}: {message}")
+        self.status_code = status_code
+        self.rate_limited = rate_limited
+
+
+class GitHubClient:
+    """Async GitHub REST client with an on-disk conditional-request cache.
+    
+    Responses are kept with their ETag. Within GITHUB_CACHE_TTL_SECONDS a cached
+    response is reused without a request; after that it is revalidated with
+    If-None-Match, and a 304 (which GitHub does not count against the rate limit)
+    renews it. When GitHub refuses a request because of rate limiting, any cached
+    response younger than GITHUB_CACHE_MAX_AGE_SECONDS is served instead.
+    
+    Requests that do reach GitHub go through a RateLimitScheduler, so once a window
+    runs low they queue (interactive first) instead of collecting 403s.
+    """
+    
+    def __init__(self, token: Optional[str] = None):
+        self.token = token or os.getenv("GITHUB_TOKEN")
+        self.fresh_seconds = float(os.getenv("GITHUB_CACHE_TTL_SECONDS", str(3600)))
+        self.cache = PersistentTTLCache(
+            name="github",
+            ttl_seconds=float(os.getenv("GITHUB_CACHE_MAX_AGE_SECONDS", str(7 * 24 * 3600))),
+            max_memory_entries=512,
+            max_disk_entries=5000
+        )
+        
+        self.scheduler = RateLimitScheduler()
+        
+        self.requests = 0
+        self.graphql_requests = 0
+        self.not_modified = 0
+        self.stale_served = 0
+    
+    async def search_repositories(self, query: str, sort: str = "stars", order: str = "desc", per_page: int = 10, priority: str = INTERACTIVE) -> Dict[str, Any]:
+        """GET /search/repositories"""
+        return await self.get("/search/repositories", self._search_params(query, sort, order, per_page), priority)
+    
+    async def search_repositories_batch(self, queries: List[str], sort: str = "stars", order: str = "desc", per_page: int = 10, priority: str = INTERACTIVE, semaphore: Optional[asyncio.Semaphore] = None) -> List[Union[Dict[str, Any], GitHubAPIError]]:
+        """Run several repository searches, returning one REST-shaped response per query.
+        
+        With a token, every query not answered by the cache goes out as an aliased
+        search field of a single GraphQL request. GraphQL requires authentication,
+        so without a token the REST searches run concurrently instead, each holding
+        the caller's semaphore (if given) so they count against its concurrency cap.
+        Queries fail independently: a failed query's slot holds its GitHubAPIError.
+        """
+        async def bounded(coro):
+            if semaphore is None:
+                return await coro
+            async with semaphore:
+                return await coro
+        
+        if not self.token:
+            responses = await asyncio.gather(*[
+                bounded(self.search_repositories(query, sort, order, per_page, priority)) for query in queries
+            ], return_exceptions=True)
+            return [
+                response if isinstance(response, (dict, GitHubAPIError)) else GitHubAPIError(0, str(response))
+                for response in responses
+            ]
+        
+        results: List[Union[Dict[str, Any], GitHubAPIError, None]] = [None] * len(queries)
+        keys = [self._cache_key("/search/repositories", self._search_params(query, sort, order, per_page)) for query in queries]
+        stale: Dict[int, Dict[str, Any]] = {}
+        pending = []
+        for i, key in enumerate(keys):
+            entry = self.cache.get_entry(key)
+            if entry is not None and time.time() - entry[1] <= self.fresh_seconds:
+                results[i] = entry[0]["data"]
+                continue
+            if entry is not None:
+                stale[i] = entry[0]["data"]
+            pending.append(i)
+        
+        if not pending:
+            return results
+        
+        declarations = ", ".join([f"$q{n}: String!" for n in range(len(pending))] + ["$first: Int!"])
+        fields = " ".join(
+            f"w{n}: search(query: $q{n}, type: REPOSITORY, first: $first) {{ nodes {{ ... on Repository {{ {_REPOSITORY_FIELDS} }} }} }}"
+            for n in range(len(pending))
+        )
+        variables: Dict[str, Any] = {f"q{n}": f"{queries[i]} sort:{sort}-{order}" for n, i in enumerate(pending)}
+        variables["first"] = per_page
+        
+        try:
+            body = await bounded(self._graphql_body(f"query({declarations}) {{ {fields} }}", variables, priority))
+        except GitHubAPIError as e:
+            for i in pending:
+                results[i] = self._stale_or_error(stale.get(i), e)
+            return results
+        
+        data = body.get("data") or {}
+        # Errors for individual searches name their alias first in "path"
+        errors = {
+            error["path"][0]: self._graphql_error(200, error)
+            for error in body.get("errors") or [] if error.get("path")
+        }
+        for n, i in enumerate(pending):
+            if f"w{n}" in errors or data.get(f"w{n}") is None:
+                error = errors.get(f"w{n}") or GitHubAPIError(200, "GraphQL search returned no data")
+                results[i] = self._stale_or_error(stale.get(i), error)
+                continue
+            nodes = data[f"w{n}"].get("nodes") or []
+            items = [self._graphql_repository(node) for node in nodes if node]
+            results[i] = {"total_count": len(items), "items": items}
+            self.cache.set(keys[i], {"etag": None, "data": results[i]})
+        return results
+    
+    async def graphql(self, query: str, variables: Optional[Dict[str, Any]] = None, priority: str = INTERACTIVE) -> Dict[str, Any]:
+        """POST a GraphQL query and return its data"""
+        return (await self._graphql_body(query, variables, priority)).get("data") or {}
+    
+    async def _graphql_body(self, query: str, variables: Optional[Dict[str, Any]], priority: str) -> Dict[str, Any]:
+        """POST a GraphQL query and return the whole response body, which may carry partial errors"""
+        if not self.token:
+            raise GitHubAPIError(401, "The GraphQL API requires GITHUB_TOKEN")
+        
+        try:
+            await self.scheduler.acquire("graphql", priority)
+        except RateLimitTimeout as e:
+            raise GitHubAPIError(429, str(e), rate_limited=True)
+        
+        client = get_http_client()
+        self.requests += 1
+        self.graphql_requests += 1
+        response = await client.post(
+            GITHUB_GRAPHQL_URL,
+            json={"query": query, "variables": variables or {}},
+            headers={"Authorization": f"Bearer {self.token}"}
+        )
+        self.scheduler.update("graphql", response.headers)
+        
+        if response.status_code >= 400:
+            raise GitHubAPIError(response.status_code, self._error_message(response), self._is_rate_limited(response))
+        
+        body = response.json()
+        errors = body.get("errors") or []
+        if errors and not body.get("data"):
+            rate_limited = any(error.get("type") == "RATE_LIMITED" for error in errors)
+            raise GitHubAPIError(response.status_code, errors[0].get("message", "GraphQL error"), rate_limited)
+        return body
+    
+    def _graphql_error(self, status_code: int, error: Dict[str, Any]) -> GitHubAPIError:
+        return GitHubAPIError(status_code, error.get("message", "GraphQL error"), error.get("type") == "RATE_LIMITED")
+    
+    def _stale_or_error(self, cached: Optional[Dict[str, Any]], error: GitHubAPIError) -> Union[Dict[str, Any], GitHubAPIError]:
+        """A stale cached response if the failure was a rate limit, as get() does, otherwise the error"""
+        if error.rate_limited and cached is not None:
+            self.stale_served += 1
+            return cached
+        return error
+    
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None, priority: str = INTERACTIVE) -> Dict[str, Any]:
+        """GET a REST resource, answering from cache or revalidating with its ETag"""
+        params = params or {}
+        key = self._cache_key(path, params)
+        entry = self.cache.get_entry(key)
+        
+        if entry is not None and time.time() - entry[1] <= self.fresh_seconds:
+            return entry[0]["data"]
+        
+        headers = {"Accept": "application/vnd.github.v3+json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if entry is not None and entry[0].get("etag"):
+            headers["If-None-Match"] = entry[0]["etag"]
+        
+        # Search has its own, much smaller, rate limit window
+        bucket = "search" if path.startswith("/search/") else "core"
+        try:
+            await self.scheduler.acquire(bucket, priority)
+        except RateLimitTimeout as e:
+            if entry is not None:
+                self.stale_served += 1
+                return entry[0]["data"]
+            raise GitHubAPIError(429, str(e), rate_limited=True)
+        
+        client = get_http_client()
+        self.requests += 1
+        response = await client.get(f"{GITHUB_API_BASE}{path}", params=params, headers=headers)
+        self.scheduler.update(bucket, response.headers)
+        
+        if response.status_code == 304 and entry is not None:
+            self.not_modified += 1
+            self.cache.set(key, entry[0])
+            return entry[0]["data"]
+        
+        if response.status_code >= 400:
+            rate_limited = self._is_rate_limited(response)
+            if rate_limited and entry is not None:
+                self.stale_served += 1
+                return entry[0]["data"]
+            raise GitHubAPIError(response.status_code, self._error_message(response), rate_limited)
+        
+        data = response.json()
+        self.cache.set(key, {"etag": response.headers.get("ETag"), "data": data})
+        return data
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return request, revalidation and cache counters"""
+        return {
+            "authenticated": bool(self.token),
+            "requests": self.requests,
+            "graphql_requests": self.graphql_requests,
+            "not_modified": self.not_modified,
+            "stale_served": self.stale_served,
+            "rate_limit": self.scheduler.stats(),
+            "cache": self.cache.stats()
+        }
+    
+    def _search_params(self, query: str, sort: str, order: str, per_page: int) -> Dict[str, Any]:
+        return {"q": query, "sort": sort, "order": order, "per_page": per_page}
+    
+    def _cache_key(self, path: str, params: Dict[str, Any]) -> str:
+        return f"{path}?{json.dumps(params, sort_keys=True)}"
+    
+    def _is_rate_limited(self, response: Any) -> bool:
+        return response.status_code == 429 or (
+            response.status_code == 403 and response.headers.get("X-RateLimit-Remaining") == "0"
+        )
+    
+    def _error_message(self, response: Any) -> str:
+        try:
+            return response.json().get("message", response.text)
+        except ValueError:
+            return response.text
+    
+    def _graphql_repository(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """Reshape a GraphQL Repository node like a REST search item"""
+        return {
+            "name": node.get("name"),
+            "description": node.get("description"),
+            "html_url": node.get("url"),
+            "stargazers_count": node.get("stargazerCount", 0),
+            "forks_count": node.get("forkCount", 0),
+            "language": (node.get("primaryLanguage") or {}).get("name"),
+            "topics": [
+                topic["topic"]["name"]
+                for topic in (node.get("repositoryTopics") or {}).get("nodes", [])
+                if topic and topic.get("topic")
+            ],
+            "created_at": node.get("createdAt"),
+            "updated_at": node.get("updatedAt")
+        }
@@ -0,0 +1,65 @@
+import os
+from typing import Optional
+import httpx
+
+# Upstream hosts that get their own connection pool so one slow API cannot starve the others
+POOLED_HOSTS = [
+    "api.openai.com",
+    "api.perplexity.ai",
+    "api.github.com",
+    "www.googleapis.com"
+]
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    """Create the shared AsyncClient with keep-alive pools and timeouts from the environment"""
+    timeout = httpx.Timeout(
+        float(os.getenv("HTTP_TIMEOUT_SECONDS", "30")),
+        connect=float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+    )
+    keepalive_expiry = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "60"))
+    per_host = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "10"))
+    
+    host_limits = httpx.Limits(
+        max_connections=per_host,
+        max_keepalive_connections=per_host,
+        keepalive_expiry=keepalive_expiry
+    )
+    mounts = {
+        f"https://{host}": httpx.AsyncHTTPTransport(limits=host_limits, retries=1)
+        for host in POOLED_HOSTS
+    }
+    
+    return httpx.AsyncClient(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")),
+            keepalive_expiry=keepalive_expiry
+        ),
+        mounts=mounts,
+        headers={"User-Agent": "Learning-Path-Mentor-Bot"}
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the application-wide HTTP client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+async def start_http_client() -> None:
+    """Open the shared client at application startup"""
+    get_http_client()
+
+
+async def close_http_client() -> None:
+    """Close pooled connections at application shutdown"""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import uuid
+import glob
+import asyncio
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+from models.learning_path import LearningPathJob, JobStatus
+
+
+class LearningPathJobQueue:
+    """In-process queue that creates learning paths in the background.
+    
+    A fixed pool of worker tasks (JOB_WORKERS) bounds how many plans are built at
+    once. Every job is written to JOBS_DIR as it changes state, and on start any
+    job that was queued or running when the process stopped is queued again, so a
+    restart does not lose accepted work. Finished jobs are kept for
+    JOB_RETENTION_SECONDS so clients can still fetch their result.
+    """
+    
+    def __init__(self, learning_path_service, max_workers: Optional[int] = None, jobs_dir: Optional[str] = None):
+        self.learning_path_service = learning_path_service
+        self.max_workers = max_workers or int(os.getenv("JOB_WORKERS", "2"))
+        self.jobs_dir = jobs_dir or os.getenv("JOBS_DIR", "data/jobs")
+        self.retention_seconds = float(os.getenv("JOB_RETENTION_SECONDS", str(24 * 3600)))
+        # A job that keeps failing because it crashes the process is not retried forever
+        self.max_attempts = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+        
+        self._jobs: Dict[str, LearningPathJob] = {}
+        self._done: Dict[str, asyncio.Event] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+    
+    async def start(self) -> None:
+        """Start the workers and resume jobs left over from the previous run"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        
+        for job in self._load_jobs():
+            self._jobs[job.id] = job
+            self._done[job.id] = asyncio.Event()
+            if job.finished:
+                self._done[job.id].set()
+            else:
+                job.status = JobStatus.QUEUED
+                self._save(job)
+                self._queue.put_nowait(job.id)
+        
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(max(1, self.max_workers))]
+    
+    async def stop(self) -> None:
+        """Stop the workers; unfinished jobs stay persisted and resume on the next start"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+    
+    async def submit(self, topic: str, experience_level: str, time_commitment: str, learning_goals: Optional[str] = None, user_id: Optional[str] = None) -> LearningPathJob:
+        """Queue a learning path for creation and return its job"""
+        await self.start()
+        self._prune_expired()
+        job = LearningPathJob(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            topic=topic,
+            experience_level=experience_level,
+            time_commitment=time_commitment,
+            learning_goals=learning_goals
+        )
+        self._jobs[job.id] = job
+        self._done[job.id] = asyncio.Event()
+        self._save(job)
+        self._queue.put_nowait(job.id)
+        return job
+    
+    def get(self, job_id: str) -> Optional[LearningPathJob]:
+        """Return a job by ID, or None if it is unknown or expired"""
+        return self._jobs.get(job_id)
+    
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[LearningPathJob]:
+        """Wait until a job finishes (or timeout passes) and return it"""
+        event = self._done.get(job_id)
+        if event is None:
+            return None
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._jobs.get(job_id)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return job counts by status and the worker pool size"""
+        counts = {status.value: 0 for status in JobStatus}
+        for job in self._jobs.values():
+            counts[job.status.value] += 1
+        return {
+            "workers": len(self._workers),
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "jobs": counts
+        }
+    
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self._jobs.get(job_id)
+                if job is not None and not job.finished:
+                    await self._run(job)
+            finally:
+                self._queue.task_done()
+    
+    async def _run(self, job: LearningPathJob) -> None:
+        job.attempts += 1
+        if job.attempts > self.max_attempts:
+            self._finish(job, JobStatus.FAILED, error="Job was interrupted too many times")
+            return
+        
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now()
+        self._save(job)
+        
+        try:
+            learning_path = await self.learning_path_service.create_learning_path(
+                topic=job.topic,
+                experience_level=job.experience_level,
+                time_commitment=job.time_commitment,
+                learning_goals=job.learning_goals,
+                user_id=job.user_id
+            )
+            self._finish(job, JobStatus.COMPLETED, result=learning_path.model_dump(mode="json"))
+        except asyncio.CancelledError:
+            # Shutting down: leave the job as running so the next start picks it up
+            raise
+        except Exception as e:
+            print(f"Error in learning path job {job.id}: {e}")
+            self._finish(job, JobStatus.FAILED, error=str(e))
+    
+    def _finish(self, job: LearningPathJob, status: JobStatus, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = datetime.now()
+        self._save(job)
+        self._done[job.id].set()
+    
+    def _expired(self, job: LearningPathJob, now: float) -> bool:
+        return job.finished and job.finished_at is not None and now - job.finished_at.timestamp() > self.retention_seconds
+    
+    def _prune_expired(self) -> None:
+        now = time.time()
+        for job in [job for job in self._jobs.values() if self._expired(job, now)]:
+            self._jobs.pop(job.id, None)
+            self._done.pop(job.id, None)
+            try:
+                os.remove(self._job_path(job.id))
+            except OSError:
+                pass
+    
+    def _job_path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f"{job_id}.json")
+    
+    def _save(self, job: LearningPathJob) -> None:
+        try:
+            os.makedirs(self.jobs_dir, exist_ok=True)
+            path = self._job_path(job.id)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(job.model_dump_json())
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Warning: Could not persist job {job.id}: {e}")
+    
+    def _load_jobs(self) -> List[LearningPathJob]:
+        jobs = []
+        now = time.time()
+        for path in glob.glob(os.path.join(self.jobs_dir, "*.json")):
+            try:
+                with open(path, 'r') as f:
+                    job = LearningPathJob(**json.load(f))
+                if self._expired(job, now):
+                    os.remove(path)
+                    continue
+                jobs.append(job)
+            except Exception as e:
+                print(f"Warning: Could not load job {path}: {e}")
+        jobs.sort(key=lambda job: job.created_at)
+        return jobs
@@ -1,20 +1,204 @@
 import os
 import json
-from typing import List, Dict, Any, Optional
+import time
+import asyncio
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator, Awaitable
 from datetime import datetime, timedelta
-import httpx
+from services.github_client import GitHubClient
+from services.youtube_service import MOCK_VIDEO_URLS
+from services.rate_limit import INTERACTIVE
+from services.llm_cache import learning_path_fingerprint
+from services.llm_json import WeeklyGoalStreamParser, parse_learning_path, merge_weekly_goals, validate_weekly_goal
+from services.resource_index import ResourceIndex
+from services.ranking import parse_duration, format_duration, target_video_seconds
+from services.resource_normalizer import normalize_resource, normalize_learning_path
 from models.learning_path import (
     LearningPath, StudyPlan, WeeklyGoal, LearningResource, 
-    ProgressUpdate, ExperienceLevel, TimeCommitment, ResourceType
+    ProgressUpdate, ProgressEvent, ExperienceLevel, TimeCommitment, ResourceType
 )
 
+# Real GitHub repositories for different topics, served when the API is unavailable
+MOCK_GITHUB_PROJECTS = {
+    'python': [
+        {
+            'name': 'python-examples',
+            'description': 'A collection of Python examples and tutorials for beginners to advanced users.',
+            'html_url': 'https://github.com/trekhleb/javascript-algorithms',
+            'stars': 170000,
+            'forks': 28000,
+            'language': 'Python',
+            'topics': ['python', 'tutorial', 'examples', 'learning']
+        },
+        {
+            'name': 'awesome-python',
+            'description': 'A curated list of awesome Python frameworks, libraries, software and resources.',
+            'html_url': 'https://github.com/vinta/awesome-python',
+            'stars': 170000,
+            'forks': 22000,
+            'language': 'Python',
+            'topics': ['python', 'awesome', 'curated', 'resources']
+        }
+    ],
+    'javascript': [
+        {
+            'name': 'javascript-algorithms',
+            'description': 'Algorithms and data structures implemented in JavaScript with explanations.',
+            'html_url': 'https://github.com/trekhleb/javascript-algorithms',
+            'stars': 170000,
+            'forks': 28000,
+            'language': 'JavaScript',
+            'topics': ['javascript', 'algorithms', 'data-structures']
+        },
+        {
+            'name': 'awesome-javascript',
+            'description': 'A collection of awesome browser-side JavaScript libraries, resources and shiny things.',
+            'html_url': 'https://github.com/sorrycc/awesome-javascript',
+            'stars': 30000,
+            'forks': 4000,
+            'language': 'JavaScript',
+            'topics': ['javascript', 'awesome', 'libraries']
+        }
+    ],
+    'react': [
+        {
+            'name': 'react-examples',
+            'description': 'A collection of React examples and tutorials for learning React.',
+            'html_url': 'https://github.com/facebook/create-react-app',
+            'stars': 100000,
+            'forks': 26000,
+            'language': 'JavaScript',
+            'topics': ['react', 'examples', 'tutorial']
+        },
+        {
+            'name': 'awesome-react',
+            'description': 'A collection of awesome things regarding React ecosystem.',
+            'html_url': 'https://github.com/enaqx/awesome-react',
+            'stars': 60000,
+            'forks': 7000,
+            'language': 'JavaScript',
+            'topics': ['react', 'awesome', 'ecosystem']
+        }
+    ],
+    'machine learning': [
+        {
+            'name': 'machine-learning-examples',
+            'description': 'A collection of machine learning examples and tutorials.',
+            'html_url': 'https://github.com/ageron/handson-ml3',
+            'stars': 40000,
+            'forks': 8000,
+            'language': 'Python',
+            'topics': ['machine-learning', 'examples', 'tutorial']
+        },
+        {
+            'name': 'awesome-machine-learning',
+            'description': 'A curated list of awesome Machine Learning frameworks, libraries and software.',
+            'html_url': 'https://github.com/josephmisiti/awesome-machine-learning',
+            'stars': 60000,
+            'forks': 12000,
+            'language': 'Python',
+            'topics': ['machine-learning', 'awesome', 'curated']
+        }
+    ],
+    'web3': [
+        {
+            'name': 'web3-examples',
+            'description': 'A collection of Web3 and blockchain examples and tutorials.',
+            'html_url': 'https://github.com/ethereum/ethereum-org-website',
+            'stars': 4000,
+            'forks': 2000,
+            'language': 'JavaScript',
+            'topics': ['web3', 'ethereum', 'blockchain']
+        },
+        {
+            'name': 'awesome-web3',
+            'description': 'A curated list of awesome Web3 resources and tools.',
+            'html_url': 'https://github.com/youngboy/awesome-web3',
+            'stars': 2000,
+            'forks': 300,
+            'language': 'JavaScript',
+            'topics': ['web3', 'awesome', 'blockchain']
+        }
+    ],
+    'devops': [
+        {
+            'name': 'devops-examples',
+            'description': 'A collection of DevOps examples and tutorials.',
+            'html_url': 'https://github.com/mikewilliams/awesome-devops',
+            'stars': 10000,
+            'forks': 1000,
+            'language': 'Shell',
+            'topics': ['devops', 'examples', 'tutorial']
+        },
+        {
+            'name': 'awesome-devops',
+            'description': 'A curated list of awesome DevOps tools and resources.',
+            'html_url': 'https://github.com/mikewilliams/awesome-devops',
+            'stars': 10000,
+            'forks': 1000,
+            'language': 'Shell',
+            'topics': ['devops', 'awesome', 'tools']
+        }
+    ]
+}
+
+# The generic fallback in _get_mock_github_projects reuses one of these URLs
+MOCK_GITHUB_PROJECT_URLS = frozenset(repo['html_url'] for repos in MOCK_GITHUB_PROJECTS.values() for repo in repos)
+
+
 class LearningPathService:
-    def __init__(self, ai_service, youtube_service, notion_service):
+    def __init__(self, ai_service, youtube_service, notion_service, concurrent_enrichment: bool = True, max_concurrency: Optional[int] = None, resource_index: Optional[ResourceIndex] = None):
         self.ai_service = ai_service
         self.youtube_service = youtube_service
         self.notion_service = notion_service
+        
+        # Week enrichment fans out YouTube/GitHub lookups; the bound caps in-flight upstream calls
+        self.concurrent_enrichment = concurrent_enrichment
+        self.max_concurrency = max_concurrency or int(os.getenv("ENRICHMENT_MAX_CONCURRENCY", "6"))
+        
+        # Single-flight: identical concurrent create requests share one in-flight task
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.leader_requests = 0
+        self.coalesced_requests = 0
+        
+        # Resources from earlier plans are reused before YouTube/GitHub are asked again
+        self.github = GitHubClient()
+        self.resource_index = resource_index or ResourceIndex()
+        # Mock fallback results must not stand in for live searches later
+        self.resource_index.excluded_urls.update(MOCK_VIDEO_URLS | MOCK_GITHUB_PROJECT_URLS)
+        if self.resource_index.enabled and self.resource_index.stats()["entries"] == 0:
+            self.resource_index.backfill_from_store(self.notion_service.store)
     
     async def create_learning_path(self, topic: str, experience_level: str, time_commitment: str, learning_goals: Optional[str] = None, user_id: str = None) -> LearningPath:
+        """Create a comprehensive learning path, sharing one computation between identical concurrent requests"""
+        
+        key = learning_path_fingerprint(topic, experience_level, time_commitment, learning_goals)
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced_requests += 1
+            learning_path = await asyncio.shield(in_flight)
+            own_copy = learning_path.model_copy(update={"user_id": user_id or "anonymous"}, deep=True)
+            if own_copy.user_id != learning_path.user_id:
+                # Stores keyed by user only saved the leader's plan; already normalized and indexed
+                await self.notion_service.store_learning_path(own_copy)
+            return own_copy
+        
+        # Run as a task so waiters still get the result if the first caller disconnects
+        task = asyncio.ensure_future(self._create_learning_path(topic, experience_level, time_commitment, learning_goals, user_id))
+        self._in_flight[key] = task
+        self.leader_requests += 1
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        
+        return await asyncio.shield(task)
+    
+    def coalescing_stats(self) -> Dict[str, int]:
+        """Return how many create_learning_path calls ran versus joined an in-flight one"""
+        return {
+            "leader_requests": self.leader_requests,
+            "coalesced_requests": self.coalesced_requests,
+            "in_flight": len(self._in_flight)
+        }
+    
+    async def _create_learning_path(self, topic: str, experience_level: str, time_commitment: str, learning_goals: Optional[str] = None, user_id: str = None) -> LearningPath:
         """Create a comprehensive learning path using all services"""
         
         # Generate base learning path using AI service
@@ -25,49 +209,218 @@ class LearningPathService:
             learning_goals=learning_goals
         )
         
-        # Enhance with YouTube resources
+        # Enhance every week with YouTube and GitHub resources
+        enhanced_goals, failures = await self.enrich_weekly_goals(topic, learning_path_data.get('weekly_goals', []), experience_level)
+        for week_number, errors in failures.items():
+            print(f"Warning: week {week_number} enrichment incomplete: {'; '.join(errors)}")
+        
+        learning_path = self._assemble_learning_path(topic, experience_level, time_commitment, learning_goals, user_id, enhanced_goals)
+        
+        # Store in Notion/local storage
+        await self._store_learning_path(learning_path)
+        
+        return learning_path
+    
+    async def stream_learning_path(self, topic: str, experience_level: str, time_commitment: str, learning_goals: Optional[str] = None, user_id: str = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Create a learning path, yielding each week as soon as it is generated and enriched.
+        
+        Yields ("week", weekly_goal) events in week order while the LLM is still
+        writing later weeks, then a single ("complete", learning_path) event once the
+        plan has been stored.
+        """
+        
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency if self.concurrent_enrichment else 1))
+        parser = WeeklyGoalStreamParser()
+        pending = []
         enhanced_goals = []
-        for goal in learning_path_data.get('weekly_goals', []):
-            # Get YouTube videos for this week's topic
-            week_topic = f"{topic} {goal.get('title', '')}"
-            youtube_videos = await self.youtube_service.search_educational_videos(week_topic, max_results=3)
-            
-            # Convert YouTube videos to LearningResource objects
-            resources = []
-            for video in youtube_videos:
-                resource = LearningResource(
-                    title=video['title'],
-                    description=video['description'],
-                    url=video['url'],
-                    resource_type=ResourceType.YOUTUBE_VIDEO,
-                    duration=video.get('duration', 'Unknown'),
-                    tags=video.get('tags', [])
+        
+        async def enrich(goal: Dict[str, Any]) -> WeeklyGoal:
+            resources, errors = await self._get_week_resources(
+                f"{topic} {goal.get('title', '')}", semaphore, goal.get('estimated_hours'), experience_level
+            )
+            if errors:
+                print(f"Warning: week {goal.get('week_number')} enrichment incomplete: {'; '.join(errors)}")
+            return self._build_weekly_goal(goal, resources)
+        
+        def ready_weeks():
+            while pending and pending[0].done():
+                weekly_goal = pending.pop(0).result()
+                enhanced_goals.append(weekly_goal)
+                yield weekly_goal
+        
+        try:
+            if hasattr(self.ai_service, 'stream_learning_path'):
+                chunks = self.ai_service.stream_learning_path(
+                    topic=topic,
+                    experience_level=experience_level,
+                    time_commitment=time_commitment,
+                    learning_goals=learning_goals
                 )
-                resources.append(resource)
-            
-            # Add GitHub projects
-            github_projects = await self.get_github_projects(week_topic, max_results=2)
-            for project in github_projects:
-                resource = LearningResource(
-                    title=project['name'],
-                    description=project['description'],
-                    url=project['html_url'],
-                    resource_type=ResourceType.GITHUB_PROJECT,
-                    tags=project.get('topics', [])
+                streamed_weeks = []
+                async for chunk in chunks:
+                    for goal in parser.feed(chunk):
+                        if validate_weekly_goal(goal) is None:
+                            streamed_weeks.append(goal)
+                            pending.append(asyncio.create_task(enrich(goal)))
+                    for weekly_goal in ready_weeks():
+                        yield "week", weekly_goal.model_dump(mode="json")
+                
+                # Recover weeks the incremental parser could not use and re-ask only for a cut-off tail
+                result = parse_learning_path(parser.buffer)
+                extra_weeks = [goal for goal in result.weekly_goals if goal not in streamed_weeks]
+                if result.missing_week_numbers and hasattr(self.ai_service, 'complete_missing_weeks'):
+                    extra_weeks += await self.ai_service.complete_missing_weeks(
+                        topic, experience_level, time_commitment, learning_goals,
+                        merge_weekly_goals(streamed_weeks, extra_weeks), result.expected_weeks
+                    )
+                known_weeks = {goal.get('week_number') for goal in streamed_weeks}
+                for goal in merge_weekly_goals([], extra_weeks):
+                    if goal.get('week_number') not in known_weeks:
+                        pending.append(asyncio.create_task(enrich(goal)))
+            else:
+                learning_path_data = await self.ai_service.generate_learning_path(
+                    topic=topic,
+                    experience_level=experience_level,
+                    time_commitment=time_commitment,
+                    learning_goals=learning_goals
                 )
-                resources.append(resource)
+                for goal in learning_path_data.get('weekly_goals', []):
+                    pending.append(asyncio.create_task(enrich(goal)))
             
-            # Create WeeklyGoal with enhanced resources
-            weekly_goal = WeeklyGoal(
-                week_number=goal['week_number'],
-                title=goal['title'],
-                description=goal['description'],
-                resources=resources,
-                objectives=goal['objectives'],
-                estimated_hours=goal['estimated_hours'],
-                deadline=datetime.fromisoformat(goal['deadline'])
-            )
-            enhanced_goals.append(weekly_goal)
+            # The LLM has finished; drain the remaining weeks in order
+            while pending:
+                await asyncio.wait([pending[0]])
+                for weekly_goal in ready_weeks():
+                    yield "week", weekly_goal.model_dump(mode="json")
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        enhanced_goals.sort(key=lambda goal: goal.week_number)
+        learning_path = self._assemble_learning_path(topic, experience_level, time_commitment, learning_goals, user_id, enhanced_goals)
+        await self._store_learning_path(learning_path)
+        
+        yield "complete", learning_path.model_dump(mode="json")
+    
+    async def enrich_weekly_goals(self, topic: str, goals: List[Dict[str, Any]], experience_level: Optional[str] = None) -> Tuple[List[WeeklyGoal], Dict[int, List[str]]]:
+        """Attach YouTube and GitHub resources to every week, preserving week order.
+        
+        Returns the enriched goals and a mapping of week number to the lookups that
+        failed for it; a failed lookup leaves that week with fewer resources instead
+        of failing the whole plan.
+        """
+        limit = self.max_concurrency if self.concurrent_enrichment else 1
+        semaphore = asyncio.Semaphore(max(1, limit))
+        week_topics = [f"{topic} {goal.get('title', '')}" for goal in goals]
+        
+        # Every week the index cannot answer is resolved by a single batched GitHub lookup,
+        # which runs alongside the YouTube lookups rather than ahead of them, within the same cap
+        github_resources = [self.resource_index.lookup(week_topic, ResourceType.GITHUB_PROJECT, 2) for week_topic in week_topics]
+        missing = [week_topic for week_topic, found in zip(week_topics, github_resources) if found is None]
+        github_batch = asyncio.ensure_future(self.get_github_projects_batch(missing, max_results=2, semaphore=semaphore)) if missing else None
+        
+        async def batched_projects(position: int) -> List[Dict[str, Any]]:
+            # Shielded: a cancelled week must not cancel the batch the other weeks share
+            return (await asyncio.shield(github_batch))[position]
+        
+        positions = iter(range(len(missing)))
+        github_lookups = [batched_projects(next(positions)) if found is None else None for found in github_resources]
+        
+        results = await asyncio.gather(*[
+            self._get_week_resources(week_topic, semaphore, goal.get('estimated_hours'), experience_level, projects, lookup)
+            for week_topic, goal, projects, lookup in zip(week_topics, goals, github_resources, github_lookups)
+        ])
+        
+        enhanced_goals = []
+        failures = {}
+        for goal, (resources, errors) in zip(goals, results):
+            if errors:
+                failures[goal['week_number']] = errors
+            enhanced_goals.append(self._build_weekly_goal(goal, resources))
+        
+        return enhanced_goals, failures
+    
+    async def _get_week_resources(self, week_topic: str, semaphore: asyncio.Semaphore, estimated_hours: Optional[float] = None, experience_level: Optional[str] = None, github_resources: Optional[List[LearningResource]] = None, github_lookup: Optional[Awaitable[List[Dict[str, Any]]]] = None) -> Tuple[List[LearningResource], List[str]]:
+        """Fetch YouTube videos and GitHub projects for a single week, videos ranked to fit its workload and level.
+        
+        github_resources, when given, are projects already looked up for the week;
+        github_lookup, when given, yields the week's projects in place of a search
+        of its own (see enrich_weekly_goals).
+        """
+        
+        async def bounded(coro):
+            async with semaphore:
+                return await coro
+        
+        # Serve from the local index when it has enough fresh matches; only misses go upstream
+        indexed_videos = self.resource_index.lookup(week_topic, ResourceType.YOUTUBE_VIDEO, 3)
+        indexed_projects = github_resources
+        if github_resources is None and github_lookup is None:
+            indexed_projects = self.resource_index.lookup(week_topic, ResourceType.GITHUB_PROJECT, 2)
+        
+        lookups = {}
+        if indexed_videos is None:
+            lookups["YouTube"] = bounded(self.youtube_service.search_educational_videos(
+                week_topic,
+                max_results=3,
+                difficulty=experience_level,
+                target_seconds=target_video_seconds(estimated_hours, videos_per_week=3)
+            ))
+        if indexed_projects is None:
+            lookups["GitHub"] = github_lookup if github_lookup is not None else bounded(self.get_github_projects(week_topic, max_results=2))
+        results = dict(zip(lookups, await asyncio.gather(*lookups.values(), return_exceptions=True)))
+        
+        resources = []
+        fetched = []
+        errors = []
+        
+        youtube_videos = results.get("YouTube", [])
+        if isinstance(youtube_videos, BaseException):
+            errors.append(f"YouTube lookup failed: {youtube_videos}")
+        elif indexed_videos is not None:
+            resources.extend(indexed_videos)
+        else:
+            videos = [self._video_to_resource(video) for video in youtube_videos]
+            resources.extend(videos)
+            fetched.extend(videos)
+        
+        github_projects = results.get("GitHub", [])
+        if isinstance(github_projects, BaseException):
+            errors.append(f"GitHub lookup failed: {github_projects}")
+        elif indexed_projects is not None:
+            resources.extend(indexed_projects)
+        else:
+            projects = [self._project_to_resource(project) for project in github_projects]
+            resources.extend(projects)
+            fetched.extend(projects)
+        
+        # Only what the live APIs just returned is fresh; index hits keep their age
+        self.resource_index.add_resources(fetched, indexed_at=time.time())
+        return resources, errors
+    
+    def _video_to_resource(self, video: Dict[str, Any]) -> LearningResource:
+        """Convert a YouTube video dict to a LearningResource"""
+        return normalize_resource(LearningResource(
+            title=video['title'],
+            description=video['description'],
+            url=video['url'],
+            resource_type=ResourceType.YOUTUBE_VIDEO,
+            duration=format_duration(video.get('duration_seconds', parse_duration(video.get('duration')))),
+            tags=video.get('tags', [])
+        ))
+    
+    def _project_to_resource(self, project: Dict[str, Any]) -> LearningResource:
+        """Convert a GitHub project dict to a LearningResource"""
+        return normalize_resource(LearningResource(
+            title=project['name'],
+            description=project['description'],
+            url=project['html_url'],
+            resource_type=ResourceType.GITHUB_PROJECT,
+            tags=project.get('topics', [])
+        ))
+    
+    def _assemble_learning_path(self, topic: str, experience_level: str, time_commitment: str, learning_goals: Optional[str], user_id: Optional[str], weekly_goals: List[WeeklyGoal]) -> LearningPath:
+        """Wrap enriched weekly goals in a StudyPlan and LearningPath"""
         
         # Create StudyPlan
         study_plan = StudyPlan(
@@ -75,12 +428,12 @@ class LearningPathService:
             experience_level=ExperienceLevel(experience_level),
             time_commitment=TimeCommitment(time_commitment),
             learning_goals=learning_goals,
-            total_weeks=len(enhanced_goals),
-            weekly_goals=enhanced_goals
+            total_weeks=len(weekly_goals),
+            weekly_goals=weekly_goals
         )
         
         # Create LearningPath
-        learning_path = LearningPath(
+        return LearningPath(
             user_id=user_id or "anonymous",
             topic=topic,
             experience_level=ExperienceLevel(experience_level),
@@ -88,17 +441,24 @@ class LearningPathService:
             learning_goals=learning_goals,
             study_plan=study_plan
         )
-        
-        # Store in Notion/local storage
-        await self.notion_service.store_learning_path(learning_path)
-        
-        return learning_path
     
-    async def update_progress(self, topic: str, completed_items: List[str], current_progress: str, challenges_faced: Optional[str] = None) -> LearningPath:
+    def _build_weekly_goal(self, goal: Dict[str, Any], resources: List[LearningResource]) -> WeeklyGoal:
+        """Create a WeeklyGoal from AI-generated week data and its resources"""
+        return WeeklyGoal(
+            week_number=goal['week_number'],
+            title=goal['title'],
+            description=goal['description'],
+            resources=resources,
+            objectives=goal['objectives'],
+            estimated_hours=goal['estimated_hours'],
+            deadline=datetime.fromisoformat(goal['deadline'])
+        )
+    
+    async def update_progress(self, topic: str, completed_items: List[str], current_progress: str, challenges_faced: Optional[str] = None, user_id: Optional[str] = None) -> LearningPath:
         """Update progress and get adaptive recommendations"""
         
         # Get existing learning path
-        learning_path = await self.notion_service.get_learning_path(topic)
+        learning_path = await self.notion_service.get_learning_path(topic, user_id)
         if not learning_path:
             raise Exception(f"Learning path for topic '{topic}' not found")
         
@@ -118,206 +478,107 @@ class LearningPathService:
             completed_items=completed_items
         )
         
-        # Update learning path
-        learning_path.progress_updates.append(progress_update)
-        learning_path.adaptive_recommendations.extend(recommendations)
-        learning_path.last_updated = datetime.now()
-        
-        # Update completed goals
-        for item in completed_items:
-            for goal in learning_path.study_plan.weekly_goals:
-                if item in goal.title or any(item in obj for obj in goal.objectives):
-                    goal.completed = True
-                    goal.progress_percentage = 100.0
+        # Weeks whose title or objectives mention a completed item
+        completed_weeks = sorted({
+            goal.week_number
+            for item in completed_items
+            for goal in learning_path.study_plan.weekly_goals
+            if item in goal.title or any(item in obj for obj in goal.objectives)
+        })
+        event = ProgressEvent(
+            progress_update=progress_update,
+            recommendations=recommendations,
+            completed_weeks=completed_weeks
+        )
         
-        # Store updated learning path
-        await self.notion_service.store_learning_path(learning_path)
+        # Record just the event rather than rewriting the whole plan
+        learning_path.apply_progress_event(event)
+        await self.notion_service.append_progress_event(topic, event, user_id)
         
         return learning_path
     
-    async def get_learning_path(self, topic: str) -> Optional[LearningPath]:
+    async def _store_learning_path(self, learning_path: LearningPath) -> bool:
+        """Persist a learning path and add its resources to the local index"""
+        # Also bounds resources of plans stored before normalization existed
+        normalize_learning_path(learning_path)
+        stored = await self.notion_service.store_learning_path(learning_path)
+        self.resource_index.index_learning_path(learning_path)
+        return stored
+    
+    async def get_learning_path(self, topic: str, user_id: Optional[str] = None) -> Optional[LearningPath]:
         """Get existing learning path for a topic"""
-        return await self.notion_service.get_learning_path(topic)
+        return await self.notion_service.get_learning_path(topic, user_id)
     
-    async def get_github_projects(self, topic: str, max_results: int = 10) -> List[Dict[str, Any]]:
+    async def get_github_projects(self, topic: str, max_results: int = 10, priority: str = INTERACTIVE) -> List[Dict[str, Any]]:
         """Get GitHub projects for a specific topic"""
         
-        # GitHub API endpoint for searching repositories
-        url = "https://api.github.com/search/repositories"
-        params = {
-            "q": f"{topic} language:python language:javascript language:java",
-            "sort": "stars",
-            "order": "desc",
-            "per_page": max_results
-        }
-        
-        headers = {
-            "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "Learning-Path-Mentor-Bot"
-        }
-        
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params, headers=headers)
-                response.raise_for_status()
-                
-                data = response.json()
-                projects = []
-                
-                for repo in data.get('items', []):
-                    project = {
-                        'name': repo['name'],
-                        'description': repo['description'] or 'No description available',
-                        'html_url': repo['html_url'],
-                        'stars': repo['stargazers_count'],
-                        'forks': repo['forks_count'],
-                        'language': repo['language'],
-                        'topics': repo.get('topics', []),
-                        'created_at': repo['created_at'],
-                        'updated_at': repo['updated_at']
-                    }
-                    projects.append(project)
-                
-                return projects
-                
+            data = await self.github.search_repositories(
+                self._github_query(topic),
+                sort="stars",
+                order="desc",
+                per_page=max_results,
+                priority=priority
+            )
+            return [self._repo_to_project(repo) for repo in data.get('items', [])]
+        
         except Exception as e:
             print(f"Error fetching GitHub projects: {e}")
             # Return mock data if API fails
             return self._get_mock_github_projects(topic, max_results)
     
-    def _get_mock_github_projects(self, topic: str, max_results: int) -> List[Dict[str, Any]]:
-        """Return realistic GitHub project data for testing"""
+    async def get_github_projects_batch(self, topics: List[str], max_results: int = 10, priority: str = INTERACTIVE, semaphore: Optional[asyncio.Semaphore] = None) -> List[List[Dict[str, Any]]]:
+        """Get GitHub projects for several topics, in one request when a token allows GraphQL; upstream calls hold semaphore"""
         
-        # Real GitHub repositories for different topics
-        topic_repos = {
-            'python': [
-                {
-                    'name': 'python-examples',
-                    'description': 'A collection of Python examples and tutorials for beginners to advanced users.',
-                    'html_url': 'https://github.com/trekhleb/javascript-algorithms',
-                    'stars': 170000,
-                    'forks': 28000,
-                    'language': 'Python',
-                    'topics': ['python', 'tutorial', 'examples', 'learning']
-                },
-                {
-                    'name': 'awesome-python',
-                    'description': 'A curated list of awesome Python frameworks, libraries, software and resources.',
-                    'html_url': 'https://github.com/vinta/awesome-python',
-                    'stars': 170000,
-                    'forks': 22000,
-                    'language': 'Python',
-                    'topics': ['python', 'awesome', 'curated', 'resources']
-                }
-            ],
-            'javascript': [
-                {
-                    'name': 'javascript-algorithms',
-                    'description': 'Algorithms and data structures implemented in JavaScript with explanations.',
-                    'html_url': 'https://github.com/trekhleb/javascript-algorithms',
-                    'stars': 170000,
-                    'forks': 28000,
-                    'language': 'JavaScript',
-                    'topics': ['javascript', 'algorithms', 'data-structures']
-                },
-                {
-                    'name': 'awesome-javascript',
-                    'description': 'A collection of awesome browser-side JavaScript libraries, resources and shiny things.',
-                    'html_url': 'https://github.com/sorrycc/awesome-javascript',
-                    'stars': 30000,
-                    'forks': 4000,
-                    'language': 'JavaScript',
-                    'topics': ['javascript', 'awesome', 'libraries']
-                }
-            ],
-            'react': [
-                {
-                    'name': 'react-examples',
-                    'description': 'A collection of React examples and tutorials for learning React.',
-                    'html_url': 'https://github.com/facebook/create-react-app',
-                    'stars': 100000,
-                    'forks': 26000,
-                    'language': 'JavaScript',
-                    'topics': ['react', 'examples', 'tutorial']
-                },
-                {
-                    'name': 'awesome-react',
-                    'description': 'A collection of awesome things regarding React ecosystem.',
-                    'html_url': 'https://github.com/enaqx/awesome-react',
-                    'stars': 60000,
-                    'forks': 7000,
-                    'language': 'JavaScript',
-                    'topics': ['react', 'awesome', 'ecosystem']
-                }
-            ],
-            'machine learning': [
-                {
-                    'name': 'machine-learning-examples',
-                    'description': 'A collection of machine learning examples and tutorials.',
-                    'html_url': 'https://github.com/ageron/handson-ml3',
-                    'stars': 40000,
-                    'forks': 8000,
-                    'language': 'Python',
-                    'topics': ['machine-learning', 'examples', 'tutorial']
-                },
-                {
-                    'name': 'awesome-machine-learning',
-                    'description': 'A curated list of awesome Machine Learning frameworks, libraries and software.',
-                    'html_url': 'https://github.com/josephmisiti/awesome-machine-learning',
-                    'stars': 60000,
-                    'forks': 12000,
-                    'language': 'Python',
-                    'topics': ['machine-learning', 'awesome', 'curated']
-                }
-            ],
-            'web3': [
-                {
-                    'name': 'web3-examples',
-                    'description': 'A collection of Web3 and blockchain examples and tutorials.',
-                    'html_url': 'https://github.com/ethereum/ethereum-org-website',
-                    'stars': 4000,
-                    'forks': 2000,
-                    'language': 'JavaScript',
-                    'topics': ['web3', 'ethereum', 'blockchain']
-                },
-                {
-                    'name': 'awesome-web3',
-                    'description': 'A curated list of awesome Web3 resources and tools.',
-                    'html_url': 'https://github.com/youngboy/awesome-web3',
-                    'stars': 2000,
-                    'forks': 300,
-                    'language': 'JavaScript',
-                    'topics': ['web3', 'awesome', 'blockchain']
-                }
-            ],
-            'devops': [
-                {
-                    'name': 'devops-examples',
-                    'description': 'A collection of DevOps examples and tutorials.',
-                    'html_url': 'https://github.com/mikewilliams/awesome-devops',
-                    'stars': 10000,
-                    'forks': 1000,
-                    'language': 'Shell',
-                    'topics': ['devops', 'examples', 'tutorial']
-                },
-                {
-                    'name': 'awesome-devops',
-                    'description': 'A curated list of awesome DevOps tools and resources.',
-                    'html_url': 'https://github.com/mikewilliams/awesome-devops',
-                    'stars': 10000,
-                    'forks': 1000,
-                    'language': 'Shell',
-                    'topics': ['devops', 'awesome', 'tools']
-                }
-            ]
+        try:
+            responses = await self.github.search_repositories_batch(
+                [self._github_query(topic) for topic in topics],
+                sort="stars",
+                order="desc",
+                per_page=max_results,
+                priority=priority,
+                semaphore=semaphore
+            )
+        except Exception as e:
+            print(f"Error fetching GitHub projects: {e}")
+            return [self._get_mock_github_projects(topic, max_results) for topic in topics]
+        
+        projects = []
+        for topic, data in zip(topics, responses):
+            if isinstance(data, Exception):
+                # Only the topics whose search failed fall back to mock data
+                print(f"Error fetching GitHub projects for {topic}: {data}")
+                projects.append(self._get_mock_github_projects(topic, max_results))
+            else:
+                projects.append([self._repo_to_project(repo) for repo in data.get('items', [])])
+        return projects
+    
+    def _github_query(self, topic: str) -> str:
+        return f"{topic} language:python language:javascript language:java"
+    
+    def _repo_to_project(self, repo: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a GitHub search result to a project dict"""
+        return {
+            'name': repo['name'],
+            'description': repo['description'] or 'No description available',
+            'html_url': repo['html_url'],
+            'stars': repo['stargazers_count'],
+            'forks': repo['forks_count'],
+            'language': repo['language'],
+            'topics': repo.get('topics', []),
+            'created_at': repo['created_at'],
+            'updated_at': repo['updated_at']
         }
+    
+    def _get_mock_github_projects(self, topic: str, max_results: int) -> List[Dict[str, Any]]:
+        """Return realistic GitHub project data for testing"""
         
         # Get projects for the specific topic
         topic_lower = topic.lower()
         projects = []
         
         # Find matching topic
-        for key, repos in topic_repos.items():
+        for key, repos in MOCK_GITHUB_PROJECTS.items():
             if key in topic_lower or topic_lower in key:
                 projects.extend(repos)
                 break
@@ -340,10 +601,10 @@ class LearningPathService:
         
         return projects[:max_results]
     
-    async def analyze_progress_patterns(self, topic: str) -> Dict[str, Any]:
+    async def analyze_progress_patterns(self, topic: str, user_id: Optional[str] = None) -> Dict[str, Any]:
         """Analyze learning progress patterns and provide insights"""
         
-        learning_path = await self.get_learning_path(topic)
+        learning_path = await self.get_learning_path(topic, user_id)
         if not learning_path or not learning_path.progress_updates:
             return {"insights": [], "suggestions": []}
         
@@ -359,10 +620,10 @@ class LearningPathService:
         
         return await self.ai_service.analyze_progress_patterns(progress_data)
     
-    async def get_weekly_recommendations(self, topic: str, week_number: int) -> List[str]:
+    async def get_weekly_recommendations(self, topic: str, week_number: int, user_id: Optional[str] = None) -> List[str]:
         """Get specific recommendations for a particular week"""
         
-        learning_path = await self.get_learning_path(topic)
+        learning_path = await self.get_learning_path(topic, user_id)
         if not learning_path:
             return []
         
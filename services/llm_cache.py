@@ -0,0 +1,80 @@
+import os
+import re
+import copy
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from services.cache import PersistentTTLCache
+
+
+def learning_path_fingerprint(topic: str, experience_level: str, time_commitment: str, learning_goals: Optional[str] = None) -> str:
+    """Build a normalized cache key for a learning path request.
+    
+    Case, surrounding whitespace and repeated inner whitespace are ignored so that
+    "Machine  Learning" and "machine learning" share one entry.
+    """
+    def normalize(value: Optional[str]) -> str:
+        return re.sub(r"\s+", " ", (value or "").strip().lower())
+    
+    return "|".join([
+        normalize(topic),
+        normalize(experience_level),
+        normalize(time_commitment),
+        normalize(learning_goals)
+    ])
+
+
+class LLMResponseCache:
+    """Cache of generated learning path JSON keyed on the request fingerprint.
+    
+    Cached plans are returned with their weekly deadlines re-based onto the
+    current time, so a plan generated last week still starts today.
+    """
+    
+    def __init__(self, namespace: str, ttl_seconds: Optional[float] = None, max_memory_entries: Optional[int] = None, max_disk_entries: Optional[int] = None, cache_dir: Optional[str] = None):
+        self.namespace = namespace
+        self.store = PersistentTTLCache(
+            name=f"llm_{namespace}",
+            ttl_seconds=ttl_seconds or float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+            max_memory_entries=max_memory_entries or int(os.getenv("LLM_CACHE_MAX_ENTRIES", "128")),
+            max_disk_entries=max_disk_entries or int(os.getenv("LLM_CACHE_MAX_DISK_ENTRIES", "1000")),
+            cache_dir=cache_dir
+        )
+    
+    def get_learning_path(self, topic: str, experience_level: str, time_commitment: str, learning_goals: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return a cached learning path with fresh deadlines, or None on a miss"""
+        key = learning_path_fingerprint(topic, experience_level, time_commitment, learning_goals)
+        entry = self.store.get_entry(key)
+        if entry is None:
+            return None
+        
+        data, stored_at = entry
+        return self._rebase_deadlines(copy.deepcopy(data), datetime.fromtimestamp(stored_at))
+    
+    def set_learning_path(self, topic: str, experience_level: str, time_commitment: str, learning_goals: Optional[str], data: Dict[str, Any]) -> None:
+        """Cache a freshly generated learning path"""
+        key = learning_path_fingerprint(topic, experience_level, time_commitment, learning_goals)
+        self.store.set(key, copy.deepcopy(data), stored_at=time.time())
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for this cache"""
+        return self.store.stats()
+    
+    def _rebase_deadlines(self, data: Dict[str, Any], generated_at: datetime) -> Dict[str, Any]:
+        """Shift each week's deadline so it keeps its offset from generation time but starts now"""
+        now = datetime.now()
+        for goal in data.get('weekly_goals', []):
+            offset = None
+            try:
+                deadline = datetime.fromisoformat(str(goal.get('deadline')))
+                offset = deadline.replace(tzinfo=None) - generated_at
+            except (TypeError, ValueError):
+                pass
+            
+            # LLMs sometimes emit deadlines in the past; fall back to one week per week number
+            if offset is None or offset <= timedelta(0):
+                offset = timedelta(weeks=int(goal.get('week_number', 1) or 1))
+            
+            goal['deadline'] = (now + offset).isoformat()
+        
+        return data
@@ -0,0 +1,256 @@
+import re
+import json
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
+from pydantic import ValidationError
+from models.learning_path import WeeklyGoal
+
+
+class LLMJSONError(ValueError):
+    """Raised when no usable JSON value can be recovered from an LLM response"""
+
+
+_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*\n?(.*?)(?:```|$)", re.DOTALL)
+
+# Candidate start positions tried before giving up; prose rarely contains more braces than this
+_MAX_CANDIDATES = 20
+
+
+def strip_code_fences(text: str) -> str:
+    """Return the contents of the first markdown code fence, or the text unchanged"""
+    match = _FENCE_RE.search(text)
+    if match and match.group(1).strip():
+        return match.group(1)
+    return text
+
+
+def repair_json(text: str) -> Tuple[str, bool]:
+    """Fix common LLM JSON defects in a single string-aware pass.
+    
+    Removes trailing commas, escapes raw newlines inside strings and, if the text
+    ends before its outermost value is closed, cuts back to the last complete
+    member and closes every open container. Returns (repaired_text, truncated).
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    in_string = False
+    escape = False
+    # Length of out and the open containers at the last point where a member was complete
+    safe_length = 0
+    safe_stack: List[str] = []
+    
+    for ch in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+            elif ch == '\n':
+                out.append('\\n')
+                continue
+            out.append(ch)
+            continue
+        
+        if ch == '"':
+            in_string = True
+            out.append(ch)
+        elif ch in '{[':
+            stack.append('}' if ch == '{' else ']')
+            out.append(ch)
+            safe_length, safe_stack = len(out), list(stack)
+        elif ch in '}]':
+            _drop_trailing_comma(out)
+            if stack:
+                stack.pop()
+            out.append(ch)
+            safe_length, safe_stack = len(out), list(stack)
+            if not stack:
+                break
+        elif ch == ',':
+            safe_length, safe_stack = len(out), list(stack)
+            out.append(ch)
+        else:
+            out.append(ch)
+    
+    if not stack:
+        return "".join(out), False
+    
+    # Truncated: keep only complete members, then close what is still open
+    out = out[:safe_length]
+    _drop_trailing_comma(out)
+    for closer in reversed(safe_stack):
+        out.append(closer)
+    return "".join(out), True
+
+
+def _drop_trailing_comma(out: List[str]) -> None:
+    i = len(out) - 1
+    while i >= 0 and out[i].isspace():
+        i -= 1
+    if i >= 0 and out[i] == ',':
+        del out[i]
+
+
+def _extract(text: str, expected: type) -> Tuple[Any, bool]:
+    opener = '{' if expected is dict else '['
+    body = strip_code_fences(text)
+    
+    start = body.find(opener)
+    attempts = 0
+    while start != -1 and attempts < _MAX_CANDIDATES:
+        attempts += 1
+        repaired, truncated = repair_json(body[start:])
+        try:
+            value = json.loads(repaired)
+            if isinstance(value, expected):
+                return value, truncated
+        except json.JSONDecodeError:
+            pass
+        # Probably a brace inside prose; try the next one
+        start = body.find(opener, start + 1)
+    
+    raise LLMJSONError(f"No valid JSON {expected.__name__} found in response")
+
+
+def extract_json(text: str, expected: type = dict) -> Any:
+    """Recover the first JSON object (or array, with expected=list) from LLM output"""
+    value, _ = _extract(text, expected)
+    return value
+
+
+def validate_weekly_goal(goal: Any) -> Optional[str]:
+    """Check an LLM week against the WeeklyGoal schema; return an error message or None"""
+    if not isinstance(goal, dict):
+        return "weekly goal is not an object"
+    try:
+        # Resources are attached by LearningPathService, so only the week's own fields are checked
+        WeeklyGoal(**{**goal, 'resources': []})
+    except (ValidationError, TypeError) as e:
+        return str(e)
+    return None
+
+
+@dataclass
+class LearningPathParseResult:
+    """A learning path recovered from LLM output, possibly missing its tail"""
+    data: Dict[str, Any]
+    truncated: bool = False
+    dropped_weeks: int = 0
+    
+    @property
+    def weekly_goals(self) -> List[Dict[str, Any]]:
+        return self.data.get('weekly_goals', [])
+    
+    @property
+    def expected_weeks(self) -> Optional[int]:
+        total = self.data.get('total_weeks')
+        return total if isinstance(total, int) and total > 0 else None
+    
+    @property
+    def missing_week_numbers(self) -> List[int]:
+        """Week numbers the plan announced but that were cut off or invalid"""
+        if not self.expected_weeks or not (self.truncated or self.dropped_weeks):
+            return []
+        present = {goal.get('week_number') for goal in self.weekly_goals}
+        return [n for n in range(1, self.expected_weeks + 1) if n not in present]
+
+
+def parse_learning_path(text: str) -> LearningPathParseResult:
+    """Parse a learning path response, keeping only weeks that pass schema validation"""
+    data, truncated = _extract(text, dict)
+    
+    weeks = data.get('weekly_goals')
+    if not isinstance(weeks, list):
+        weeks = []
+    valid_weeks = [goal for goal in weeks if validate_weekly_goal(goal) is None]
+    data['weekly_goals'] = valid_weeks
+    
+    return LearningPathParseResult(
+        data=data,
+        truncated=truncated,
+        dropped_weeks=len(weeks) - len(valid_weeks)
+    )
+
+
+def merge_weekly_goals(existing: List[Dict[str, Any]], extra: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Combine two lists of weeks, keeping the first copy of each week number, in week order"""
+    merged = {}
+    for goal in existing + extra:
+        merged.setdefault(goal.get('week_number'), goal)
+    return sorted(merged.values(), key=lambda goal: goal.get('week_number') or 0)
+
+
+class WeeklyGoalStreamParser:
+    """Incrementally pull complete weekly goal objects out of a streamed learning path.
+    
+    Feed raw LLM text chunks as they arrive; every call returns the weekly goal
+    objects whose closing brace has been seen since the previous call. Only the
+    top-level "weekly_goals" array is tracked, so nested objects (resources) are
+    returned as part of their week rather than on their own.
+    """
+    
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._goals_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+        self._goals_closed = False
+    
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume a chunk of text and return any weekly goals completed by it"""
+        self.buffer += chunk
+        goals = []
+        
+        while self._pos < len(self.buffer):
+            ch = self.buffer[self._pos]
+            
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = self.buffer[self._string_start + 1:self._pos]
+            
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = self._pos
+            
+            elif ch in '{[':
+                # The goals array is the "weekly_goals" value of the root object
+                if ch == '[' and self._goals_depth is None and not self._goals_closed and self._stack == ['{'] and self._last_string == 'weekly_goals':
+                    self._goals_depth = len(self._stack) + 1
+                self._stack.append(ch)
+                if ch == '{' and self._goals_depth is not None and len(self._stack) == self._goals_depth + 1:
+                    self._item_start = self._pos
+            
+            elif ch in '}]' and self._stack:
+                if ch == '}' and self._item_start is not None and len(self._stack) == self._goals_depth + 1:
+                    goal = self._parse_item(self.buffer[self._item_start:self._pos + 1])
+                    if goal is not None:
+                        goals.append(goal)
+                    self._item_start = None
+                if ch == ']' and self._goals_depth is not None and len(self._stack) == self._goals_depth:
+                    self._goals_depth = None
+                    self._goals_closed = True
+                self._stack.pop()
+            
+            self._pos += 1
+        
+        return goals
+    
+    def _parse_item(self, text: str) -> Optional[Dict[str, Any]]:
+        try:
+            item = json.loads(repair_json(text)[0])
+        except json.JSONDecodeError as e:
+            print(f"Error parsing streamed weekly goal: {e}")
+            return None
+        return item if isinstance(item, dict) else None
@@ -1,9 +1,10 @@
 import os
-import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
-from datetime import datetime
 from notion_client import Client
-from models.learning_path import LearningPath, StudyPlan, ProgressUpdate
+from models.learning_path import LearningPath, StudyPlan, ProgressUpdate, ProgressEvent
+from services.storage import create_store
 
 class NotionService:
     def __init__(self):
@@ -11,16 +12,23 @@ class NotionService:
         self.database_id = os.getenv("NOTION_DATABASE_ID")
         
         if self.api_key:
+            # Not on the shared HTTP client: notion_client rewrites the base URL, timeout and
+            # auth headers of whatever httpx client it is given
             self.client = Client(auth=self.api_key)
         else:
             self.client = None
+        
+        # Local storage used when Notion is not configured or fails (STORAGE_BACKEND)
+        self.store = create_store()
+        # Store calls read, parse and write whole plans; run them off the event loop
+        self._store_executor = ThreadPoolExecutor(max_workers=int(os.getenv("STORAGE_IO_WORKERS", "4")), thread_name_prefix="storage")
     
     async def store_learning_path(self, learning_path: LearningPath) -> bool:
         """Store a learning path in Notion database"""
         
         if not self.client or not self.database_id:
             # Fallback to local storage if Notion is not configured
-            return self._store_locally(learning_path)
+            return await self._store_locally(learning_path)
         
         try:
             # Create a new page in the database
@@ -167,13 +175,13 @@ class NotionService:
             
         except Exception as e:
             print(f"Error storing learning path in Notion: {e}")
-            return self._store_locally(learning_path)
+            return await self._store_locally(learning_path)
     
-    async def get_learning_path(self, topic: str) -> Optional[LearningPath]:
+    async def get_learning_path(self, topic: str, user_id: Optional[str] = None) -> Optional[LearningPath]:
         """Retrieve a learning path from Notion database"""
         
         if not self.client or not self.database_id:
-            return self._get_from_local_storage(topic)
+            return await self._get_from_local_storage(topic, user_id)
         
         try:
             # Query the database for the specific topic
@@ -196,13 +204,13 @@ class NotionService:
             
         except Exception as e:
             print(f"Error retrieving learning path from Notion: {e}")
-            return self._get_from_local_storage(topic)
+            return await self._get_from_local_storage(topic, user_id)
     
-    async def update_progress(self, topic: str, progress_update: ProgressUpdate) -> bool:
+    async def update_progress(self, topic: str, progress_update: ProgressUpdate, user_id: Optional[str] = None) -> bool:
         """Update progress for a learning path"""
         
         if not self.client or not self.database_id:
-            return self._update_local_progress(topic, progress_update)
+            return await self._update_local_progress(topic, progress_update, user_id)
         
         try:
             # Find the page for this topic
@@ -253,54 +261,37 @@ class NotionService:
             
         except Exception as e:
             print(f"Error updating progress in Notion: {e}")
-            return self._update_local_progress(topic, progress_update)
+            return await self._update_local_progress(topic, progress_update, user_id)
     
-    def _store_locally(self, learning_path: LearningPath) -> bool:
-        """Store learning path locally as JSON file"""
-        try:
-            data = learning_path.dict()
-            filename = f"data/learning_paths/{learning_path.topic.lower().replace(' ', '_')}.json"
-            
-            # Ensure directory exists
-            os.makedirs("data/learning_paths", exist_ok=True)
-            
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-            
-            return True
-        except Exception as e:
-            print(f"Error storing locally: {e}")
-            return False
+    async def append_progress_event(self, topic: str, event: ProgressEvent, user_id: Optional[str] = None) -> bool:
+        """Record a progress event without rewriting the stored learning path"""
+        
+        if not self.client or not self.database_id:
+            return await self._run_store(self.store.append_progress_event, topic, event, user_id)
+        
+        # Notion pages only track the latest progress and a comment per update
+        return await self.update_progress(topic, event.progress_update, user_id)
+    
+    async def close(self) -> None:
+        """Flush learning paths still pending in local storage"""
+        await self._run_store(self.store.close)
+        self._store_executor.shutdown(wait=False)
+    
+    async def _run_store(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._store_executor, func, *args)
     
-    def _get_from_local_storage(self, topic: str) -> Optional[LearningPath]:
+    async def _store_locally(self, learning_path: LearningPath) -> bool:
+        """Store learning path in the local storage backend"""
+        return await self._run_store(self.store.save, learning_path)
+    
+    async def _get_from_local_storage(self, topic: str, user_id: Optional[str] = None) -> Optional[LearningPath]:
         """Retrieve learning path from local storage"""
-        try:
-            filename = f"data/learning_paths/{topic.lower().replace(' ', '_')}.json"
-            
-            if os.path.exists(filename):
-                with open(filename, 'r') as f:
-                    data = json.load(f)
-                
-                return LearningPath(**data)
-            
-            return None
-        except Exception as e:
-            print(f"Error retrieving from local storage: {e}")
-            return None
+        return await self._run_store(self.store.load, topic, user_id)
     
-    def _update_local_progress(self, topic: str, progress_update: ProgressUpdate) -> bool:
+    async def _update_local_progress(self, topic: str, progress_update: ProgressUpdate, user_id: Optional[str] = None) -> bool:
         """Update progress in local storage"""
-        try:
-            learning_path = self._get_from_local_storage(topic)
-            if learning_path:
-                learning_path.progress_updates.append(progress_update)
-                learning_path.last_updated = datetime.now()
-                return self._store_locally(learning_path)
-            
-            return False
-        except Exception as e:
-            print(f"Error updating local progress: {e}")
-            return False
+        return await self._run_store(self.store.append_progress, topic, progress_update, user_id)
     
     def _parse_notion_page(self, page: Dict[str, Any]) -> Optional[LearningPath]:
         """Parse Notion page back to LearningPath object"""
@@ -1,17 +1,56 @@
 import os
-import json
 from typing import List, Dict, Any, Optional
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
 from datetime import datetime, timedelta
+from services.http_client import get_http_client
+from services.llm_cache import LLMResponseCache
+from services.llm_json import LLMJSONError, extract_json, parse_learning_path, merge_weekly_goals, validate_weekly_goal
 from models.learning_path import LearningPath, StudyPlan, WeeklyGoal, LearningResource, ExperienceLevel, TimeCommitment, ResourceType
 
 class OpenAIService:
-    def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        
+    def __init__(self, cache: Optional[LLMResponseCache] = None):
+        self.api_key = os.getenv("OPENAI_API_KEY")
+        self._client: Optional[AsyncOpenAI] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+        if cache is None and os.getenv("LLM_CACHE_ENABLED", "true").lower() != "false":
+            cache = LLMResponseCache(namespace="openai")
+        self.cache = cache
+        
+    @property
+    def client(self) -> AsyncOpenAI:
+        """Async SDK client on the shared pooled HTTP client, rebuilt if that client was replaced"""
+        http_client = get_http_client()
+        if self._client is None or self._http_client is not http_client:
+            self._client = AsyncOpenAI(api_key=self.api_key, http_client=http_client)
+            self._http_client = http_client
+        return self._client
+    
+    async def _generate(self, prompt: str, system_prompt: str, max_tokens: int, temperature: float) -> str:
+        """Run a single chat completion and return its text"""
+        response = await self.client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        
+        content = getattr(response.choices[0].message, "content", None)
+        if not content:
+            raise Exception("OpenAI API did not return a valid response. Check your API key, quota, and network connection.")
+        return content
+    
     async def generate_learning_path(self, topic: str, experience_level: str, time_commitment: str, learning_goals: Optional[str] = None) -> Dict[str, Any]:
         """Generate a personalized learning path using GPT-4"""
         
+        if self.cache:
+            cached = self.cache.get_learning_path(topic, experience_level, time_commitment, learning_goals)
+            if cached is not None:
+                return cached
+        
         prompt = f"""
         Create a comprehensive, personalized learning path for the topic: "{topic}"
         
@@ -62,30 +101,75 @@ class OpenAIService:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert learning path creator. Create detailed, practical learning paths with specific resources and deadlines."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=4000
+            content = await self._generate(
+                prompt,
+                system_prompt="You are an expert learning path creator. Create detailed, practical learning paths with specific resources and deadlines.",
+                max_tokens=4000,
+                temperature=0.7
             )
+            # Salvage complete weeks and only re-ask for a missing tail
+            result = parse_learning_path(content)
+            if result.missing_week_numbers:
+                extra_weeks = await self.complete_missing_weeks(topic, experience_level, time_commitment, learning_goals, result.weekly_goals, result.expected_weeks)
+                result.data['weekly_goals'] = merge_weekly_goals(result.weekly_goals, extra_weeks)
             
-            content = getattr(response.choices[0].message, "content", None)
-            if not content:
-                raise Exception("OpenAI API did not return a valid response. Check your API key, quota, and network connection.")
-            # Extract JSON from response
-            json_start = content.find('{')
-            json_end = content.rfind('}') + 1
-            json_str = content[json_start:json_end]
+            learning_path_data = result.data
+            if not learning_path_data['weekly_goals']:
+                raise LLMJSONError("Response did not contain any valid weekly goals")
+            
+            if self.cache:
+                self.cache.set_learning_path(topic, experience_level, time_commitment, learning_goals, learning_path_data)
             
-            learning_path_data = json.loads(json_str)
             return learning_path_data
             
         except Exception as e:
             raise Exception(f"Failed to generate learning path: {str(e)}")
     
+    async def complete_missing_weeks(self, topic: str, experience_level: str, time_commitment: str, learning_goals: Optional[str], existing_weeks: List[Dict[str, Any]], total_weeks: int) -> List[Dict[str, Any]]:
+        """Ask GPT for only the weeks missing from a truncated learning path"""
+        
+        present = {goal.get('week_number') for goal in existing_weeks}
+        missing = [n for n in range(1, total_weeks + 1) if n not in present]
+        if not missing:
+            return []
+        
+        covered = "\n".join(f"- Week {goal.get('week_number')}: {goal.get('title', '')}" for goal in existing_weeks)
+        prompt = f"""
+        You are completing a {total_weeks}-week learning path for the topic: "{topic}"
+        
+        User Profile:
+        - Experience Level: {experience_level}
+        - Time Commitment: {time_commitment}
+        - Learning Goals: {learning_goals or "Not specified"}
+        
+        Weeks already planned:
+        {covered or "None"}
+        
+        Write only weeks {", ".join(str(n) for n in missing)}, continuing the progression above.
+        Structure the response as a JSON object with a single key "weekly_goals" holding an array of objects with:
+        - week_number: integer
+        - title: string
+        - description: string
+        - objectives: array of strings
+        - estimated_hours: float
+        - deadline: string (ISO format)
+        
+        Return only the JSON object, no additional text.
+        """
+        
+        content = await self._generate(
+            prompt,
+            system_prompt="You are an expert learning path creator. Create detailed, practical learning paths with specific resources and deadlines.",
+            max_tokens=2000,
+            temperature=0.7
+        )
+        
+        weeks = extract_json(content, dict).get('weekly_goals', [])
+        return [
+            goal for goal in weeks
+            if validate_weekly_goal(goal) is None and goal.get('week_number') in missing
+        ]
+    
     async def generate_adaptive_recommendations(self, topic: str, current_progress: str, challenges_faced: Optional[str] = None, completed_items: List[str] = None) -> List[str]:
         """Generate adaptive recommendations based on progress and challenges"""
         
@@ -108,25 +192,14 @@ class OpenAIService:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert learning mentor. Provide specific, actionable recommendations based on learner progress."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1000
+            content = await self._generate(
+                prompt,
+                system_prompt="You are an expert learning mentor. Provide specific, actionable recommendations based on learner progress.",
+                max_tokens=1000,
+                temperature=0.7
             )
-            
-            content = getattr(response.choices[0].message, "content", None)
-            if not content:
-                raise Exception("OpenAI API did not return a valid response. Check your API key, quota, and network connection.")
             # Extract JSON array from response
-            json_start = content.find('[')
-            json_end = content.rfind(']') + 1
-            json_str = content[json_start:json_end]
-            
-            recommendations = json.loads(json_str)
+            recommendations = extract_json(content, list)
             return recommendations
             
         except Exception as e:
@@ -157,25 +230,14 @@ class OpenAIService:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert learning analyst. Analyze progress patterns and provide actionable insights."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.5,
-                max_tokens=1500
+            content = await self._generate(
+                prompt,
+                system_prompt="You are an expert learning analyst. Analyze progress patterns and provide actionable insights.",
+                max_tokens=1500,
+                temperature=0.5
             )
-            
-            content = getattr(response.choices[0].message, "content", None)
-            if not content:
-                raise Exception("OpenAI API did not return a valid response. Check your API key, quota, and network connection.")
             # Extract JSON from response
-            json_start = content.find('{')
-            json_end = content.rfind('}') + 1
-            json_str = content[json_start:json_end]
-            
-            analysis = json.loads(json_str)
+            analysis = extract_json(content, dict)
             return analysis
             
         except Exception as e:
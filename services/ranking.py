@@ -0,0 +1,154 @@
+import re
+import math
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional
+
+_ISO_DURATION_RE = re.compile(
+    r"^P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$"
+)
+
+# Share of each score column in the final ranking; they sum to 1
+RANKING_WEIGHTS = {
+    'views': 0.25,
+    'likes': 0.2,
+    'recency': 0.15,
+    'duration_fit': 0.2,
+    'difficulty': 0.2
+}
+
+# Words in a title, description or tags that suggest who a video is for
+DIFFICULTY_HINTS = {
+    'beginner': ['beginner', 'beginners', 'basics', 'introduction', 'intro', 'fundamentals', 'crash course', 'for dummies', '101', 'getting started', 'first steps'],
+    'intermediate': ['intermediate', 'project', 'practical', 'build', 'hands-on', 'best practices', 'patterns'],
+    'advanced': ['advanced', 'expert', 'deep dive', 'internals', 'under the hood', 'optimization', 'performance', 'architecture', 'masterclass']
+}
+
+# Videos are one part of a week's work, so each should fill only a slice of its hours
+VIDEO_SHARE_OF_WEEK = 0.3
+MIN_TARGET_SECONDS = 5 * 60
+MAX_TARGET_SECONDS = 90 * 60
+
+
+def parse_duration(value: Any) -> Optional[int]:
+    """Convert an ISO-8601 duration ("PT1H2M3S") or clock time ("1:02:03") to seconds"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    if not isinstance(value, str):
+        return None
+    
+    value = value.strip()
+    match = _ISO_DURATION_RE.match(value)
+    if match and any(match.groupdict().values()):
+        parts = {name: int(number or 0) for name, number in match.groupdict().items()}
+        return parts['days'] * 86400 + parts['hours'] * 3600 + parts['minutes'] * 60 + parts['seconds']
+    
+    if re.fullmatch(r"\d+(:\d{1,2}){1,2}", value):
+        seconds = 0
+        for part in value.split(':'):
+            seconds = seconds * 60 + int(part)
+        return seconds
+    
+    return None
+
+
+def format_duration(seconds: Optional[int]) -> str:
+    """Human readable length, e.g. "1 hour 5 minutes" or "45 minutes" """
+    if seconds is None:
+        return "Unknown"
+    hours, remainder = divmod(int(seconds), 3600)
+    minutes = max(1, round(remainder / 60)) if hours == 0 else round(remainder / 60)
+    if minutes == 60:
+        hours, minutes = hours + 1, 0
+    
+    parts = []
+    if hours:
+        parts.append(f"{hours} hour{'s' if hours != 1 else ''}")
+    if minutes:
+        parts.append(f"{minutes} minute{'s' if minutes != 1 else ''}")
+    return " ".join(parts)
+
+
+def target_video_seconds(estimated_hours: Optional[float], videos_per_week: int = 3) -> Optional[int]:
+    """Ideal length of one video for a week with the given workload"""
+    if not estimated_hours or estimated_hours <= 0:
+        return None
+    target = estimated_hours * 3600 * VIDEO_SHARE_OF_WEEK / max(1, videos_per_week)
+    return int(min(MAX_TARGET_SECONDS, max(MIN_TARGET_SECONDS, target)))
+
+
+def rank_videos(videos: List[Dict[str, Any]], difficulty: Optional[str] = None, target_seconds: Optional[int] = None, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Return the videos best first, scored on engagement, recency, length fit and difficulty.
+    
+    Each signal is computed as one column over the whole candidate set and
+    min-max normalised, so a signal only separates candidates from each other
+    and one huge view count cannot drown out the rest.
+    """
+    if len(videos) < 2:
+        return list(videos)
+    now = now or datetime.now(timezone.utc)
+    
+    views = [int(video.get('view_count') or 0) for video in videos]
+    likes = [int(video.get('like_count') or 0) for video in videos]
+    durations = [video.get('duration_seconds', parse_duration(video.get('duration'))) for video in videos]
+    
+    columns = {
+        'views': [math.log10(1 + count) for count in views],
+        # Likes per view, so a small well-liked video can beat a big ignored one
+        'likes': [like / count if count else 0.0 for like, count in zip(likes, views)],
+        'recency': [_recency(video.get('published_at'), now) for video in videos],
+        'duration_fit': [_duration_fit(seconds, target_seconds) for seconds in durations],
+        'difficulty': [_difficulty_match(video, difficulty) for video in videos]
+    }
+    
+    scores = [0.0] * len(videos)
+    for name, column in columns.items():
+        weight = RANKING_WEIGHTS[name]
+        for i, value in enumerate(_normalise(column)):
+            scores[i] += weight * value
+    
+    order = sorted(range(len(videos)), key=lambda i: scores[i], reverse=True)
+    return [videos[i] for i in order]
+
+
+def _normalise(column: List[float]) -> List[float]:
+    low, high = min(column), max(column)
+    if high == low:
+        return [0.0] * len(column)
+    span = high - low
+    return [(value - low) / span for value in column]
+
+
+def _recency(published_at: Any, now: datetime) -> float:
+    if not isinstance(published_at, str):
+        return 0.0
+    try:
+        published = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+    except ValueError:
+        return 0.0
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    age_years = max(0.0, (now - published).days / 365.0)
+    return 1.0 / (1.0 + age_years)
+
+
+def _duration_fit(seconds: Optional[int], target_seconds: Optional[int]) -> float:
+    if not target_seconds or not seconds:
+        return 0.5
+    # Twice or half the target scores the same
+    return 1.0 / (1.0 + abs(math.log2(seconds / target_seconds)))
+
+
+def _difficulty_match(video: Dict[str, Any], difficulty: Optional[str]) -> float:
+    if not difficulty or difficulty not in DIFFICULTY_HINTS:
+        return 0.0
+    text = " ".join([
+        video.get('title', ''),
+        video.get('description', ''),
+        " ".join(video.get('tags') or [])
+    ]).lower()
+    
+    score = 0.0
+    for level, hints in DIFFICULTY_HINTS.items():
+        matched = sum(1 for hint in hints if hint in text)
+        score += matched if level == difficulty else -0.5 * matched
+    return score
@@ -0,0 +1,168 @@
+import os
+import math
+import time
+import heapq
+import asyncio
+import itertools
+from typing import Dict, Any, Optional, List, Tuple, Mapping
+
+# Same priority names as services.youtube_quota
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+PRIORITY_RANK = {INTERACTIVE: 0, BACKGROUND: 1}
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a request would have to wait longer than allowed for the rate limit window"""
+
+
+class _Window:
+    """What the server last told us about one rate limit bucket"""
+    
+    def __init__(self):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        # None once the reported reset has been applied, until the server reports the next one
+        self.reset_at: Optional[float] = None
+        self.queue: List[Tuple[int, int, asyncio.Future]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+    
+    def roll_over(self, now: float) -> None:
+        if self.remaining is not None and self.limit is not None and self.reset_at is not None and now >= self.reset_at:
+            # Refill once; later acquires count down from here until a response reports the new window
+            self.remaining = self.limit
+            self.reset_at = None
+
+
+class RateLimitScheduler:
+    """Admits requests against server-reported rate limit windows (X-RateLimit-* headers).
+    
+    While a bucket has requests left they go straight through. Once it runs low,
+    requests queue until the window resets and are released interactive first,
+    then in arrival order. Background requests also leave a reserve of each window
+    (reserve_fraction of its limit) for interactive ones.
+    """
+    
+    def __init__(self, reserve_fraction: Optional[float] = None, max_wait_seconds: Optional[float] = None):
+        self.reserve_fraction = reserve_fraction if reserve_fraction is not None else float(os.getenv("GITHUB_RATE_LIMIT_RESERVE", "0.2"))
+        self.max_wait_seconds = max_wait_seconds if max_wait_seconds is not None else float(os.getenv("GITHUB_MAX_QUEUE_WAIT_SECONDS", "30"))
+        
+        self._windows: Dict[str, _Window] = {}
+        self._seq = itertools.count()
+        
+        self.queued = 0
+        self.max_queue_depth = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_observed = 0.0
+    
+    async def acquire(self, bucket: str, priority: str = INTERACTIVE, max_wait: Optional[float] = None) -> float:
+        """Wait for a slot in bucket; returns seconds waited or raises RateLimitTimeout"""
+        window = self._windows.setdefault(bucket, _Window())
+        rank = PRIORITY_RANK.get(priority, PRIORITY_RANK[BACKGROUND])
+        window.roll_over(time.time())
+        
+        if not window.queue and self._has_capacity(window, rank):
+            self._take(window)
+            return 0.0
+        
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(window.queue, (rank, next(self._seq), future))
+        self.queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth())
+        self._dispatch(window)
+        
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(future, self.max_wait_seconds if max_wait is None else max_wait)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise RateLimitTimeout(f"GitHub {bucket} rate limit: no slot within the wait limit")
+        finally:
+            # Timed-out or cancelled entries are skipped lazily by _dispatch
+            self._dispatch(window)
+        
+        waited = time.monotonic() - started
+        self.total_wait_seconds += waited
+        self.max_wait_observed = max(self.max_wait_observed, waited)
+        return waited
+    
+    def update(self, bucket: str, headers: Mapping[str, str]) -> None:
+        """Record the window state from a response's X-RateLimit-* headers"""
+        try:
+            limit = int(headers["X-RateLimit-Limit"])
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset_at = float(headers["X-RateLimit-Reset"])
+        except (KeyError, ValueError):
+            return
+        
+        window = self._windows.setdefault(headers.get("X-RateLimit-Resource", bucket), _Window())
+        window.limit = limit
+        window.remaining = remaining
+        window.reset_at = reset_at
+        self._dispatch(window)
+    
+    def queue_depth(self) -> int:
+        """Requests currently waiting for a slot"""
+        return sum(
+            1 for window in self._windows.values()
+            for _, _, future in window.queue if not future.done()
+        )
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, wait times and the last known state of each window"""
+        admitted_after_wait = self.queued - self.timeouts
+        now = time.time()
+        return {
+            "queue_depth": self.queue_depth(),
+            "max_queue_depth": self.max_queue_depth,
+            "queued": self.queued,
+            "timeouts": self.timeouts,
+            "avg_wait_seconds": round(self.total_wait_seconds / admitted_after_wait, 3) if admitted_after_wait > 0 else 0.0,
+            "max_wait_seconds": round(self.max_wait_observed, 3),
+            "windows": {
+                name: {
+                    "limit": window.limit,
+                    "remaining": window.remaining,
+                    "resets_in_seconds": max(0, round(window.reset_at - now)) if window.reset_at is not None else None
+                }
+                for name, window in self._windows.items()
+            }
+        }
+    
+    def _has_capacity(self, window: _Window, rank: int) -> bool:
+        if window.remaining is None:
+            # Nothing heard from the server yet
+            return True
+        reserve = 0
+        if rank > PRIORITY_RANK[INTERACTIVE] and window.limit:
+            reserve = math.ceil(window.limit * self.reserve_fraction)
+        return window.remaining > reserve
+    
+    def _take(self, window: _Window) -> None:
+        if window.remaining is not None:
+            window.remaining -= 1
+    
+    def _dispatch(self, window: _Window) -> None:
+        """Release queued requests in priority order while the window allows"""
+        window.roll_over(time.time())
+        while window.queue:
+            rank, _, future = window.queue[0]
+            if future.done():
+                heapq.heappop(window.queue)
+                continue
+            if not self._has_capacity(window, rank):
+                break
+            heapq.heappop(window.queue)
+            self._take(window)
+            future.set_result(None)
+        
+        # With no reset pending, the next response's headers (update) release the queue
+        if window.queue and window.timer is None and window.reset_at is not None:
+            # Re-check once the window resets; a second of slack for clock skew
+            delay = max(0.0, window.reset_at - time.time()) + 1.0
+            window.timer = asyncio.get_running_loop().call_later(delay, self._on_reset, window)
+    
+    def _on_reset(self, window: _Window) -> None:
+        window.timer = None
+        self._dispatch(window)
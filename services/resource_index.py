@@ -0,0 +1,215 @@
+import os
+import re
+import math
+import json
+import time
+import sqlite3
+import threading
+from typing import List, Dict, Any, Optional, Iterable
+from models.learning_path import LearningPath, LearningResource, ResourceType
+from services.resource_normalizer import normalize_resource
+from services.storage import LearningPathStore
+
+# Words that appear in almost every week title and say nothing about the subject
+STOPWORDS = {
+    'a', 'an', 'and', 'the', 'of', 'to', 'in', 'for', 'with', 'on', 'by', 'your', 'how',
+    'week', 'introduction', 'intro', 'basics', 'fundamentals', 'learning', 'tutorial'
+}
+
+# bm25() column weights for (title, description, tags); a title hit counts most
+BM25_WEIGHTS = (10.0, 1.0, 5.0)
+
+
+class ResourceIndex:
+    """Local full-text catalog of every learning resource the service has handed out.
+    
+    Backed by a SQLite FTS5 table ranked with bm25, so week enrichment can be served
+    from resources already fetched for earlier plans instead of calling YouTube or
+    GitHub again. Entries older than max_age_seconds are ignored by search so stale
+    results are refreshed from the live APIs. URLs in excluded_urls (the mock
+    fallbacks) are never indexed or returned.
+    """
+    
+    def __init__(self, db_path: Optional[str] = None, max_age_seconds: Optional[int] = None, min_term_match: Optional[float] = None, excluded_urls: Optional[Iterable[str]] = None):
+        self.db_path = db_path or os.getenv("RESOURCE_INDEX_PATH", os.path.join(os.getenv("CACHE_DIR", "data/cache"), "resource_index.db"))
+        self.max_age_seconds = max_age_seconds or int(os.getenv("RESOURCE_INDEX_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+        # Share of query terms a resource must contain to count as a match
+        self.min_term_match = min_term_match or float(os.getenv("RESOURCE_INDEX_MIN_TERM_MATCH", "0.6"))
+        self.excluded_urls = set(excluded_urls or ())
+        
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        
+        try:
+            if self.db_path != ":memory:":
+                os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._create_schema()
+        except sqlite3.Error as e:
+            # Most likely a SQLite build without FTS5; enrichment just uses the live APIs
+            print(f"Warning: Resource index disabled: {e}")
+            self._conn = None
+    
+    @property
+    def enabled(self) -> bool:
+        return self._conn is not None
+    
+    def _create_schema(self) -> None:
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS resources (
+                    url TEXT PRIMARY KEY,
+                    resource_type TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    indexed_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS resources_fts USING fts5(
+                    title, description, tags, url UNINDEXED, tokenize = 'porter unicode61'
+                )
+            """)
+    
+    def add_resources(self, resources: Iterable[LearningResource], indexed_at: Optional[float] = None) -> int:
+        """Insert or refresh resources, keyed by URL; returns how many were written.
+        
+        indexed_at is when the resources were fetched. Without it, new URLs are
+        dated now and URLs already indexed keep their date, so storing a plan
+        that was served from the index does not make its resources look fresh.
+        """
+        if not self.enabled:
+            return 0
+        
+        if indexed_at is None:
+            sql = """
+                INSERT INTO resources (url, resource_type, data, indexed_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET resource_type = excluded.resource_type, data = excluded.data
+            """
+            indexed_at = time.time()
+        else:
+            sql = "INSERT OR REPLACE INTO resources (url, resource_type, data, indexed_at) VALUES (?, ?, ?, ?)"
+        count = 0
+        with self._lock, self._conn:
+            for resource in resources:
+                if not resource.url or resource.url in self.excluded_urls:
+                    continue
+                self._conn.execute("DELETE FROM resources_fts WHERE url = ?", (resource.url,))
+                self._conn.execute(sql, (resource.url, resource.resource_type.value, resource.model_dump_json(), indexed_at))
+                self._conn.execute(
+                    "INSERT INTO resources_fts (title, description, tags, url) VALUES (?, ?, ?, ?)",
+                    (resource.title, resource.description, " ".join(resource.tags), resource.url)
+                )
+                count += 1
+        return count
+    
+    def index_learning_path(self, learning_path: LearningPath) -> int:
+        """Add every resource attached to a learning path's weeks, keeping the dates of ones already indexed"""
+        return self.add_resources(
+            resource
+            for goal in learning_path.study_plan.weekly_goals
+            for resource in goal.resources
+        )
+    
+    def backfill_from_store(self, store: LearningPathStore) -> int:
+        """Index resources from learning paths stored before the index existed.
+        
+        Reads every plan in the configured storage backend. Resources are dated by
+        their plan's last_updated, so old plans fall outside max_age_seconds instead
+        of looking freshly fetched.
+        """
+        plans = []
+        for summary in store.list_paths():
+            try:
+                learning_path = store.load(summary['topic'], summary['user_id'])
+                if learning_path is None:
+                    continue
+                resources = [
+                    normalize_resource(resource)
+                    for goal in learning_path.study_plan.weekly_goals
+                    for resource in goal.resources
+                ]
+                plans.append((learning_path.last_updated.timestamp(), resources))
+            except Exception as e:
+                print(f"Warning: Could not index {summary.get('topic')}: {e}")
+        
+        # Oldest first, so a resource shared by several plans keeps its newest date
+        plans.sort(key=lambda plan: plan[0])
+        return sum(self.add_resources(resources, indexed_at) for indexed_at, resources in plans)
+    
+    def search(self, query: str, resource_type: Optional[ResourceType] = None, limit: int = 5) -> List[LearningResource]:
+        """Return the best fresh matches for a query, best first"""
+        if not self.enabled:
+            return []
+        
+        terms = self._terms(query)
+        if not terms:
+            return []
+        
+        match = " OR ".join(f'"{term}"' for term in terms)
+        sql = """
+            SELECT r.url, r.data, f.title, f.description, f.tags
+            FROM resources_fts f JOIN resources r ON r.url = f.url
+            WHERE resources_fts MATCH ? AND r.indexed_at >= ?
+        """
+        params: List[Any] = [match, time.time() - self.max_age_seconds]
+        if resource_type is not None:
+            sql += " AND r.resource_type = ?"
+            params.append(resource_type.value)
+        sql += f" ORDER BY bm25(resources_fts, {', '.join(str(w) for w in BM25_WEIGHTS)}) LIMIT ?"
+        # Over-fetch, since OR matching lets in rows that share only one term
+        params.append(limit * 4)
+        
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error searching resource index: {e}")
+            return []
+        
+        needed = max(1, math.ceil(len(terms) * self.min_term_match))
+        results = []
+        for url, data, title, description, tags in rows:
+            if url in self.excluded_urls:
+                # Indexed before it was excluded
+                continue
+            found = set(self._terms(f"{title} {description} {tags}"))
+            if sum(1 for term in terms if term in found) >= needed:
+                results.append(LearningResource(**json.loads(data)))
+            if len(results) == limit:
+                break
+        return results
+    
+    def lookup(self, query: str, resource_type: ResourceType, limit: int) -> Optional[List[LearningResource]]:
+        """Return exactly limit indexed resources for a query, or None on a miss"""
+        results = self.search(query, resource_type, limit)
+        if len(results) < limit:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return results
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return catalog size and hit/miss counters"""
+        entries = 0
+        if self.enabled:
+            with self._lock:
+                entries = self._conn.execute("SELECT COUNT(*) FROM resources").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+    
+    def _terms(self, text: str) -> List[str]:
+        words = re.findall(r"[a-z0-9][a-z0-9+#.]*", text.lower())
+        seen = []
+        for word in words:
+            word = word.rstrip('.')
+            if word and word not in STOPWORDS and word not in seen:
+                seen.append(word)
+        return seen
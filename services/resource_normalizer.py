@@ -0,0 +1,63 @@
+import os
+import re
+import sys
+import html
+from typing import List, Iterable, Optional
+from models.learning_path import LearningPath, LearningResource
+
+# Upstream descriptions and tag lists can run to hundreds of kilobytes; a resource
+# card needs a short summary and a handful of tags
+TITLE_MAX_CHARS = int(os.getenv("RESOURCE_TITLE_MAX_CHARS", "160"))
+DESCRIPTION_MAX_CHARS = int(os.getenv("RESOURCE_DESCRIPTION_MAX_CHARS", "300"))
+MAX_TAGS = int(os.getenv("RESOURCE_MAX_TAGS", "8"))
+TAG_MAX_CHARS = 40
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def clean_text(text: Optional[str], limit: int) -> str:
+    """Unescape HTML entities, collapse whitespace and cut to limit characters at a word boundary"""
+    text = _WHITESPACE_RE.sub(" ", html.unescape(text or "")).strip()
+    if len(text) <= limit:
+        return text
+    cut = text[:limit - 1]
+    if " " in cut[limit // 2:]:
+        cut = cut[:cut.rindex(" ")]
+    return cut.rstrip(" .,;:-") + "…"
+
+
+def normalize_tags(tags: Optional[Iterable[str]], limit: int = MAX_TAGS) -> List[str]:
+    """Lowercase, dedupe and cap tags, keeping upstream order; tag strings are interned"""
+    normalized = []
+    seen = set()
+    for tag in tags or []:
+        tag = _WHITESPACE_RE.sub(" ", str(tag)).strip().lower()
+        if not tag or len(tag) > TAG_MAX_CHARS or tag in seen:
+            continue
+        seen.add(tag)
+        normalized.append(sys.intern(tag))
+        if len(normalized) == limit:
+            break
+    return normalized
+
+
+def normalize_resource(resource: LearningResource) -> LearningResource:
+    """Return the resource with bounded title, description and tags"""
+    title = clean_text(resource.title, TITLE_MAX_CHARS)
+    description = clean_text(resource.description, DESCRIPTION_MAX_CHARS)
+    tags = normalize_tags(resource.tags)
+    if title == resource.title and description == resource.description and tags == resource.tags:
+        return resource
+    return resource.model_copy(update={
+        "title": title,
+        "description": description,
+        "tags": tags,
+        "duration": sys.intern(resource.duration) if resource.duration else resource.duration
+    })
+
+
+def normalize_learning_path(learning_path: LearningPath) -> LearningPath:
+    """Bound every resource of a learning path in place"""
+    for goal in learning_path.study_plan.weekly_goals:
+        goal.resources = [normalize_resource(resource) for resource in goal.resources]
+    return learning_path
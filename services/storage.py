@@ -0,0 +1,732 @@
+import os
+import json
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional, Tuple
+from models.learning_path import LearningPath, ProgressUpdate, ProgressEvent
+from services.storage_codec import encode_learning_path, read_learning_path_file, default_format, parse_format
+
+# Plans saved before user accounts existed have no owner
+DEFAULT_USER_ID = "anonymous"
+
+
+def topic_key(topic: str) -> str:
+    """Normalized topic used for file names and lookups"""
+    return topic.lower().replace(' ', '_')
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Replace path with data via a synced temp file, so a crash leaves the old or new file, never half of one"""
+    # A unique temp file per write, so concurrent writers of the same path never share one
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=f"{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class LearningPathStore(ABC):
+    """Where learning paths live when Notion is not configured"""
+    
+    @abstractmethod
+    def save(self, learning_path: LearningPath) -> bool:
+        """Insert or replace a learning path"""
+    
+    @abstractmethod
+    def load(self, topic: str, user_id: Optional[str] = None) -> Optional[LearningPath]:
+        """Return the learning path for a topic: the user's own, else an unowned one"""
+    
+    @abstractmethod
+    def list_paths(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Summaries (topic, user_id, last_updated) of stored learning paths"""
+    
+    def append_progress(self, topic: str, progress_update: ProgressUpdate, user_id: Optional[str] = None) -> bool:
+        """Record a progress update against a stored learning path"""
+        return self.append_progress_event(topic, ProgressEvent(progress_update=progress_update), user_id)
+    
+    def append_progress_event(self, topic: str, event: ProgressEvent, user_id: Optional[str] = None) -> bool:
+        """Record a progress event; backends override this to avoid rewriting the whole plan"""
+        learning_path = self.load(topic, user_id)
+        if learning_path is None:
+            return False
+        learning_path.apply_progress_event(event)
+        return self.save(learning_path)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return backend details for /metrics"""
+        return {"backend": type(self).__name__}
+    
+    def close(self) -> None:
+        """Write out anything still pending; called on shutdown"""
+
+
+class ParsedPathCache:
+    """LRU of validated LearningPath objects, each tagged with the file signature it was parsed from.
+    
+    An entry is only served while its signature (mtime and size of the files it
+    came from) still matches, so edits made outside the store are picked up.
+    Entries are weighed by those file sizes and evicted least recently used
+    first once the total passes max_bytes. Callers get deep copies, since they
+    modify what they load; cached objects are never modified, so copies can be
+    taken without holding the lock.
+    """
+    
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("LEARNING_PATH_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+        self._entries: "OrderedDict[str, Tuple[Tuple, int, LearningPath]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+    
+    def get(self, key: str, signature: Tuple) -> Optional[LearningPath]:
+        """Return a copy of the cached path for key if it was parsed from signature"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != signature:
+                if entry is not None and self._discard(key):
+                    self.invalidations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry[2].model_copy(deep=True)
+    
+    def put(self, key: str, signature: Tuple, learning_path: LearningPath, size: int) -> None:
+        """Cache learning_path (not a copy, so the caller must not modify it) as parsed from signature"""
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (signature, size, learning_path)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+    
+    def apply_event(self, key: str, old_signature: Tuple, new_signature: Tuple, event: ProgressEvent, size: int) -> None:
+        """Bring a cached path up to date with an event just appended, or drop it if it was already stale"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return
+        if entry[0] != old_signature:
+            self.invalidate(key)
+            return
+        learning_path = entry[2].model_copy(deep=True)
+        learning_path.apply_progress_event(event)
+        self.put(key, new_signature, learning_path, size)
+    
+    def invalidate(self, key: str) -> None:
+        """Drop the entry for key, e.g. after the store rewrote its file"""
+        with self._lock:
+            if self._discard(key):
+                self.invalidations += 1
+    
+    def _discard(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[1]
+        return True
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the cache's size"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes
+        }
+
+
+class JSONFileStore(LearningPathStore):
+    """One file per topic in a directory (the original local storage).
+    
+    Plans are written in storage_format (STORAGE_FORMAT, compact JSON by
+    default; see services.storage_codec). Plain JSON files, compact or in the
+    original indented layout, have no header; compressed and binary ones name
+    their format in one, so every file reads back whatever the current setting.
+    The .json name is kept for every format.
+    
+    Progress is appended to a per-topic log ({topic}.progress.jsonl, one compact
+    ProgressEvent per line) instead of rewriting the plan; reads replay the log
+    over the snapshot, and after compact_every events the two are folded into a
+    new snapshot. Files are keyed by topic only, so users share one plan per
+    topic here; use SQLiteStore for per-user plans. Parsed plans are kept in a
+    ParsedPathCache so repeated reads skip JSON parsing and validation.
+    """
+    
+    def __init__(self, directory: Optional[str] = None, compact_every: Optional[int] = None, cache: Optional[ParsedPathCache] = None, storage_format: Optional[str] = None):
+        self.directory = directory or os.getenv("LEARNING_PATHS_DIR", "data/learning_paths")
+        self.storage_format = storage_format or default_format()
+        parse_format(self.storage_format)
+        self.compact_every = compact_every or int(os.getenv("PROGRESS_LOG_COMPACT_EVERY", "20"))
+        self.cache = cache or ParsedPathCache()
+        # Events in each topic's log, counted once per process and then tracked on append
+        self._log_lengths: Dict[str, int] = {}
+    
+    def _path(self, topic: str) -> str:
+        return os.path.join(self.directory, f"{topic_key(topic)}.json")
+    
+    def _log_path(self, topic: str) -> str:
+        return os.path.join(self.directory, f"{topic_key(topic)}.progress.jsonl")
+    
+    def _signature(self, topic: str) -> Optional[Tuple]:
+        """(mtime, size) of the snapshot and the progress log, or None if there is no snapshot"""
+        try:
+            snapshot = os.stat(self._path(topic))
+        except FileNotFoundError:
+            return None
+        try:
+            log = os.stat(self._log_path(topic))
+            log_signature = (log.st_mtime_ns, log.st_size)
+        except FileNotFoundError:
+            log_signature = None
+        return (snapshot.st_mtime_ns, snapshot.st_size), log_signature
+    
+    def _signature_size(self, signature: Tuple) -> int:
+        return sum(part[1] for part in signature if part is not None)
+    
+    def save(self, learning_path: LearningPath) -> bool:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            write_atomic(self._path(learning_path.topic), encode_learning_path(learning_path, self.storage_format))
+            # The snapshot now includes every logged event
+            self._clear_log(learning_path.topic)
+            self.cache.invalidate(topic_key(learning_path.topic))
+            return True
+        except Exception as e:
+            print(f"Error storing locally: {e}")
+            return False
+    
+    def load(self, topic: str, user_id: Optional[str] = None) -> Optional[LearningPath]:
+        try:
+            # Taken before reading, so a concurrent write leaves the entry stale rather than wrong
+            signature = self._signature(topic)
+            if signature is None:
+                return None
+            cached = self.cache.get(topic_key(topic), signature)
+            if cached is not None:
+                return cached
+            
+            data = read_learning_path_file(self._path(topic))
+            data.setdefault('user_id', DEFAULT_USER_ID)
+            learning_path = LearningPath(**data)
+            for event in self._read_log(topic):
+                learning_path.apply_progress_event(event)
+            self.cache.put(topic_key(topic), signature, learning_path.model_copy(deep=True), self._signature_size(signature))
+            return learning_path
+        except Exception as e:
+            print(f"Error retrieving from local storage: {e}")
+            return None
+    
+    def append_progress_event(self, topic: str, event: ProgressEvent, user_id: Optional[str] = None) -> bool:
+        old_signature = self._signature(topic)
+        if old_signature is None:
+            return False
+        try:
+            with open(self._log_path(topic), 'ab+') as f:
+                line = event.model_dump_json(exclude_defaults=True).encode() + b"\n"
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        # Start a fresh line after a torn write
+                        line = b"\n" + line
+                f.write(line)
+        except Exception as e:
+            print(f"Error appending progress locally: {e}")
+            self.cache.invalidate(topic_key(topic))
+            return False
+        
+        key = topic_key(topic)
+        new_signature = self._signature(topic)
+        self.cache.apply_event(key, old_signature, new_signature, event, self._signature_size(new_signature))
+        if key not in self._log_lengths:
+            self._log_lengths[key] = len(self._read_log(topic))
+        else:
+            self._log_lengths[key] += 1
+        if self._log_lengths[key] >= self.compact_every:
+            self.compact(topic)
+        return True
+    
+    def compact(self, topic: str) -> bool:
+        """Fold the progress log into a new snapshot"""
+        learning_path = self.load(topic)
+        return learning_path is not None and self.save(learning_path)
+    
+    def _read_log(self, topic: str) -> List[ProgressEvent]:
+        events = []
+        path = self._log_path(topic)
+        if not os.path.exists(path):
+            return events
+        with open(path, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    events.append(ProgressEvent.model_validate_json(line))
+                except ValueError as e:
+                    # A torn final line from a crash mid-append
+                    print(f"Warning: Skipping unreadable progress event for {topic}: {e}")
+        return events
+    
+    def _clear_log(self, topic: str) -> None:
+        try:
+            os.remove(self._log_path(topic))
+        except FileNotFoundError:
+            pass
+        self._log_lengths[topic_key(topic)] = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": type(self).__name__, "format": self.storage_format, "parsed_cache": self.cache.stats()}
+    
+    def list_paths(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        if not os.path.isdir(self.directory):
+            return []
+        summaries = []
+        for filename in sorted(os.listdir(self.directory)):
+            if not filename.endswith('.json'):
+                continue
+            learning_path = self.load(filename[:-len('.json')])
+            if learning_path is None or (user_id is not None and learning_path.user_id != user_id):
+                continue
+            summaries.append({
+                "topic": learning_path.topic,
+                "user_id": learning_path.user_id,
+                "last_updated": learning_path.last_updated.isoformat()
+            })
+        return summaries
+
+
+class SQLiteStore(LearningPathStore):
+    """Learning paths in SQLite (WAL mode), one plan per (user_id, topic).
+    
+    Weekly goals, resources and progress updates are rows of their own tables,
+    so a progress update is a single insert instead of rewriting the whole plan,
+    and concurrent writers are serialized by SQLite rather than overwriting each
+    other's files.
+    """
+    
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or os.getenv("STORAGE_DB_PATH", "data/learning_paths.db")
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._create_schema()
+    
+    def _create_schema(self) -> None:
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS learning_paths (
+                    id INTEGER PRIMARY KEY,
+                    path_id TEXT,
+                    user_id TEXT NOT NULL,
+                    topic TEXT NOT NULL,
+                    topic_key TEXT NOT NULL,
+                    experience_level TEXT NOT NULL,
+                    time_commitment TEXT NOT NULL,
+                    learning_goals TEXT,
+                    total_weeks INTEGER NOT NULL,
+                    overall_progress REAL NOT NULL DEFAULT 0,
+                    adaptive_recommendations TEXT NOT NULL DEFAULT '[]',
+                    plan_created_at TEXT NOT NULL,
+                    plan_last_updated TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    last_updated TEXT NOT NULL,
+                    UNIQUE (user_id, topic_key)
+                );
+                CREATE INDEX IF NOT EXISTS idx_learning_paths_topic ON learning_paths (topic_key, last_updated);
+                CREATE TABLE IF NOT EXISTS weekly_goals (
+                    path_id INTEGER NOT NULL REFERENCES learning_paths (id) ON DELETE CASCADE,
+                    week_number INTEGER NOT NULL,
+                    title TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    objectives TEXT NOT NULL,
+                    estimated_hours REAL NOT NULL,
+                    deadline TEXT NOT NULL,
+                    completed INTEGER NOT NULL DEFAULT 0,
+                    progress_percentage REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (path_id, week_number)
+                );
+                CREATE TABLE IF NOT EXISTS resources (
+                    path_id INTEGER NOT NULL REFERENCES learning_paths (id) ON DELETE CASCADE,
+                    week_number INTEGER NOT NULL,
+                    position INTEGER NOT NULL,
+                    title TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    resource_type TEXT NOT NULL,
+                    duration TEXT,
+                    difficulty TEXT,
+                    tags TEXT NOT NULL DEFAULT '[]',
+                    estimated_completion_time TEXT,
+                    PRIMARY KEY (path_id, week_number, position)
+                );
+                CREATE TABLE IF NOT EXISTS progress_updates (
+                    id INTEGER PRIMARY KEY,
+                    path_id INTEGER NOT NULL REFERENCES learning_paths (id) ON DELETE CASCADE,
+                    topic TEXT NOT NULL,
+                    completed_items TEXT NOT NULL,
+                    current_progress TEXT NOT NULL,
+                    challenges_faced TEXT,
+                    timestamp TEXT NOT NULL,
+                    mood_rating INTEGER,
+                    time_spent REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_progress_updates_path ON progress_updates (path_id, id);
+            """)
+    
+    def save(self, learning_path: LearningPath) -> bool:
+        try:
+            with self._lock, self._conn:
+                row_id = self._upsert_path(learning_path)
+                self._conn.execute("DELETE FROM weekly_goals WHERE path_id = ?", (row_id,))
+                self._conn.execute("DELETE FROM resources WHERE path_id = ?", (row_id,))
+                self._conn.execute("DELETE FROM progress_updates WHERE path_id = ?", (row_id,))
+                
+                for goal in learning_path.study_plan.weekly_goals:
+                    self._conn.execute(
+                        "INSERT INTO weekly_goals VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (row_id, goal.week_number, goal.title, goal.description, json.dumps(goal.objectives),
+                         goal.estimated_hours, goal.deadline.isoformat(), int(goal.completed), goal.progress_percentage)
+                    )
+                    self._conn.executemany(
+                        "INSERT INTO resources VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (row_id, goal.week_number, position, resource.title, resource.description, resource.url,
+                             resource.resource_type.value, resource.duration, resource.difficulty,
+                             json.dumps(resource.tags), resource.estimated_completion_time)
+                            for position, resource in enumerate(goal.resources)
+                        ]
+                    )
+                
+                for progress_update in learning_path.progress_updates:
+                    self._insert_progress(row_id, progress_update)
+            return True
+        except Exception as e:
+            print(f"Error storing learning path in SQLite: {e}")
+            return False
+    
+    def load(self, topic: str, user_id: Optional[str] = None) -> Optional[LearningPath]:
+        try:
+            with self._lock:
+                row = self._find_path(topic, user_id)
+                if row is None:
+                    return None
+                goals = self._conn.execute(
+                    "SELECT * FROM weekly_goals WHERE path_id = ? ORDER BY week_number", (row["id"],)
+                ).fetchall()
+                resources = self._conn.execute(
+                    "SELECT * FROM resources WHERE path_id = ? ORDER BY week_number, position", (row["id"],)
+                ).fetchall()
+                progress = self._conn.execute(
+                    "SELECT * FROM progress_updates WHERE path_id = ? ORDER BY id", (row["id"],)
+                ).fetchall()
+            return self._build_learning_path(row, goals, resources, progress)
+        except Exception as e:
+            print(f"Error retrieving learning path from SQLite: {e}")
+            return None
+    
+    def list_paths(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        sql = "SELECT topic, user_id, last_updated FROM learning_paths"
+        params: List[Any] = []
+        if user_id is not None:
+            sql += " WHERE user_id = ?"
+            params.append(user_id)
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY last_updated DESC", params).fetchall()
+        return [dict(row) for row in rows]
+    
+    def append_progress_event(self, topic: str, event: ProgressEvent, user_id: Optional[str] = None) -> bool:
+        try:
+            with self._lock, self._conn:
+                row = self._find_path(topic, user_id)
+                if row is None:
+                    return False
+                self._insert_progress(row["id"], event.progress_update)
+                self._conn.executemany(
+                    "UPDATE weekly_goals SET completed = 1, progress_percentage = 100.0 WHERE path_id = ? AND week_number = ?",
+                    [(row["id"], week_number) for week_number in event.completed_weeks]
+                )
+                recommendations = json.loads(row["adaptive_recommendations"]) + event.recommendations
+                self._conn.execute(
+                    "UPDATE learning_paths SET adaptive_recommendations = ?, last_updated = MAX(last_updated, ?) WHERE id = ?",
+                    (json.dumps(recommendations), event.progress_update.timestamp.isoformat(), row["id"])
+                )
+            return True
+        except Exception as e:
+            print(f"Error updating progress in SQLite: {e}")
+            return False
+    
+    def _find_path(self, topic: str, user_id: Optional[str]) -> Optional[sqlite3.Row]:
+        # Migrated plans without an owner stay visible to everyone, as they were as files;
+        # without a user only those are, never another user's plan
+        owners = (user_id, DEFAULT_USER_ID) if user_id is not None else (DEFAULT_USER_ID,)
+        for owner in owners:
+            row = self._conn.execute(
+                "SELECT * FROM learning_paths WHERE user_id = ? AND topic_key = ?", (owner, topic_key(topic))
+            ).fetchone()
+            if row is not None:
+                return row
+        return None
+    
+    def _upsert_path(self, learning_path: LearningPath) -> int:
+        study_plan = learning_path.study_plan
+        self._conn.execute("""
+            INSERT INTO learning_paths (
+                path_id, user_id, topic, topic_key, experience_level, time_commitment, learning_goals,
+                total_weeks, overall_progress, adaptive_recommendations,
+                plan_created_at, plan_last_updated, created_at, last_updated
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, topic_key) DO UPDATE SET
+                path_id = excluded.path_id,
+                topic = excluded.topic,
+                experience_level = excluded.experience_level,
+                time_commitment = excluded.time_commitment,
+                learning_goals = excluded.learning_goals,
+                total_weeks = excluded.total_weeks,
+                overall_progress = excluded.overall_progress,
+                adaptive_recommendations = excluded.adaptive_recommendations,
+                plan_created_at = excluded.plan_created_at,
+                plan_last_updated = excluded.plan_last_updated,
+                created_at = excluded.created_at,
+                last_updated = excluded.last_updated
+        """, (
+            learning_path.id, learning_path.user_id, learning_path.topic, topic_key(learning_path.topic),
+            learning_path.experience_level.value, learning_path.time_commitment.value, learning_path.learning_goals,
+            study_plan.total_weeks, study_plan.overall_progress, json.dumps(learning_path.adaptive_recommendations),
+            study_plan.created_at.isoformat(), study_plan.last_updated.isoformat(),
+            learning_path.created_at.isoformat(), learning_path.last_updated.isoformat()
+        ))
+        return self._conn.execute(
+            "SELECT id FROM learning_paths WHERE user_id = ? AND topic_key = ?",
+            (learning_path.user_id, topic_key(learning_path.topic))
+        ).fetchone()["id"]
+    
+    def _insert_progress(self, row_id: int, progress_update: ProgressUpdate) -> None:
+        self._conn.execute(
+            "INSERT INTO progress_updates (path_id, topic, completed_items, current_progress, challenges_faced, timestamp, mood_rating, time_spent) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (row_id, progress_update.topic, json.dumps(progress_update.completed_items), progress_update.current_progress,
+             progress_update.challenges_faced, progress_update.timestamp.isoformat(),
+             progress_update.mood_rating, progress_update.time_spent)
+        )
+    
+    def _build_learning_path(self, row: sqlite3.Row, goals: List[sqlite3.Row], resources: List[sqlite3.Row], progress: List[sqlite3.Row]) -> LearningPath:
+        resources_by_week: Dict[int, List[Dict[str, Any]]] = {}
+        for resource in resources:
+            resources_by_week.setdefault(resource["week_number"], []).append({
+                "title": resource["title"],
+                "description": resource["description"],
+                "url": resource["url"],
+                "resource_type": resource["resource_type"],
+                "duration": resource["duration"],
+                "difficulty": resource["difficulty"],
+                "tags": json.loads(resource["tags"]),
+                "estimated_completion_time": resource["estimated_completion_time"]
+            })
+        
+        weekly_goals = [
+            {
+                "week_number": goal["week_number"],
+                "title": goal["title"],
+                "description": goal["description"],
+                "resources": resources_by_week.get(goal["week_number"], []),
+                "objectives": json.loads(goal["objectives"]),
+                "estimated_hours": goal["estimated_hours"],
+                "deadline": goal["deadline"],
+                "completed": bool(goal["completed"]),
+                "progress_percentage": goal["progress_percentage"]
+            }
+            for goal in goals
+        ]
+        
+        return LearningPath(
+            id=row["path_id"],
+            user_id=row["user_id"],
+            topic=row["topic"],
+            experience_level=row["experience_level"],
+            time_commitment=row["time_commitment"],
+            learning_goals=row["learning_goals"],
+            study_plan={
+                "topic": row["topic"],
+                "experience_level": row["experience_level"],
+                "time_commitment": row["time_commitment"],
+                "learning_goals": row["learning_goals"],
+                "total_weeks": row["total_weeks"],
+                "weekly_goals": weekly_goals,
+                "created_at": row["plan_created_at"],
+                "last_updated": row["plan_last_updated"],
+                "overall_progress": row["overall_progress"]
+            },
+            progress_updates=[
+                {
+                    "topic": update["topic"],
+                    "completed_items": json.loads(update["completed_items"]),
+                    "current_progress": update["current_progress"],
+                    "challenges_faced": update["challenges_faced"],
+                    "timestamp": update["timestamp"],
+                    "mood_rating": update["mood_rating"],
+                    "time_spent": update["time_spent"]
+                }
+                for update in progress
+            ],
+            adaptive_recommendations=json.loads(row["adaptive_recommendations"]),
+            created_at=row["created_at"],
+            last_updated=row["last_updated"]
+        )
+
+
+class WriteBehindStore(LearningPathStore):
+    """Keeps saved learning paths in memory and writes them to the backend later.
+    
+    The first save of a path starts a flush_delay window; further saves of the
+    same path within it replace the pending copy, and progress events for a
+    pending path are applied to it in memory, so a burst becomes one backend
+    write. Flushes run on a timer thread and on close(). Reads see pending
+    paths. A flush_delay of 0 writes straight through.
+    """
+    
+    def __init__(self, backend: LearningPathStore, flush_delay: Optional[float] = None):
+        self.backend = backend
+        self.flush_delay = flush_delay if flush_delay is not None else float(os.getenv("STORAGE_FLUSH_DELAY_SECONDS", "2"))
+        
+        self._dirty: Dict[Tuple[str, str], LearningPath] = {}
+        # Held across backend writes so a flush and an append to the same plan cannot interleave
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        
+        self.saves = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.flush_errors = 0
+    
+    def save(self, learning_path: LearningPath) -> bool:
+        if self.flush_delay <= 0:
+            # Write-through still serializes with appends, as a flush would
+            with self._lock:
+                return self.backend.save(learning_path)
+        
+        with self._lock:
+            key = (learning_path.user_id or DEFAULT_USER_ID, topic_key(learning_path.topic))
+            self.saves += 1
+            if key in self._dirty:
+                self.coalesced += 1
+            self._dirty[key] = learning_path
+            self._schedule_flush()
+        return True
+    
+    def load(self, topic: str, user_id: Optional[str] = None) -> Optional[LearningPath]:
+        with self._lock:
+            learning_path = self._pending(topic, user_id)
+            if learning_path is not None:
+                # Callers modify what they load; the pending copy must only change through save
+                return learning_path.model_copy(deep=True)
+        # Not pending, so a concurrent flush cannot be writing it; reads of other plans run in parallel
+        return self.backend.load(topic, user_id)
+    
+    def list_paths(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        self.flush()
+        return self.backend.list_paths(user_id)
+    
+    def append_progress_event(self, topic: str, event: ProgressEvent, user_id: Optional[str] = None) -> bool:
+        with self._lock:
+            learning_path = self._pending(topic, user_id)
+            if learning_path is not None:
+                learning_path.apply_progress_event(event)
+                self.coalesced += 1
+                return True
+            return self.backend.append_progress_event(topic, event, user_id)
+    
+    def flush(self) -> bool:
+        """Write every pending learning path to the backend; returns False if any write failed"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._dirty = self._dirty, {}
+            
+            ok = True
+            for key, learning_path in pending.items():
+                if self.backend.save(learning_path):
+                    self.flushes += 1
+                    continue
+                ok = False
+                self.flush_errors += 1
+                # Keep it for the next flush unless it was replaced meanwhile
+                self._dirty.setdefault(key, learning_path)
+            
+            if self._dirty:
+                self._schedule_flush()
+            return ok
+    
+    def close(self) -> None:
+        self.flush()
+        self.backend.close()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.backend.stats(),
+            "flush_delay_seconds": self.flush_delay,
+            "pending": len(self._dirty),
+            "saves": self.saves,
+            "coalesced": self.coalesced,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors
+        }
+    
+    def _pending(self, topic: str, user_id: Optional[str]) -> Optional[LearningPath]:
+        """The pending path load() would return, flushing others of the topic first if they might shadow it"""
+        key = topic_key(topic)
+        if not any(path_key == key for _, path_key in self._dirty):
+            return None
+        owners = (user_id, DEFAULT_USER_ID) if user_id is not None else (DEFAULT_USER_ID,)
+        for owner in owners:
+            if (owner, key) in self._dirty:
+                return self._dirty[(owner, key)]
+        # Another user's pending copy may be what the backend would resolve to
+        self.flush()
+        return None
+    
+    def _schedule_flush(self) -> None:
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+
+def create_store(backend: Optional[str] = None) -> LearningPathStore:
+    """Build the storage backend named by STORAGE_BACKEND ("json" or "sqlite") behind a write-behind cache"""
+    backend = (backend or os.getenv("STORAGE_BACKEND", "json")).lower()
+    if backend == "sqlite":
+        store = SQLiteStore()
+    else:
+        if backend != "json":
+            print(f"Warning: Unknown STORAGE_BACKEND '{backend}', using json")
+        store = JSONFileStore()
+    return WriteBehindStore(store)
@@ -0,0 +1,109 @@
+import os
+import json
+import gzip
+from typing import Dict, Any, Optional, Tuple
+from pydantic_core import from_json
+from models.learning_path import LearningPath
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Compressed and binary files start with this and the format name on one line,
+# e.g. b"LPSTORE/1 msgpack+zstd\n"; plain JSON (compact or indented) has no header
+# so it stays readable by any JSON tool
+MAGIC = b"LPSTORE/1 "
+LEGACY_FORMAT = "json-indent"
+ENCODINGS = ("json", "msgpack")
+COMPRESSIONS = ("gzip", "zstd")
+
+
+def parse_format(storage_format: str) -> Tuple[str, Optional[str]]:
+    """Split a format name like "msgpack+zstd" into (encoding, compression); raises ValueError if unusable"""
+    if storage_format == LEGACY_FORMAT:
+        return LEGACY_FORMAT, None
+    
+    encoding, _, compression = storage_format.partition("+")
+    if encoding not in ENCODINGS or (compression and compression not in COMPRESSIONS):
+        raise ValueError(f"Unknown storage format '{storage_format}'")
+    if encoding == "msgpack" and msgpack is None:
+        raise ValueError("The msgpack storage format needs the msgpack package")
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("zstd compression needs the zstandard package")
+    return encoding, compression or None
+
+
+def default_format() -> str:
+    """The configured STORAGE_FORMAT, or compact JSON if it cannot be used here"""
+    storage_format = os.getenv("STORAGE_FORMAT", "json").lower()
+    try:
+        parse_format(storage_format)
+        return storage_format
+    except ValueError as e:
+        print(f"Warning: {e}, using json")
+        return "json"
+
+
+def encode_learning_path(learning_path: LearningPath, storage_format: Optional[str] = None) -> bytes:
+    """Serialize a learning path in storage_format (default STORAGE_FORMAT)"""
+    storage_format = storage_format or default_format()
+    encoding, compression = parse_format(storage_format)
+    
+    if encoding == LEGACY_FORMAT:
+        return json.dumps(learning_path.model_dump(), indent=2, default=str).encode()
+    
+    if encoding == "msgpack":
+        payload = msgpack.packb(learning_path.model_dump(mode="json"))
+    else:
+        # pydantic's own encoder: compact, ISO datetimes, no dict round trip
+        payload = learning_path.model_dump_json().encode()
+        if compression is None:
+            return payload
+    
+    if compression == "gzip":
+        payload = gzip.compress(payload, compresslevel=6)
+    elif compression == "zstd":
+        payload = zstandard.ZstdCompressor().compress(payload)
+    
+    return MAGIC + storage_format.encode() + b"\n" + payload
+
+
+def decode_learning_path(data: bytes) -> Dict[str, Any]:
+    """Parse stored learning path data in any supported format back to a dict"""
+    if not data.startswith(MAGIC):
+        # Plain JSON; pydantic's parser handles raw UTF-8 text faster than json.loads
+        return from_json(data)
+    
+    header, _, payload = data.partition(b"\n")
+    encoding, compression = parse_format(header[len(MAGIC):].decode())
+    
+    if compression == "gzip":
+        payload = gzip.decompress(payload)
+    elif compression == "zstd":
+        payload = zstandard.ZstdDecompressor().decompress(payload)
+    
+    if encoding == "msgpack":
+        return msgpack.unpackb(payload)
+    return from_json(payload)
+
+
+def read_learning_path_file(path: str) -> Dict[str, Any]:
+    """Read and decode a stored learning path file"""
+    with open(path, 'rb') as f:
+        return decode_learning_path(f.read())
+
+
+def stored_format(path: str) -> str:
+    """Name of the format a stored file is in"""
+    with open(path, 'rb') as f:
+        header = f.readline()
+    if not header.startswith(MAGIC):
+        # Indented JSON opens with "{" on a line of its own
+        return LEGACY_FORMAT if header.strip() == b"{" else "json"
+    return header[len(MAGIC):].strip().decode()
@@ -0,0 +1,75 @@
+from typing import List, Dict, Any, Optional
+from services.http_client import get_http_client
+
+YOUTUBE_API_BASE = "https://www.googleapis.com/youtube/v3"
+
+# Daily quota units charged per call, from the YouTube Data API cost table
+QUOTA_COSTS = {
+    'search': 100,
+    'videos': 1,
+    'playlistItems': 1
+}
+
+
+class YouTubeAPIError(Exception):
+    """Error response from the YouTube Data API"""
+    
+    def __init__(self, status_code: int, message: str, reason: Optional[str] = None):
+        super().__init__(f"YouTube API error {status_code} ({reason or 'unknown'}): {message}")
+        self.status_code = status_code
+        self.reason = reason
+
+
+class YouTubeAPIClient:
+    """Minimal async client for the YouTube Data API v3 on the shared HTTP transport.
+    
+    Methods return the decoded JSON response exactly as the API documents it, with
+    errors raised as YouTubeAPIError.
+    """
+    
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+    
+    async def search(self, query: str, max_results: int = 10, **filters: Any) -> Dict[str, Any]:
+        """search.list for videos matching query"""
+        params = {
+            'part': 'snippet',
+            'q': query,
+            'type': 'video',
+            'maxResults': max_results
+        }
+        params.update(filters)
+        return await self._get('search', params)
+    
+    async def videos(self, video_ids: List[str], part: str = 'contentDetails,statistics,snippet') -> Dict[str, Any]:
+        """videos.list for up to 50 comma-separated video IDs"""
+        return await self._get('videos', {'part': part, 'id': ','.join(video_ids)})
+    
+    async def playlist_items(self, playlist_id: str, page_token: Optional[str] = None, max_results: int = 50) -> Dict[str, Any]:
+        """playlistItems.list for one page of a playlist"""
+        params = {
+            'part': 'snippet',
+            'playlistId': playlist_id,
+            'maxResults': max_results
+        }
+        if page_token:
+            params['pageToken'] = page_token
+        return await self._get('playlistItems', params)
+    
+    async def _get(self, resource: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        client = get_http_client()
+        response = await client.get(f"{YOUTUBE_API_BASE}/{resource}", params={**params, 'key': self.api_key})
+        
+        if response.status_code >= 400:
+            message = response.text
+            reason = None
+            try:
+                error = response.json().get('error', {})
+                message = error.get('message', message)
+                errors = error.get('errors') or [{}]
+                reason = errors[0].get('reason')
+            except ValueError:
+                pass
+            raise YouTubeAPIError(response.status_code, message, reason)
+        
+        return response.json()
@@ -0,0 +1,116 @@
+import os
+import json
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Any, Optional
+from services.youtube_client import QUOTA_COSTS
+
+try:
+    from zoneinfo import ZoneInfo
+    # YouTube quotas reset at midnight Pacific Time
+    QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+except Exception:
+    QUOTA_TIMEZONE = timezone(timedelta(hours=-8))
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+
+class QuotaExhaustedError(Exception):
+    """Raised when a YouTube call is refused to protect the remaining daily quota"""
+
+
+class YouTubeQuotaLedger:
+    """Tracks YouTube Data API quota units spent today and decides which calls may run.
+    
+    Background work (cache refreshes) may not spend into the interactive reserve, and
+    once only the safety margin is left every call is refused, so the service falls
+    back to cache-only serving before the API starts rejecting requests. The ledger is
+    persisted so a restart does not forget what has already been spent.
+    """
+    
+    def __init__(self, daily_quota: Optional[int] = None, interactive_reserve: Optional[int] = None, safety_margin: Optional[int] = None, state_path: Optional[str] = None):
+        self.daily_quota = daily_quota or int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+        self.interactive_reserve = interactive_reserve if interactive_reserve is not None else int(os.getenv("YOUTUBE_QUOTA_INTERACTIVE_RESERVE", "2000"))
+        self.safety_margin = safety_margin if safety_margin is not None else int(os.getenv("YOUTUBE_QUOTA_SAFETY_MARGIN", "200"))
+        self.state_path = state_path or os.path.join(os.getenv("CACHE_DIR", "data/cache"), "youtube_quota.json")
+        
+        self.day = self._current_day()
+        self.used = 0
+        self.calls: Dict[str, int] = {}
+        self.denied: Dict[str, int] = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._load()
+    
+    def remaining(self) -> int:
+        """Quota units left today"""
+        self._roll_over()
+        return max(0, self.daily_quota - self.used)
+    
+    def can_spend(self, call_type: str, priority: str = INTERACTIVE) -> bool:
+        """Whether a call of this type may run at this priority without spending protected quota"""
+        floor = self.safety_margin
+        if priority == BACKGROUND:
+            floor += self.interactive_reserve
+        return self.remaining() - QUOTA_COSTS[call_type] >= floor
+    
+    def reserve(self, call_type: str, priority: str = INTERACTIVE) -> None:
+        """Charge a call against today's quota, or raise QuotaExhaustedError if it is not allowed"""
+        if not self.can_spend(call_type, priority):
+            self.denied[priority] = self.denied.get(priority, 0) + 1
+            raise QuotaExhaustedError(
+                f"YouTube quota protected: {self.remaining()} units left, {call_type} costs {QUOTA_COSTS[call_type]} ({priority})"
+            )
+        self.used += QUOTA_COSTS[call_type]
+        self.calls[call_type] = self.calls.get(call_type, 0) + 1
+        self._save()
+    
+    def mark_exhausted(self) -> None:
+        """Record that the API reported the quota as exceeded"""
+        self._roll_over()
+        self.used = max(self.used, self.daily_quota)
+        self._save()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return today's spend, remaining budget and refused calls"""
+        remaining = self.remaining()
+        return {
+            "day": self.day,
+            "daily_quota": self.daily_quota,
+            "used": self.used,
+            "remaining": remaining,
+            "cache_only": remaining - QUOTA_COSTS['videos'] < self.safety_margin,
+            "calls": dict(self.calls),
+            "denied": dict(self.denied)
+        }
+    
+    def _current_day(self) -> str:
+        return datetime.now(QUOTA_TIMEZONE).date().isoformat()
+    
+    def _roll_over(self) -> None:
+        today = self._current_day()
+        if today != self.day:
+            self.day = today
+            self.used = 0
+            self.calls = {}
+            self.denied = {INTERACTIVE: 0, BACKGROUND: 0}
+            self._save()
+    
+    def _load(self) -> None:
+        try:
+            if os.path.exists(self.state_path):
+                with open(self.state_path, 'r') as f:
+                    data = json.load(f)
+                if data.get("day") == self.day:
+                    self.used = data.get("used", 0)
+                    self.calls = data.get("calls", {})
+        except Exception as e:
+            print(f"Warning: Could not load YouTube quota ledger: {e}")
+    
+    def _save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({"day": self.day, "used": self.used, "calls": self.calls}, f)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            print(f"Warning: Could not save YouTube quota ledger: {e}")
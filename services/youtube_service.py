@@ -1,20 +1,201 @@
 import os
-import httpx
-from typing import List, Dict, Any, Optional
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import time
+import asyncio
+from typing import List, Dict, Any, Optional, Callable, Awaitable, AsyncIterator
+from services.cache import PersistentTTLCache
+from services.youtube_client import YouTubeAPIClient, YouTubeAPIError, QUOTA_COSTS
+from services.youtube_quota import YouTubeQuotaLedger, QuotaExhaustedError, INTERACTIVE, BACKGROUND
+from services.ranking import parse_duration, rank_videos
 from models.learning_path import LearningResource, ResourceType
 
+# The YouTube Data API accepts at most 50 comma-separated IDs per videos.list call
+MAX_IDS_PER_REQUEST = 50
+
+# Error reasons the API uses once the daily quota is gone
+QUOTA_ERROR_REASONS = ('quotaExceeded', 'dailyLimitExceeded')
+
+# Placeholder titles playlistItems.list returns for videos that can no longer be watched
+UNAVAILABLE_PLAYLIST_TITLES = ('Private video', 'Deleted video')
+
+# Real YouTube video IDs for different topics, served when the API is unavailable
+MOCK_VIDEOS = {
+    'python': [
+        {
+            'id': 'kqtD5dpn9C8',
+            'title': 'Python for Beginners - Learn Python in 1 Hour',
+            'description': 'This python tutorial for beginners will help you learn python programming fast and easy.',
+            'url': 'https://www.youtube.com/watch?v=kqtD5dpn9C8',
+            'thumbnail': 'https://i.ytimg.com/vi/kqtD5dpn9C8/hqdefault.jpg',
+            'channel': 'Programming with Mosh',
+            'published_at': '2021-09-16T00:00:00Z',
+            'duration': '1:03:21',
+            'view_count': 15000000,
+            'like_count': 500000,
+            'tags': ['python', 'tutorial', 'beginners', 'programming']
+        },
+        {
+            'id': 'rfscVS0vtbw',
+            'title': 'Learn Python - Full Course for Beginners',
+            'description': 'This complete course will take you from zero to hero in Python programming.',
+            'url': 'https://www.youtube.com/watch?v=rfscVS0vtbw',
+            'thumbnail': 'https://i.ytimg.com/vi/rfscVS0vtbw/hqdefault.jpg',
+            'channel': 'freeCodeCamp.org',
+            'published_at': '2018-07-11T00:00:00Z',
+            'duration': '4:26:52',
+            'view_count': 45000000,
+            'like_count': 1200000,
+            'tags': ['python', 'full course', 'beginners', 'programming']
+        }
+    ],
+    'javascript': [
+        {
+            'id': 'W6NZfCO5SIk',
+            'title': 'JavaScript Tutorial for Beginners: Learn JavaScript in 1 Hour',
+            'description': 'This JavaScript tutorial for beginners will help you learn JavaScript programming fast and easy.',
+            'url': 'https://www.youtube.com/watch?v=W6NZfCO5SIk',
+            'thumbnail': 'https://i.ytimg.com/vi/W6NZfCO5SIk/hqdefault.jpg',
+            'channel': 'Programming with Mosh',
+            'published_at': '2018-04-24T00:00:00Z',
+            'duration': '1:00:00',
+            'view_count': 12000000,
+            'like_count': 400000,
+            'tags': ['javascript', 'tutorial', 'beginners', 'programming']
+        },
+        {
+            'id': 'PkZNo7MFNFg',
+            'title': 'Learn JavaScript - Full Course for Beginners',
+            'description': 'This complete 134-part JavaScript tutorial for beginners will teach you everything you need to know.',
+            'url': 'https://www.youtube.com/watch?v=PkZNo7MFNFg',
+            'thumbnail': 'https://i.ytimg.com/vi/PkZNo7MFNFg/hqdefault.jpg',
+            'channel': 'freeCodeCamp.org',
+            'published_at': '2018-12-10T00:00:00Z',
+            'duration': '3:26:43',
+            'view_count': 25000000,
+            'like_count': 800000,
+            'tags': ['javascript', 'full course', 'beginners', 'programming']
+        }
+    ],
+    'react': [
+        {
+            'id': 'bMknfKXIFA8',
+            'title': 'React Course - Beginner\'s Tutorial for React JavaScript Library',
+            'description': 'This React course will teach you React from the ground up.',
+            'url': 'https://www.youtube.com/watch?v=bMknfKXIFA8',
+            'thumbnail': 'https://i.ytimg.com/vi/bMknfKXIFA8/hqdefault.jpg',
+            'channel': 'freeCodeCamp.org',
+            'published_at': '2022-01-10T00:00:00Z',
+            'duration': '8:25:51',
+            'view_count': 8000000,
+            'like_count': 300000,
+            'tags': ['react', 'javascript', 'tutorial', 'beginners']
+        }
+    ],
+    'machine learning': [
+        {
+            'id': 'KNAWp2S3w94',
+            'title': 'Machine Learning Course for Beginners',
+            'description': 'This machine learning course will teach you the fundamentals of machine learning.',
+            'url': 'https://www.youtube.com/watch?v=KNAWp2S3w94',
+            'thumbnail': 'https://i.ytimg.com/vi/KNAWp2S3w94/hqdefault.jpg',
+            'channel': 'freeCodeCamp.org',
+            'published_at': '2020-09-17T00:00:00Z',
+            'duration': '9:52:19',
+            'view_count': 5000000,
+            'like_count': 200000,
+            'tags': ['machine learning', 'ai', 'tutorial', 'beginners']
+        }
+    ],
+    'web3': [
+        {
+            'id': 'gyMwXuJpJ2E',
+            'title': 'Learn Web3 Development - Full Course',
+            'description': 'This Web3 development course will teach you everything about blockchain and Web3.',
+            'url': 'https://www.youtube.com/watch?v=gyMwXuJpJ2E',
+            'thumbnail': 'https://i.ytimg.com/vi/gyMwXuJpJ2E/hqdefault.jpg',
+            'channel': 'freeCodeCamp.org',
+            'published_at': '2022-03-15T00:00:00Z',
+            'duration': '16:20:26',
+            'view_count': 3000000,
+            'like_count': 150000,
+            'tags': ['web3', 'blockchain', 'ethereum', 'tutorial']
+        }
+    ],
+    'devops': [
+        {
+            'id': '9Ua6y0hQWfQ',
+            'title': 'DevOps Engineering Course for Beginners',
+            'description': 'This DevOps course will teach you the fundamentals of DevOps engineering.',
+            'url': 'https://www.youtube.com/watch?v=9Ua6y0hQWfQ',
+            'thumbnail': 'https://i.ytimg.com/vi/9Ua6y0hQWfQ/hqdefault.jpg',
+            'channel': 'freeCodeCamp.org',
+            'published_at': '2021-06-20T00:00:00Z',
+            'duration': '6:45:12',
+            'view_count': 2000000,
+            'like_count': 100000,
+            'tags': ['devops', 'docker', 'kubernetes', 'tutorial']
+        }
+    ]
+}
+
+# The generic fallback in _get_mock_videos reuses one of these URLs
+MOCK_VIDEO_URLS = frozenset(video['url'] for videos in MOCK_VIDEOS.values() for video in videos)
+
+
 class YouTubeService:
     def __init__(self):
         self.api_key = os.getenv("YOUTUBE_API_KEY")
         if self.api_key:
-            self.youtube = build('youtube', 'v3', developerKey=self.api_key)
+            self.youtube = YouTubeAPIClient(self.api_key)
         else:
             self.youtube = None
+        
+        # Cached entries are served fresh within *_TTL and served stale (while a background
+        # refresh runs) until *_MAX_AGE. Rankings go stale far sooner than video details.
+        self.search_fresh_seconds = float(os.getenv("YOUTUBE_SEARCH_CACHE_TTL_SECONDS", str(6 * 3600)))
+        self.details_fresh_seconds = float(os.getenv("YOUTUBE_DETAILS_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+        self.search_cache = PersistentTTLCache(
+            name="youtube_search",
+            ttl_seconds=float(os.getenv("YOUTUBE_SEARCH_CACHE_MAX_AGE_SECONDS", str(3 * 24 * 3600))),
+            max_memory_entries=512,
+            max_disk_entries=5000
+        )
+        self.details_cache = PersistentTTLCache(
+            name="youtube_details",
+            ttl_seconds=float(os.getenv("YOUTUBE_DETAILS_CACHE_MAX_AGE_SECONDS", str(30 * 24 * 3600))),
+            max_memory_entries=4096,
+            max_disk_entries=50000
+        )
+        self.quota = YouTubeQuotaLedger()
+        
+        # Searches over-fetch this many candidates and re-rank them locally; a search costs
+        # the same quota whatever its size, and every caller of a topic shares one cache entry
+        self.search_candidates = int(os.getenv("YOUTUBE_SEARCH_CANDIDATES", "15"))
+        self.quota_units_saved = 0
+        self.stale_served = 0
+        self.background_refreshes = 0
+        self._refreshing: Dict[str, asyncio.Task] = {}
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return search/details cache counters and the API quota units they saved"""
+        return {
+            "search": self.search_cache.stats(),
+            "details": self.details_cache.stats(),
+            "quota_units_saved": self.quota_units_saved,
+            "stale_served": self.stale_served,
+            "background_refreshes": self.background_refreshes
+        }
+    
+    def quota_stats(self) -> Dict[str, Any]:
+        """Return today's YouTube quota spend and remaining budget"""
+        return self.quota.stats()
     
-    async def search_educational_videos(self, topic: str, max_results: int = 10) -> List[Dict[str, Any]]:
-        """Search for educational videos on a specific topic"""
+    async def search_educational_videos(self, topic: str, max_results: int = 10, priority: str = INTERACTIVE, difficulty: Optional[str] = None, target_seconds: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Search for educational videos on a specific topic.
+        
+        priority is "interactive" for user-facing requests or "background" for work
+        that must not eat into the quota reserved for users. Results are re-ranked
+        locally towards difficulty and a target video length (see services.ranking).
+        """
         
         if not self.youtube:
             # Fallback to mock data if API key is not available
@@ -24,25 +205,17 @@ class YouTubeService:
             # Search for educational videos
             search_query = f"{topic} tutorial learning education"
             
-            request = self.youtube.search().list(
-                part='snippet',
-                q=search_query,
-                type='video',
-                videoDuration='medium',  # 4-20 minutes
-                videoDefinition='high',
-                order='relevance',
-                maxResults=max_results
-            )
+            candidates = min(MAX_IDS_PER_REQUEST, max(max_results, self.search_candidates))
+            items = await self._search_items(search_query, candidates, priority)
             
-            response = request.execute()
+            # Fetch details for every hit in one videos.list call
+            details_by_id = await self._get_videos_details([item['id']['videoId'] for item in items], priority)
             
             videos = []
-            for item in response.get('items', []):
+            for item in items:
                 video_id = item['id']['videoId']
                 snippet = item['snippet']
-                
-                # Get additional video details
-                video_details = self._get_video_details(video_id)
+                video_details = details_by_id.get(video_id, {})
                 
                 video = {
                     'id': video_id,
@@ -53,6 +226,7 @@ class YouTubeService:
                     'channel': snippet['channelTitle'],
                     'published_at': snippet['publishedAt'],
                     'duration': video_details.get('duration', 'Unknown'),
+                    'duration_seconds': parse_duration(video_details.get('duration')),
                     'view_count': video_details.get('view_count', 0),
                     'like_count': video_details.get('like_count', 0),
                     'tags': video_details.get('tags', []),
@@ -60,166 +234,143 @@ class YouTubeService:
                 }
                 videos.append(video)
             
-            return videos
-            
-        except HttpError as e:
+            return rank_videos(videos, difficulty, target_seconds)[:max_results]
+        
+        except QuotaExhaustedError as e:
+            print(f"YouTube cache-only mode, no cached results: {e}")
+            return self._get_mock_videos(topic, max_results)
+        except YouTubeAPIError as e:
             print(f"YouTube API error: {e}")
             return self._get_mock_videos(topic, max_results)
         except Exception as e:
             print(f"Error searching YouTube videos: {e}")
             return self._get_mock_videos(topic, max_results)
     
-    def _get_video_details(self, video_id: str) -> Dict[str, Any]:
+    async def _get_video_details(self, video_id: str) -> Dict[str, Any]:
         """Get detailed information about a specific video"""
+        return (await self._get_videos_details([video_id])).get(video_id, {})
+    
+    async def _search_items(self, search_query: str, max_results: int, priority: str = INTERACTIVE) -> List[Dict[str, Any]]:
+        """Return search.list items for a query, from cache when possible"""
+        key = f"{search_query}|{max_results}"
+        
+        async def fetch(priority: str = priority) -> List[Dict[str, Any]]:
+            response = await self._call('search', priority, lambda: self.youtube.search(
+                search_query,
+                max_results=max_results,
+                videoDuration='medium',  # 4-20 minutes
+                videoDefinition='high',
+                order='relevance'
+            ))
+            items = response.get('items', [])
+            self.search_cache.set(key, items)
+            return items
+        
+        entry = self.search_cache.get_entry(key)
+        if entry is not None:
+            items, stored_at = entry
+            self.quota_units_saved += QUOTA_COSTS['search']
+            if time.time() - stored_at > self.search_fresh_seconds:
+                self.stale_served += 1
+                if self.quota.can_spend('search', BACKGROUND):
+                    self._refresh_in_background(f"search:{key}", lambda: fetch(BACKGROUND))
+            return items
+        
+        return await fetch()
+    
+    async def _get_videos_details(self, video_ids: List[str], priority: str = INTERACTIVE) -> Dict[str, Dict[str, Any]]:
+        """Get details for many videos keyed by video ID, fetching only IDs missing from cache"""
+        details = {}
+        missing = []
+        stale = []
+        now = time.time()
+        
+        for video_id in video_ids:
+            entry = self.details_cache.get_entry(video_id)
+            if entry is None:
+                missing.append(video_id)
+                continue
+            details[video_id], stored_at = entry
+            if now - stored_at > self.details_fresh_seconds:
+                stale.append(video_id)
+        
+        # Count the videos.list calls avoided by cached IDs
+        calls_needed = -(-len(video_ids) // MAX_IDS_PER_REQUEST)
+        calls_made = -(-len(missing) // MAX_IDS_PER_REQUEST)
+        self.quota_units_saved += (calls_needed - calls_made) * QUOTA_COSTS['videos']
+        
+        if stale:
+            self.stale_served += 1
+            if self.quota.can_spend('videos', BACKGROUND):
+                self._refresh_in_background(f"details:{','.join(stale)}", lambda: self._fetch_videos_details(stale, BACKGROUND))
+        
+        if missing:
+            details.update(await self._fetch_videos_details(missing, priority))
+        
+        return details
+    
+    async def _call(self, call_type: str, priority: str, request: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Charge the quota ledger for an API call, then make it"""
+        self.quota.reserve(call_type, priority)
         try:
-            request = self.youtube.videos().list(
-                part='contentDetails,statistics,snippet',
-                id=video_id
-            )
-            response = request.execute()
-            
-            if response['items']:
-                video = response['items'][0]
-                return {
+            return await request()
+        except YouTubeAPIError as e:
+            if e.reason in QUOTA_ERROR_REASONS:
+                self.quota.mark_exhausted()
+            raise
+    
+    def _refresh_in_background(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        """Revalidate a stale cache entry without making the caller wait for it"""
+        if key in self._refreshing:
+            return
+        
+        async def refresh():
+            try:
+                await fetch()
+                self.background_refreshes += 1
+            except Exception as e:
+                print(f"Error refreshing YouTube cache entry: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+        
+        self._refreshing[key] = asyncio.create_task(refresh())
+    
+    async def _fetch_videos_details(self, video_ids: List[str], priority: str = INTERACTIVE) -> Dict[str, Dict[str, Any]]:
+        """Get details for many videos, 50 IDs per videos.list call, keyed by video ID"""
+        batches = [
+            video_ids[start:start + MAX_IDS_PER_REQUEST]
+            for start in range(0, len(video_ids), MAX_IDS_PER_REQUEST)
+        ]
+        responses = await asyncio.gather(
+            *[self._call('videos', priority, lambda batch=batch: self.youtube.videos(batch)) for batch in batches],
+            return_exceptions=True
+        )
+        
+        details = {}
+        for response in responses:
+            if isinstance(response, Exception):
+                print(f"Error getting video details: {response}")
+                continue
+            for video in response.get('items', []):
+                details[video['id']] = {
                     'duration': video['contentDetails']['duration'],
                     'view_count': int(video['statistics'].get('viewCount', 0)),
                     'like_count': int(video['statistics'].get('likeCount', 0)),
                     'tags': video['snippet'].get('tags', [])
                 }
-        except Exception as e:
-            print(f"Error getting video details: {e}")
+                self.details_cache.set(video['id'], details[video['id']])
         
-        return {}
+        return details
     
     def _get_mock_videos(self, topic: str, max_results: int) -> List[Dict[str, Any]]:
         """Return realistic mock video data for testing purposes"""
         
-        # Real YouTube video IDs for different topics
-        topic_videos = {
-            'python': [
-                {
-                    'id': 'kqtD5dpn9C8',
-                    'title': 'Python for Beginners - Learn Python in 1 Hour',
-                    'description': 'This python tutorial for beginners will help you learn python programming fast and easy.',
-                    'url': 'https://www.youtube.com/watch?v=kqtD5dpn9C8',
-                    'thumbnail': 'https://i.ytimg.com/vi/kqtD5dpn9C8/hqdefault.jpg',
-                    'channel': 'Programming with Mosh',
-                    'published_at': '2021-09-16T00:00:00Z',
-                    'duration': '1:03:21',
-                    'view_count': 15000000,
-                    'like_count': 500000,
-                    'tags': ['python', 'tutorial', 'beginners', 'programming']
-                },
-                {
-                    'id': 'rfscVS0vtbw',
-                    'title': 'Learn Python - Full Course for Beginners',
-                    'description': 'This complete course will take you from zero to hero in Python programming.',
-                    'url': 'https://www.youtube.com/watch?v=rfscVS0vtbw',
-                    'thumbnail': 'https://i.ytimg.com/vi/rfscVS0vtbw/hqdefault.jpg',
-                    'channel': 'freeCodeCamp.org',
-                    'published_at': '2018-07-11T00:00:00Z',
-                    'duration': '4:26:52',
-                    'view_count': 45000000,
-                    'like_count': 1200000,
-                    'tags': ['python', 'full course', 'beginners', 'programming']
-                }
-            ],
-            'javascript': [
-                {
-                    'id': 'W6NZfCO5SIk',
-                    'title': 'JavaScript Tutorial for Beginners: Learn JavaScript in 1 Hour',
-                    'description': 'This JavaScript tutorial for beginners will help you learn JavaScript programming fast and easy.',
-                    'url': 'https://www.youtube.com/watch?v=W6NZfCO5SIk',
-                    'thumbnail': 'https://i.ytimg.com/vi/W6NZfCO5SIk/hqdefault.jpg',
-                    'channel': 'Programming with Mosh',
-                    'published_at': '2018-04-24T00:00:00Z',
-                    'duration': '1:00:00',
-                    'view_count': 12000000,
-                    'like_count': 400000,
-                    'tags': ['javascript', 'tutorial', 'beginners', 'programming']
-                },
-                {
-                    'id': 'PkZNo7MFNFg',
-                    'title': 'Learn JavaScript - Full Course for Beginners',
-                    'description': 'This complete 134-part JavaScript tutorial for beginners will teach you everything you need to know.',
-                    'url': 'https://www.youtube.com/watch?v=PkZNo7MFNFg',
-                    'thumbnail': 'https://i.ytimg.com/vi/PkZNo7MFNFg/hqdefault.jpg',
-                    'channel': 'freeCodeCamp.org',
-                    'published_at': '2018-12-10T00:00:00Z',
-                    'duration': '3:26:43',
-                    'view_count': 25000000,
-                    'like_count': 800000,
-                    'tags': ['javascript', 'full course', 'beginners', 'programming']
-                }
-            ],
-            'react': [
-                {
-                    'id': 'bMknfKXIFA8',
-                    'title': 'React Course - Beginner\'s Tutorial for React JavaScript Library',
-                    'description': 'This React course will teach you React from the ground up.',
-                    'url': 'https://www.youtube.com/watch?v=bMknfKXIFA8',
-                    'thumbnail': 'https://i.ytimg.com/vi/bMknfKXIFA8/hqdefault.jpg',
-                    'channel': 'freeCodeCamp.org',
-                    'published_at': '2022-01-10T00:00:00Z',
-                    'duration': '8:25:51',
-                    'view_count': 8000000,
-                    'like_count': 300000,
-                    'tags': ['react', 'javascript', 'tutorial', 'beginners']
-                }
-            ],
-            'machine learning': [
-                {
-                    'id': 'KNAWp2S3w94',
-                    'title': 'Machine Learning Course for Beginners',
-                    'description': 'This machine learning course will teach you the fundamentals of machine learning.',
-                    'url': 'https://www.youtube.com/watch?v=KNAWp2S3w94',
-                    'thumbnail': 'https://i.ytimg.com/vi/KNAWp2S3w94/hqdefault.jpg',
-                    'channel': 'freeCodeCamp.org',
-                    'published_at': '2020-09-17T00:00:00Z',
-                    'duration': '9:52:19',
-                    'view_count': 5000000,
-                    'like_count': 200000,
-                    'tags': ['machine learning', 'ai', 'tutorial', 'beginners']
-                }
-            ],
-            'web3': [
-                {
-                    'id': 'gyMwXuJpJ2E',
-                    'title': 'Learn Web3 Development - Full Course',
-                    'description': 'This Web3 development course will teach you everything about blockchain and Web3.',
-                    'url': 'https://www.youtube.com/watch?v=gyMwXuJpJ2E',
-                    'thumbnail': 'https://i.ytimg.com/vi/gyMwXuJpJ2E/hqdefault.jpg',
-                    'channel': 'freeCodeCamp.org',
-                    'published_at': '2022-03-15T00:00:00Z',
-                    'duration': '16:20:26',
-                    'view_count': 3000000,
-                    'like_count': 150000,
-                    'tags': ['web3', 'blockchain', 'ethereum', 'tutorial']
-                }
-            ],
-            'devops': [
-                {
-                    'id': '9Ua6y0hQWfQ',
-                    'title': 'DevOps Engineering Course for Beginners',
-                    'description': 'This DevOps course will teach you the fundamentals of DevOps engineering.',
-                    'url': 'https://www.youtube.com/watch?v=9Ua6y0hQWfQ',
-                    'thumbnail': 'https://i.ytimg.com/vi/9Ua6y0hQWfQ/hqdefault.jpg',
-                    'channel': 'freeCodeCamp.org',
-                    'published_at': '2021-06-20T00:00:00Z',
-                    'duration': '6:45:12',
-                    'view_count': 2000000,
-                    'like_count': 100000,
-                    'tags': ['devops', 'docker', 'kubernetes', 'tutorial']
-                }
-            ]
-        }
-        
         # Get videos for the specific topic
         topic_lower = topic.lower()
         videos = []
         
         # Find matching topic
-        for key, video_list in topic_videos.items():
+        for key, video_list in MOCK_VIDEOS.items():
             if key in topic_lower or topic_lower in key:
                 videos.extend(video_list)
                 break
@@ -245,52 +396,78 @@ class YouTubeService:
         
         return videos[:max_results]
     
-    async def get_video_recommendations(self, topic: str, difficulty: str = "beginner") -> List[Dict[str, Any]]:
+    async def get_video_recommendations(self, topic: str, difficulty: str = "beginner", priority: str = INTERACTIVE) -> List[Dict[str, Any]]:
         """Get video recommendations based on topic and difficulty level"""
-        
-        # Adjust search query based on difficulty
-        difficulty_keywords = {
-            "beginner": "basics fundamentals introduction",
-            "intermediate": "advanced intermediate tutorial",
-            "advanced": "expert advanced deep dive"
-        }
-        
-        search_query = f"{topic} {difficulty_keywords.get(difficulty, '')}"
-        return await self.search_educational_videos(search_query, max_results=5)
+        # Same search as the plain topic (usually cached); only the local ranking changes
+        return await self.search_educational_videos(topic, max_results=5, priority=priority, difficulty=difficulty)
     
-    async def get_playlist_videos(self, playlist_id: str) -> List[Dict[str, Any]]:
+    async def get_playlist_videos(self, playlist_id: str, max_items: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get all videos from a specific playlist"""
+        videos = []
+        try:
+            async for video in self.iter_playlist_videos(playlist_id, max_items=max_items):
+                videos.append(video)
+        except Exception as e:
+            print(f"Error getting playlist videos: {e}")
+        return videos
+    
+    async def iter_playlist_videos(self, playlist_id: str, max_items: Optional[int] = None, priority: str = INTERACTIVE) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every video in a playlist, one page at a time.
+        
+        While a page's details are being fetched the next page is already on its
+        way, and only one page is held in memory. Stops after max_items videos, or
+        as soon as the caller stops iterating.
+        """
         
         if not self.youtube:
-            return []
+            return
+        
+        def fetch_page(page_token: Optional[str]) -> Awaitable[Dict[str, Any]]:
+            return self._call('playlistItems', priority, lambda: self.youtube.playlist_items(
+                playlist_id, page_token=page_token, max_results=MAX_IDS_PER_REQUEST
+            ))
         
+        yielded = 0
+        next_page: Optional[asyncio.Task] = asyncio.ensure_future(fetch_page(None))
         try:
-            request = self.youtube.playlistItems().list(
-                part='snippet',
-                playlistId=playlist_id,
-                maxResults=50
-            )
-            
-            response = request.execute()
-            videos = []
-            
-            for item in response.get('items', []):
-                video_id = item['snippet']['resourceId']['videoId']
-                snippet = item['snippet']
+            while next_page is not None:
+                response = await next_page
+                next_page = None
                 
-                video = {
-                    'id': video_id,
-                    'title': snippet['title'],
-                    'description': snippet['description'],
-                    'url': f"https://www.youtube.com/watch?v={video_id}",
-                    'thumbnail': snippet['thumbnails']['high']['url'],
-                    'channel': snippet['channelTitle'],
-                    'resource_type': ResourceType.YOUTUBE_VIDEO.value
-                }
-                videos.append(video)
-            
-            return videos
-            
-        except Exception as e:
-            print(f"Error getting playlist videos: {e}")
-            return [] 
\ No newline at end of file
+                snippets = [
+                    item['snippet'] for item in response.get('items', [])
+                    if item['snippet'].get('title') not in UNAVAILABLE_PLAYLIST_TITLES
+                ]
+                if max_items is not None:
+                    snippets = snippets[:max_items - yielded]
+                
+                page_token = response.get('nextPageToken')
+                if page_token and (max_items is None or yielded + len(snippets) < max_items):
+                    next_page = asyncio.ensure_future(fetch_page(page_token))
+                
+                details_by_id = await self._get_videos_details(
+                    [snippet['resourceId']['videoId'] for snippet in snippets], priority
+                )
+                
+                for snippet in snippets:
+                    video_id = snippet['resourceId']['videoId']
+                    video_details = details_by_id.get(video_id, {})
+                    yield {
+                        'id': video_id,
+                        'title': snippet['title'],
+                        'description': snippet['description'],
+                        'url': f"https://www.youtube.com/watch?v={video_id}",
+                        'thumbnail': snippet.get('thumbnails', {}).get('high', {}).get('url', ''),
+                        'channel': snippet.get('videoOwnerChannelTitle', snippet['channelTitle']),
+                        'position': snippet.get('position', yielded),
+                        'duration': video_details.get('duration', 'Unknown'),
+                        'view_count': video_details.get('view_count', 0),
+                        'like_count': video_details.get('like_count', 0),
+                        'tags': video_details.get('tags', []),
+                        'resource_type': ResourceType.YOUTUBE_VIDEO.value
+                    }
+                    yielded += 1
+        finally:
+            # The caller stopped early; don't leave a page request running
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for batched GitHub repository searches
+"""
+
+import json
+import asyncio
+import httpx
+import pytest
+from services import github_client
+from services.github_client import GitHubClient, GitHubAPIError
+
+def repository(name: str) -> dict:
+    return {
+        "name": name,
+        "description": f"{name} project",
+        "url": f"https://github.com/example/{name}",
+        "stargazerCount": 10,
+        "forkCount": 2,
+        "primaryLanguage": {"name": "Python"},
+        "repositoryTopics": {"nodes": [{"topic": {"name": "learning"}}]}
+    }
+
+@pytest.fixture
+def client_with(monkeypatch, tmp_path):
+    """Build a GitHubClient whose HTTP requests go to handler, with its cache in tmp_path"""
+    monkeypatch.setenv("CACHE_DIR", str(tmp_path))
+    
+    def build(handler, token=None):
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(github_client, "get_http_client", lambda: http)
+        return GitHubClient(token=token)
+    
+    return build
+
+def test_rest_batch_fails_per_query(client_with, monkeypatch):
+    """Without a token each query is its own REST search, and one failing does not fail the rest"""
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    
+    def handler(request):
+        query = request.url.params["q"]
+        if query == "broken":
+            return httpx.Response(403, json={"message": "Forbidden"})
+        return httpx.Response(200, json={"total_count": 1, "items": [{"name": query}]})
+    
+    client = client_with(handler)
+    results = asyncio.run(client.search_repositories_batch(["python", "broken", "rust"]))
+    
+    assert results[0]["items"] == [{"name": "python"}]
+    assert isinstance(results[1], GitHubAPIError) and results[1].status_code == 403
+    assert results[2]["items"] == [{"name": "rust"}]
+
+def test_rest_batch_holds_semaphore(client_with, monkeypatch):
+    """Without a token the REST searches stay within the caller's concurrency cap"""
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    in_flight = []
+    peak = []
+    
+    async def handler(request):
+        in_flight.append(request)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(request)
+        return httpx.Response(200, json={"total_count": 0, "items": []})
+    
+    client = client_with(handler)
+    
+    async def run():
+        return await client.search_repositories_batch([f"topic {n}" for n in range(8)], semaphore=asyncio.Semaphore(2))
+    
+    results = asyncio.run(run())
+    assert len(results) == 8 and all(result == {"total_count": 0, "items": []} for result in results)
+    assert max(peak) == 2
+
+def test_graphql_batch_is_one_request(client_with):
+    """With a token, every uncached query goes out as one aliased GraphQL request"""
+    requests = []
+    
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append(body)
+        data = {f"w{n}": {"nodes": [repository(body["variables"][f"q{n}"].split()[0])]} for n in range(2)}
+        return httpx.Response(200, json={"data": data})
+    
+    client = client_with(handler, token="token")
+    results = asyncio.run(client.search_repositories_batch(["python", "rust"]))
+    
+    assert len(requests) == 1
+    assert [result["items"][0]["name"] for result in results] == ["python", "rust"]
+    assert results[0]["items"][0]["html_url"] == "https://github.com/example/python"
+    assert results[0]["items"][0]["topics"] == ["learning"]
+    
+    # Both are cached now, so a repeat makes no request
+    asyncio.run(client.search_repositories_batch(["python", "rust"]))
+    assert len(requests) == 1
+
+def test_graphql_partial_errors_fail_only_their_query(client_with):
+    """An error naming one alias fails that query; the others still get their results"""
+    def handler(request):
+        return httpx.Response(200, json={
+            "data": {"w0": {"nodes": [repository("python")]}, "w1": None, "w2": {"nodes": [repository("go")]}},
+            "errors": [{"path": ["w1"], "message": "Something went wrong"}]
+        })
+    
+    client = client_with(handler, token="token")
+    results = asyncio.run(client.search_repositories_batch(["python", "rust", "go"]))
+    
+    assert results[0]["items"][0]["name"] == "python"
+    assert isinstance(results[1], GitHubAPIError)
+    assert "Something went wrong" in str(results[1])
+    assert results[2]["items"][0]["name"] == "go"
+
+def test_graphql_request_failure_fails_every_query(client_with):
+    """If the GraphQL request itself fails, every pending query gets the error"""
+    def handler(request):
+        return httpx.Response(502, text="Bad gateway")
+    
+    client = client_with(handler, token="token")
+    results = asyncio.run(client.search_repositories_batch(["python", "rust"]))
+    
+    assert all(isinstance(result, GitHubAPIError) and result.status_code == 502 for result in results)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for recovering JSON from LLM responses
+"""
+
+import json
+import pytest
+from services.llm_json import (
+    LLMJSONError, extract_json, repair_json, parse_learning_path,
+    merge_weekly_goals, validate_weekly_goal, WeeklyGoalStreamParser
+)
+
+def week(number: int, title: str = "Basics") -> dict:
+    return {
+        "week_number": number,
+        "title": f"{title} {number}",
+        "description": "Learn things",
+        "objectives": ["Understand it"],
+        "estimated_hours": 5,
+        "deadline": "2025-01-01T00:00:00"
+    }
+
+def test_repair_drops_trailing_commas():
+    """Trailing commas before a closing bracket are removed"""
+    repaired, truncated = repair_json('{"a": [1, 2, ], "b": {"c": 3,},}')
+    assert json.loads(repaired) == {"a": [1, 2], "b": {"c": 3}}
+    assert not truncated
+
+def test_repair_escapes_raw_newlines_in_strings():
+    """A literal newline inside a string becomes \\n; newlines between tokens are kept"""
+    repaired, _ = repair_json('{\n"text": "line one\nline two"\n}')
+    assert json.loads(repaired) == {"text": "line one\nline two"}
+
+def test_repair_leaves_commas_inside_strings():
+    """String contents are not touched by the comma repair"""
+    repaired, _ = repair_json('{"text": "a, ]", }')
+    assert json.loads(repaired) == {"text": "a, ]"}
+
+def test_repair_closes_truncated_output():
+    """Truncated output is cut back to the last complete member and closed"""
+    repaired, truncated = repair_json('{"title": "Plan", "weekly_goals": [{"week_number": 1}, {"week_number": 2, "title": "Cut o')
+    assert truncated
+    assert json.loads(repaired) == {"title": "Plan", "weekly_goals": [{"week_number": 1}, {"week_number": 2}]}
+
+def test_extract_json_skips_fences_and_prose():
+    """The first valid object is found inside a code fence after leading prose"""
+    text = 'Sure {not json} here it is:\n```json\n{"topic": "Python", "total_weeks": 2,}\n```\nEnjoy!'
+    assert extract_json(text) == {"topic": "Python", "total_weeks": 2}
+
+def test_extract_json_list():
+    """expected=list returns the first array"""
+    assert extract_json('Recommendations: ["one", "two",]', list) == ["one", "two"]
+
+def test_extract_json_raises_without_json():
+    """Text with no recoverable value raises LLMJSONError"""
+    with pytest.raises(LLMJSONError):
+        extract_json("I could not generate a plan, sorry.")
+
+def test_validate_weekly_goal():
+    """A complete week passes; a week missing required fields or of the wrong type does not"""
+    assert validate_weekly_goal(week(1)) is None
+    assert validate_weekly_goal({"week_number": 1}) is not None
+    assert validate_weekly_goal("week 1") is not None
+
+def test_parse_learning_path_reports_missing_weeks():
+    """Invalid and cut-off weeks are dropped and reported as missing"""
+    text = json.dumps({"title": "Plan", "total_weeks": 4, "weekly_goals": [week(1), {"week_number": 2}, week(3)]})
+    # Cut inside week 4, leaving a partial week that fails validation
+    text = text[:-2] + ', {"week_number": 4, "title": "Adv'
+    result = parse_learning_path(text)
+    
+    assert result.truncated
+    assert result.dropped_weeks == 2
+    assert [goal["week_number"] for goal in result.weekly_goals] == [1, 3]
+    assert result.missing_week_numbers == [2, 4]
+
+def test_parse_learning_path_complete():
+    """A complete, valid plan has nothing missing"""
+    result = parse_learning_path(json.dumps({"total_weeks": 2, "weekly_goals": [week(1), week(2)]}))
+    assert not result.truncated
+    assert result.missing_week_numbers == []
+
+def test_merge_weekly_goals_keeps_first_copy_in_order():
+    """Regenerated weeks fill the gaps without replacing weeks already present"""
+    merged = merge_weekly_goals([week(1), week(3)], [week(3, "Other"), week(2)])
+    assert [goal["week_number"] for goal in merged] == [1, 2, 3]
+    assert merged[2]["title"] == "Basics 3"
+
+def test_stream_parser_yields_weeks_as_they_close():
+    """Weeks are returned once their closing brace arrives, with nested resources kept inside"""
+    goal = {**week(1), "resources": [{"title": "Video {1}"}]}
+    text = json.dumps({"title": "Plan", "notes": {"weekly_goals": "not this one"}, "weekly_goals": [goal, week(2)], "total_weeks": 2})
+    split = text.index('"week_number": 2')
+    
+    parser = WeeklyGoalStreamParser()
+    first = []
+    for i in range(0, split, 7):
+        first.extend(parser.feed(text[i:min(i + 7, split)]))
+    assert first == [goal]
+    assert parser.feed(text[split:]) == [week(2)]
+
+def test_stream_parser_ignores_nested_arrays_before_goals():
+    """Arrays that are not the root "weekly_goals" value produce nothing"""
+    parser = WeeklyGoalStreamParser()
+    assert parser.feed('{"meta": {"weekly_goals": [{"week_number": 9}]}, "tags": [{"a": 1}]}') == []
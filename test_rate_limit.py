@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the GitHub rate limit scheduler
+"""
+
+import time
+import asyncio
+import pytest
+from services.rate_limit import RateLimitScheduler, RateLimitTimeout, INTERACTIVE, BACKGROUND
+
+def headers(limit: int, remaining: int, reset_in: float = 3600, resource: str = "search") -> dict:
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(time.time() + reset_in),
+        "X-RateLimit-Resource": resource
+    }
+
+def test_admits_immediately_with_capacity():
+    """Requests go straight through while the window has requests left"""
+    async def run():
+        scheduler = RateLimitScheduler(reserve_fraction=0, max_wait_seconds=1)
+        assert await scheduler.acquire("search") == 0.0
+        scheduler.update("search", headers(30, 2))
+        assert await scheduler.acquire("search") == 0.0
+        assert await scheduler.acquire("search", BACKGROUND) == 0.0
+        assert scheduler.stats()["windows"]["search"]["remaining"] == 0
+        assert scheduler.queued == 0
+    
+    asyncio.run(run())
+
+def test_background_leaves_reserve_for_interactive():
+    """Background requests queue once only the reserve is left; interactive ones still pass"""
+    async def run():
+        scheduler = RateLimitScheduler(reserve_fraction=0.2, max_wait_seconds=1)
+        scheduler.update("search", headers(10, 2))
+        
+        with pytest.raises(RateLimitTimeout):
+            await scheduler.acquire("search", BACKGROUND, max_wait=0.05)
+        assert await scheduler.acquire("search", INTERACTIVE) == 0.0
+        assert scheduler.timeouts == 1
+    
+    asyncio.run(run())
+
+def test_queued_requests_released_interactive_first():
+    """When slots free up, queued interactive requests go before earlier background ones"""
+    async def run():
+        scheduler = RateLimitScheduler(reserve_fraction=0, max_wait_seconds=5)
+        scheduler.update("search", headers(30, 0))
+        order = []
+        
+        async def request(name, priority):
+            await scheduler.acquire("search", priority)
+            order.append(name)
+        
+        tasks = [
+            asyncio.create_task(request("background-1", BACKGROUND)),
+            asyncio.create_task(request("background-2", BACKGROUND)),
+            asyncio.create_task(request("interactive", INTERACTIVE))
+        ]
+        await asyncio.sleep(0.01)
+        assert scheduler.queue_depth() == 3
+        
+        for _ in tasks:
+            # A response reporting one request left frees a single slot
+            scheduler.update("search", headers(30, 1))
+            await asyncio.sleep(0.01)
+        
+        await asyncio.gather(*tasks)
+        assert order == ["interactive", "background-1", "background-2"]
+        assert scheduler.queue_depth() == 0
+        assert scheduler.stats()["max_queue_depth"] == 3
+    
+    asyncio.run(run())
+
+def test_times_out_when_window_is_exhausted():
+    """A request that cannot get a slot within max_wait raises RateLimitTimeout and leaves the queue"""
+    async def run():
+        scheduler = RateLimitScheduler(reserve_fraction=0, max_wait_seconds=0.05)
+        scheduler.update("core", headers(60, 0, resource="core"))
+        
+        started = time.monotonic()
+        with pytest.raises(RateLimitTimeout):
+            await scheduler.acquire("core")
+        assert time.monotonic() - started < 1
+        assert scheduler.timeouts == 1
+        assert scheduler.queue_depth() == 0
+    
+    asyncio.run(run())
+
+def test_window_reset_refills_capacity():
+    """Once the reset time has passed the window is refilled once, admitting at most its limit"""
+    async def run():
+        scheduler = RateLimitScheduler(reserve_fraction=0, max_wait_seconds=0.05)
+        scheduler.update("search", headers(10, 0, reset_in=-1))
+        assert await scheduler.acquire("search") == 0.0
+        assert scheduler.stats()["windows"]["search"]["remaining"] == 9
+        
+        results = await asyncio.gather(*[scheduler.acquire("search") for _ in range(49)], return_exceptions=True)
+        admitted = [result for result in results if not isinstance(result, RateLimitTimeout)]
+        assert len(admitted) == 9
+        assert scheduler.timeouts == 40
+        
+        # The next response reports the new window and releases requests again
+        scheduler.update("search", headers(10, 5))
+        assert await scheduler.acquire("search") == 0.0
+    
+    asyncio.run(run())
+
+def test_update_ignores_responses_without_headers():
+    """Responses without X-RateLimit-* headers leave the scheduler unchanged"""
+    scheduler = RateLimitScheduler(reserve_fraction=0, max_wait_seconds=1)
+    scheduler.update("search", {"Content-Type": "application/json"})
+    assert scheduler.stats()["windows"] == {}
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the local resource index
+"""
+
+import time
+from models.learning_path import LearningResource, ResourceType
+from services.resource_index import ResourceIndex
+from services.storage import JSONFileStore, SQLiteStore
+from test_storage import make_learning_path
+
+def resource(title: str, url: str, resource_type: ResourceType = ResourceType.YOUTUBE_VIDEO, tags=()) -> LearningResource:
+    return LearningResource(
+        title=title,
+        description=f"All about {title}",
+        url=url,
+        resource_type=resource_type,
+        tags=list(tags)
+    )
+
+def test_search_ranks_title_matches_first():
+    """Resources matching the query terms come back best first, filtered by type"""
+    index = ResourceIndex(":memory:")
+    assert index.add_resources([
+        resource("Docker networking deep dive", "https://example.com/net"),
+        resource("Kubernetes networking", "https://example.com/k8s", tags=["docker"]),
+        resource("Docker compose starter", "https://example.com/repo", ResourceType.GITHUB_PROJECT),
+        resource("Baking bread", "https://example.com/bread")
+    ]) == 4
+    
+    results = index.search("Docker networking", ResourceType.YOUTUBE_VIDEO)
+    assert [r.url for r in results] == ["https://example.com/net", "https://example.com/k8s"]
+    assert index.search("Week 1: Introduction") == []
+
+def test_lookup_counts_hits_and_misses():
+    """lookup() only hits when it can fill every slot"""
+    index = ResourceIndex(":memory:")
+    index.add_resources([resource("Python decorators", f"https://example.com/{n}") for n in range(2)])
+    
+    assert len(index.lookup("python decorators", ResourceType.YOUTUBE_VIDEO, 2)) == 2
+    assert index.lookup("python decorators", ResourceType.YOUTUBE_VIDEO, 3) is None
+    assert index.stats() == {"enabled": True, "entries": 2, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+def test_old_entries_are_ignored():
+    """Entries indexed longer ago than max_age_seconds are not served"""
+    index = ResourceIndex(":memory:", max_age_seconds=3600)
+    index.add_resources([resource("Rust ownership", "https://example.com/old")], indexed_at=time.time() - 7200)
+    index.add_resources([resource("Rust ownership explained", "https://example.com/new")])
+    
+    assert [r.url for r in index.search("rust ownership")] == ["https://example.com/new"]
+
+def test_reindexing_keeps_age():
+    """Re-adding an indexed resource without a fetch time keeps its date, so it still ages out"""
+    index = ResourceIndex(":memory:", max_age_seconds=3600)
+    index.add_resources([resource("Rust ownership", "https://example.com/old")], indexed_at=time.time() - 7200)
+    
+    index.add_resources([resource("Rust ownership", "https://example.com/old")])
+    assert index.search("rust ownership") == []
+    assert index.stats()["entries"] == 1
+    
+    # A fresh fetch of the same URL does make it current again
+    index.add_resources([resource("Rust ownership", "https://example.com/old")], indexed_at=time.time())
+    assert [r.url for r in index.search("rust ownership")] == ["https://example.com/old"]
+
+def test_excluded_urls_never_indexed_or_returned():
+    """Mock fallback URLs stay out of the index, even if they were indexed before being excluded"""
+    index = ResourceIndex(":memory:", excluded_urls=["https://example.com/mock"])
+    assert index.add_resources([resource("React hooks", "https://example.com/mock")]) == 0
+    
+    index.excluded_urls = set()
+    index.add_resources([resource("React hooks guide", "https://example.com/later-mock")])
+    index.excluded_urls.add("https://example.com/later-mock")
+    assert index.search("react hooks") == []
+
+def test_backfill_dates_resources_by_plan(tmp_path):
+    """Backfilled resources carry their plan's last_updated, so old plans are not served as fresh"""
+    store = JSONFileStore(str(tmp_path / "paths"), storage_format="json")
+    # make_learning_path plans were last updated in January 2025
+    store.save(make_learning_path("Rust"))
+    store.save(make_learning_path("Go"))
+    
+    index = ResourceIndex(str(tmp_path / "index.db"), max_age_seconds=3600)
+    assert index.backfill_from_store(store) == 6
+    assert index.stats()["entries"] == 6
+    assert index.search("rust video") == []
+    
+    index.max_age_seconds = 100 * 365 * 24 * 3600
+    assert sorted(r.title for r in index.search("rust video", ResourceType.YOUTUBE_VIDEO)) == ["Rust video 1", "Rust video 2", "Rust video 3"]
+
+def test_backfill_reads_sqlite_store(tmp_path):
+    """Plans kept in SQLite, for any user, are backfilled too"""
+    store = SQLiteStore(str(tmp_path / "paths.db"))
+    store.save(make_learning_path("Rust", user_id="alice"))
+    store.save(make_learning_path("Go", user_id="bob", weeks=2))
+    
+    index = ResourceIndex(":memory:", max_age_seconds=100 * 365 * 24 * 3600)
+    assert index.backfill_from_store(store) == 5
+    assert len(index.search("go video")) == 2
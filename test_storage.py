@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Tests for the local learning path stores and the JSON to SQLite migration
+"""
+
+import shutil
+import threading
+from datetime import datetime, timedelta
+from models.learning_path import (
+    LearningPath, StudyPlan, WeeklyGoal, LearningResource, ProgressUpdate,
+    ProgressEvent, ExperienceLevel, TimeCommitment, ResourceType
+)
+from services.storage import JSONFileStore, SQLiteStore, WriteBehindStore, DEFAULT_USER_ID, write_atomic
+from migrate_storage import migrate
+
+def make_learning_path(topic: str = "Rust", user_id: str = DEFAULT_USER_ID, weeks: int = 3) -> LearningPath:
+    created = datetime(2025, 1, 1, 9, 30)
+    goals = [
+        WeeklyGoal(
+            week_number=n,
+            title=f"Week {n}",
+            description=f"Part {n} of {topic}",
+            resources=[LearningResource(
+                title=f"{topic} video {n}",
+                description="A video",
+                url=f"https://www.youtube.com/watch?v={topic}{n}",
+                resource_type=ResourceType.YOUTUBE_VIDEO,
+                duration="15 minutes",
+                tags=[topic.lower(), "video"]
+            )],
+            objectives=[f"Objective {n}"],
+            estimated_hours=5.0,
+            deadline=created + timedelta(weeks=n)
+        )
+        for n in range(1, weeks + 1)
+    ]
+    study_plan = StudyPlan(
+        topic=topic,
+        experience_level=ExperienceLevel.BEGINNER,
+        time_commitment=TimeCommitment.MODERATE,
+        total_weeks=weeks,
+        weekly_goals=goals,
+        created_at=created,
+        last_updated=created
+    )
+    return LearningPath(
+        user_id=user_id,
+        topic=topic,
+        experience_level=ExperienceLevel.BEGINNER,
+        time_commitment=TimeCommitment.MODERATE,
+        study_plan=study_plan,
+        created_at=created,
+        last_updated=created
+    )
+
+def make_event(week_number: int, topic: str = "Rust") -> ProgressEvent:
+    return ProgressEvent(
+        progress_update=ProgressUpdate(
+            topic=topic,
+            completed_items=[f"Week {week_number}"],
+            current_progress="Going well",
+            timestamp=datetime(2025, 2, week_number, 12, 0),
+            mood_rating=8
+        ),
+        recommendations=[f"Review week {week_number}"],
+        completed_weeks=[week_number]
+    )
+
+def assert_same_plan(loaded: LearningPath, original: LearningPath):
+    assert loaded is not None
+    assert loaded.model_dump(exclude={"id"}) == original.model_dump(exclude={"id"})
+
+def test_write_atomic_concurrent_writers(tmp_path):
+    """Concurrent writes to one path leave one complete copy and no temp files"""
+    path = str(tmp_path / "plan.json")
+    payloads = [bytes([ord("a") + n]) * 100000 for n in range(16)]
+    threads = [threading.Thread(target=write_atomic, args=(path, payload)) for payload in payloads]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    with open(path, "rb") as f:
+        assert f.read() in payloads
+    assert [p.name for p in tmp_path.iterdir()] == ["plan.json"]
+
+def test_write_behind_write_through_saves_concurrently(tmp_path):
+    """With no flush delay, concurrent saves of one plan all succeed and leave a readable file"""
+    store = WriteBehindStore(JSONFileStore(str(tmp_path), storage_format="json"), flush_delay=0)
+    results = []
+    threads = [
+        threading.Thread(target=lambda weeks=weeks: results.append(store.save(make_learning_path(weeks=weeks))))
+        for weeks in range(1, 17)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert results == [True] * 16
+    assert store.load("Rust") is not None
+    assert [p.name for p in tmp_path.iterdir()] == ["rust.json"]
+
+def test_json_store_round_trip(tmp_path):
+    """A saved plan loads back unchanged, by topic in any case"""
+    store = JSONFileStore(str(tmp_path), storage_format="json")
+    learning_path = make_learning_path()
+    assert store.save(learning_path)
+    
+    assert_same_plan(store.load("Rust"), learning_path)
+    assert_same_plan(store.load("rust"), learning_path)
+    assert store.load("Go") is None
+    assert [summary["topic"] for summary in store.list_paths()] == ["Rust"]
+
+def test_json_store_progress_log_and_compaction(tmp_path):
+    """Progress is appended to a log, replayed on load and folded into the snapshot after compact_every events"""
+    store = JSONFileStore(str(tmp_path), compact_every=3, storage_format="json")
+    store.save(make_learning_path())
+    snapshot = tmp_path / "rust.json"
+    log = tmp_path / "rust.progress.jsonl"
+    before = snapshot.read_bytes()
+    
+    assert store.append_progress_event("Rust", make_event(1))
+    assert store.append_progress_event("Rust", make_event(2))
+    assert snapshot.read_bytes() == before
+    assert len(log.read_text().splitlines()) == 2
+    
+    loaded = store.load("Rust")
+    assert [goal.completed for goal in loaded.study_plan.weekly_goals] == [True, True, False]
+    assert loaded.adaptive_recommendations == ["Review week 1", "Review week 2"]
+    assert loaded.last_updated == datetime(2025, 2, 2, 12, 0)
+    
+    assert store.append_progress_event("Rust", make_event(3))
+    assert not log.exists()
+    assert len(JSONFileStore(str(tmp_path)).load("Rust").progress_updates) == 3
+
+def test_json_store_skips_torn_log_line(tmp_path):
+    """A partial last line left by a crash is skipped, and the next append starts a new line"""
+    store = JSONFileStore(str(tmp_path), compact_every=10, storage_format="json")
+    store.save(make_learning_path())
+    store.append_progress_event("Rust", make_event(1))
+    with open(tmp_path / "rust.progress.jsonl", "a") as f:
+        f.write('{"progress_update": {"topic": "Ru')
+    
+    assert store.append_progress_event("Rust", make_event(2))
+    loaded = JSONFileStore(str(tmp_path)).load("Rust")
+    assert [goal.completed for goal in loaded.study_plan.weekly_goals] == [True, True, False]
+
+def test_json_store_reads_legacy_files_without_owner(tmp_path):
+    """Indented files from before user_id existed load as the default user"""
+    shutil.copy("data/learning_paths/devops.json", tmp_path / "devops.json")
+    learning_path = JSONFileStore(str(tmp_path)).load("devops")
+    assert learning_path.user_id == DEFAULT_USER_ID
+    assert len(learning_path.study_plan.weekly_goals) == 6
+
+def test_sqlite_store_round_trip(tmp_path):
+    """Weeks, resources and progress updates survive a save and load"""
+    store = SQLiteStore(str(tmp_path / "paths.db"))
+    learning_path = make_learning_path(user_id="alice")
+    learning_path.apply_progress_event(make_event(1))
+    assert store.save(learning_path)
+    
+    assert_same_plan(store.load("rust", "alice"), learning_path)
+    store.close()
+
+def test_sqlite_store_progress_event(tmp_path):
+    """Appending a progress event completes the week without rewriting the plan"""
+    store = SQLiteStore(str(tmp_path / "paths.db"))
+    store.save(make_learning_path(user_id="alice"))
+    
+    assert store.append_progress_event("Rust", make_event(2), "alice")
+    loaded = store.load("Rust", "alice")
+    assert [goal.completed for goal in loaded.study_plan.weekly_goals] == [False, True, False]
+    assert loaded.progress_updates[0].completed_items == ["Week 2"]
+    assert loaded.adaptive_recommendations == ["Review week 2"]
+    assert not store.append_progress_event("Go", make_event(1), "alice")
+
+def test_sqlite_store_keeps_plans_per_user(tmp_path):
+    """Each user sees their own plan, falls back to an unowned one, and never sees another user's"""
+    store = SQLiteStore(str(tmp_path / "paths.db"))
+    store.save(make_learning_path(user_id="alice", weeks=2))
+    store.save(make_learning_path(user_id=DEFAULT_USER_ID, weeks=4))
+    
+    assert len(store.load("Rust", "alice").study_plan.weekly_goals) == 2
+    assert len(store.load("Rust", "bob").study_plan.weekly_goals) == 4
+    assert len(store.load("Rust").study_plan.weekly_goals) == 4
+    assert [summary["user_id"] for summary in store.list_paths("alice")] == ["alice"]
+    
+    store.save(make_learning_path("Go", user_id="alice"))
+    assert store.load("Go") is None
+    assert store.load("Go", "bob") is None
+
+def test_migrate_copies_every_plan(tmp_path):
+    """Every JSON plan, legacy or current, ends up in SQLite with its contents intact"""
+    source = tmp_path / "paths"
+    source.mkdir()
+    shutil.copy("data/learning_paths/devops.json", source / "devops.json")
+    json_store = JSONFileStore(str(source), compact_every=10, storage_format="json")
+    json_store.save(make_learning_path())
+    json_store.append_progress_event("Rust", make_event(1))
+    (source / "broken.json").write_text("{not json")
+    
+    db_path = str(tmp_path / "paths.db")
+    assert migrate(str(source), db_path) == 2
+    
+    store = SQLiteStore(db_path)
+    assert_same_plan(store.load("Rust"), json_store.load("Rust"))
+    assert store.load("Rust").study_plan.weekly_goals[0].completed
+    assert len(store.load("devops").study_plan.weekly_goals) == 6
+    assert sorted(summary["topic"].lower() for summary in store.list_paths()) == ["devops", "rust"]
+
+def test_write_behind_coalesces_saves(tmp_path):
+    """Repeated saves and progress within the delay become one backend write, visible to reads before it"""
+    backend = SQLiteStore(str(tmp_path / "paths.db"))
+    store = WriteBehindStore(backend, flush_delay=60)
+    
+    for weeks in (2, 3, 4):
+        store.save(make_learning_path(weeks=weeks))
+    assert store.append_progress_event("Rust", make_event(1))
+    
+    assert backend.load("Rust") is None
+    pending = store.load("Rust")
+    assert len(pending.study_plan.weekly_goals) == 4
+    assert pending.study_plan.weekly_goals[0].completed
+    
+    # Changing a loaded copy does not touch the pending plan
+    pending.study_plan.weekly_goals.pop()
+    assert len(store.load("Rust").study_plan.weekly_goals) == 4
+    
+    assert store.flush()
+    stats = store.stats()
+    assert (stats["saves"], stats["coalesced"], stats["flushes"], stats["pending"]) == (3, 3, 1, 0)
+    assert len(backend.load("Rust").study_plan.weekly_goals) == 4
+    
+    store.close()
+
+def test_write_behind_flushes_on_close(tmp_path):
+    """Plans still pending at shutdown are written by close()"""
+    db_path = str(tmp_path / "paths.db")
+    store = WriteBehindStore(SQLiteStore(db_path), flush_delay=60)
+    store.save(make_learning_path(user_id="alice"))
+    store.close()
+    
+    assert SQLiteStore(db_path).load("Rust", "alice") is not None
+
+def test_write_behind_pending_is_per_user(tmp_path):
+    """A pending plan of one user is not served to another user"""
+    store = WriteBehindStore(SQLiteStore(str(tmp_path / "paths.db")), flush_delay=60)
+    store.save(make_learning_path(user_id="alice", weeks=2))
+    
+    assert store.load("Rust", "bob") is None
+    assert store.load("Rust") is None
+    assert len(store.load("Rust", "alice").study_plan.weekly_goals) == 2
+    store.close()
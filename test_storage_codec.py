@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the learning path storage formats
+"""
+
+import json
+import gzip
+import shutil
+import pytest
+from services.storage_codec import (
+    MAGIC, LEGACY_FORMAT, parse_format, encode_learning_path,
+    decode_learning_path, read_learning_path_file, stored_format
+)
+from services.storage import JSONFileStore
+from convert_storage import convert
+from test_storage import make_learning_path, make_event
+
+def round_trip(storage_format: str):
+    learning_path = make_learning_path()
+    data = encode_learning_path(learning_path, storage_format)
+    assert type(learning_path)(**decode_learning_path(data)) == learning_path
+    return data
+
+def test_plain_json_has_no_header():
+    """Compact and indented JSON stay plain JSON that any tool can read"""
+    for storage_format in ("json", LEGACY_FORMAT):
+        data = round_trip(storage_format)
+        assert not data.startswith(MAGIC)
+        assert json.loads(data)["topic"] == "Rust"
+
+def test_compressed_format_is_headered():
+    """Compressed output names its format on the first line"""
+    data = round_trip("json+gzip")
+    header, _, payload = data.partition(b"\n")
+    assert header == MAGIC + b"json+gzip"
+    assert json.loads(gzip.decompress(payload))["topic"] == "Rust"
+
+def test_msgpack_round_trip():
+    """msgpack, plain and compressed, decodes back to the same plan"""
+    pytest.importorskip("msgpack")
+    assert round_trip("msgpack").startswith(MAGIC + b"msgpack\n")
+    assert round_trip("msgpack+gzip").startswith(MAGIC + b"msgpack+gzip\n")
+
+def test_zstd_round_trip():
+    """zstd-compressed JSON decodes back to the same plan"""
+    pytest.importorskip("zstandard")
+    assert round_trip("json+zstd").startswith(MAGIC + b"json+zstd\n")
+
+def test_parse_format():
+    """Format names split into encoding and compression; unknown ones are rejected"""
+    assert parse_format("json") == ("json", None)
+    assert parse_format("json+gzip") == ("json", "gzip")
+    assert parse_format(LEGACY_FORMAT) == (LEGACY_FORMAT, None)
+    for storage_format in ("yaml", "json+bzip2", "xml+gzip"):
+        with pytest.raises(ValueError):
+            parse_format(storage_format)
+
+def test_unknown_header_rejected():
+    """A header naming a format this build cannot read raises instead of returning garbage"""
+    with pytest.raises(ValueError):
+        decode_learning_path(MAGIC + b"yaml+gzip\n" + b"topic: Rust")
+
+def test_stored_format_detection(tmp_path):
+    """The format of a stored file is read from its header, or from the JSON layout without one"""
+    learning_path = make_learning_path()
+    for storage_format in ("json", LEGACY_FORMAT, "json+gzip"):
+        path = tmp_path / f"{storage_format}.json"
+        path.write_bytes(encode_learning_path(learning_path, storage_format))
+        assert stored_format(str(path)) == storage_format
+        assert read_learning_path_file(str(path))["topic"] == "Rust"
+
+def test_legacy_files_detected(tmp_path):
+    """Files written before the codec existed read as the indented format"""
+    path = tmp_path / "devops.json"
+    shutil.copy("data/learning_paths/devops.json", path)
+    assert stored_format(str(path)) == LEGACY_FORMAT
+    assert len(read_learning_path_file(str(path))["study_plan"]["weekly_goals"]) == 6
+
+def test_store_reads_any_format(tmp_path):
+    """A store reads files in every format, whatever it writes itself"""
+    JSONFileStore(str(tmp_path), storage_format="json+gzip").save(make_learning_path("Go"))
+    JSONFileStore(str(tmp_path), storage_format=LEGACY_FORMAT).save(make_learning_path("Rust"))
+    
+    store = JSONFileStore(str(tmp_path), storage_format="json")
+    assert store.load("Go").topic == "Go"
+    assert store.load("Rust").topic == "Rust"
+
+def test_convert_rewrites_every_file(tmp_path):
+    """convert() rewrites each plan in the new format, folding in its progress log"""
+    shutil.copy("data/learning_paths/devops.json", tmp_path / "devops.json")
+    store = JSONFileStore(str(tmp_path), compact_every=10, storage_format="json")
+    store.save(make_learning_path())
+    store.append_progress_event("Rust", make_event(1))
+    
+    assert convert(str(tmp_path), "json+gzip") == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["devops.json", "rust.json"]
+    for name in ("devops.json", "rust.json"):
+        assert stored_format(str(tmp_path / name)) == "json+gzip"
+    assert len(JSONFileStore(str(tmp_path)).load("Rust").progress_updates) == 1